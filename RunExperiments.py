@@ -0,0 +1,242 @@
+"""-----------------------------------------------------------------------------
+Runs Pareto-front quality experiments: every (architecture, method, seed) is
+replayed offline in a process pool, and once all methods of an architecture and
+seed are done their fronts are scored against each other and appended to the
+contribution and diversity CSVs (,Architecture,Method,Contribution). Finished
+runs are kept in a json lines file so an interrupted sweep resumes where it
+stopped.
+--------------------------------------------------------------------------------
+"""
+import os
+import sys
+import json
+import yaml
+import random
+import shutil
+import tempfile
+import contextlib
+from optparse import OptionParser
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import numpy as np
+import pandas as pd
+from src import metrics
+
+METHODS=("FlexiBO + GP", "FlexiBO + RF", "RS")
+
+def config_option_parser():
+    """This function is used to configure option parser
+    @returns:
+        options: option parser handle
+    """
+    usage="""USAGE: %python RunExperiments.py -d [data] -o [output_dir]
+             python RunExperiments.py -d data/measurements/tx2_sampled_output_xception_200x200.csv,data/measurements/tx2_sampled_output_inceptionv3_200x200.csv --seeds 5 -j 4
+    """
+    parser=OptionParser(usage=usage)
+    parser.add_option('-d', "--data", action="store", type="string", dest="data",
+                      help="comma separated measurement tables, one per architecture")
+    parser.add_option('-o', "--output-dir", action="store", type="string", dest="output_dir",
+                      default="experiments", help="directory of the results")
+    parser.add_option("--methods", action="store", type="string", dest="methods",
+                      default=",".join(METHODS), help="comma separated methods")
+    parser.add_option("--seeds", action="store", type="int", dest="seeds",
+                      default=5, help="repetitions of every method")
+    parser.add_option("--iterations", action="store", type="int", dest="iterations",
+                      default=100, help="iterations of the bo loop")
+    parser.add_option('-j', "--jobs", action="store", type="int", dest="jobs",
+                      default=os.cpu_count(), help="worker processes")
+    parser.add_option("--verbose", action="store_true", dest="verbose",
+                      default=False, help="show the output of the runs")
+    (options,args)=parser.parse_args()
+    return (options, usage)
+
+def get_architecture(fname, df):
+    """This function is used to name the architecture of a measurement table
+    """
+    if "model_name" in df.columns and "size" in df.columns:
+        return "{0}-{1}".format(df["model_name"].iloc[0], df["size"].iloc[0])
+    return os.path.splitext(os.path.basename(fname))[0]
+
+def write_config(run_dir, seed,
+                 iterations):
+    """This function is used to write the config of a run to its scratch
+    directory so that runs in parallel do not share checkpoints or telemetry
+    """
+    with open("config.yaml", "r") as fp:
+        config=yaml.safe_load(fp)
+    config["config"]["loop"]["num_iter"]=iterations
+    config["config"]["initial_design"]["seed"]=seed
+    config["config"]["telemetry"]["fname"]=None
+    config["config"]["telemetry"]["profile"]=None
+    with open(os.path.join(run_dir, "config.yaml"), "w") as fp:
+        yaml.safe_dump(config, fp)
+
+def run_flexibo(df, surrogate):
+    """This function is used to replay FlexiBO on a table
+    @returns:
+        true values of the configs on the final pessimistic front and the
+        estimated pessimistic and optimistic fronts
+    """
+    from src.flexibo_offline import FlexiBO
+    bo=FlexiBO(df, surrogate)
+    if bo.fronts is None:
+        return {}
+    (pess_pareto, pess_indices_map)=bo.fronts["pes"]
+    (opt_pareto, _)=bo.fronts["opt"]
+    actual=[[bo.oracle.values[o][i] for o in bo.objectives]
+            for i in pess_indices_map.values()]
+    return {"Actual":metrics.get_reference_front([actual]).tolist(),
+            "Pess":metrics.get_reference_front([pess_pareto]).tolist(),
+            "Opt":metrics.get_reference_front([opt_pareto]).tolist()}
+
+def run_random_search(df, iterations):
+    """This function is used to measure as many random configs on every
+    objective as FlexiBO measures objectives
+    @returns:
+        front of the measured configs
+    """
+    from src.oracle import MeasurementOracle
+    from src.config import get_config
+    config=get_config(mode="offline")
+    columns=config.offline.objective
+    oracle=MeasurementOracle(df, config.offline.config_columns, columns)
+    objectives=sorted(columns, key=lambda o: int(o[1:]))
+    size=min(len(oracle.configs),
+             config.initial_design.size+iterations//len(objectives))
+    sample=random.sample(range(0, len(oracle.configs)), size)
+    values=[[oracle.values[o][i] for o in objectives] for i in sample]
+    return {"Actual":metrics.get_reference_front([values]).tolist()}
+
+def run_task(task):
+    """This function is used by a worker to run one (architecture, method,
+    seed) in a scratch directory
+    """
+    (fname, architecture, method, seed, iterations, verbose)=task
+    df=pd.read_csv(fname)
+    cwd=os.getcwd()
+    run_dir=tempfile.mkdtemp(prefix="flexibo_run_")
+    try:
+        write_config(run_dir, seed, iterations)
+        os.chdir(run_dir)
+        random.seed(seed)
+        np.random.seed(seed)
+        with open(os.devnull, "w") as devnull:
+            with contextlib.redirect_stdout(sys.stdout if verbose else devnull):
+                if method=="RS":
+                    fronts=run_random_search(df, iterations)
+                else:
+                    fronts=run_flexibo(df, method.split(" + ")[1])
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(run_dir)
+    return {"architecture":architecture,
+            "method":method,
+            "seed":seed,
+            "fronts":fronts}
+
+def score_group(runs):
+    """This function is used to score the fronts of all methods of one
+    architecture and seed against the undominated union of their actual
+    fronts. Contribution is only scored for actual fronts
+    @returns:
+        rows of (method, contribution) and (method, diversity)
+    """
+    reference=metrics.get_reference_front([run["fronts"].get("Actual", []) for run in runs])
+    (names, fronts)=([], [])
+    for run in sorted(runs, key=lambda r: r["method"]):
+        for kind, front in sorted(run["fronts"].items()):
+            names.append("{0} ({1})".format(run["method"], kind) if run["method"]!="RS" else "RS")
+            fronts.append(front)
+    if len(reference)==0:
+        return ([], [])
+    contribution=metrics.contribution(fronts, reference)
+    diversity=metrics.diversity(fronts, reference)
+    return ([(name, float(contribution[i])) for i, name in enumerate(names) if name.endswith("(Actual)") or name=="RS"],
+            [(name, float(diversity[i])) for i, name in enumerate(names)])
+
+def append_rows(fname, architecture,
+                rows):
+    """This function is used to append rows to a results CSV, continuing its
+    index
+    """
+    exists=os.path.exists(fname)
+    start=len(pd.read_csv(fname, index_col=0)) if exists else 0
+    df=pd.DataFrame([(architecture, method, value) for (method, value) in rows],
+                    columns=["Architecture", "Method", "Contribution"],
+                    index=range(start, start+len(rows)))
+    df.to_csv(fname, mode="a", header=not exists)
+
+def load_runs(fname):
+    """This function is used to load the finished runs and scored groups of an
+    interrupted sweep
+    """
+    (runs, scored)=({}, set())
+    if not os.path.exists(fname):
+        return (runs, scored)
+    with open(fname, "r") as fp:
+        for line in fp:
+            try:
+                record=json.loads(line)
+            except ValueError:
+                # the last line of a killed sweep may be cut short
+                continue
+            if "scored" in record:
+                scored.add(tuple(record["scored"]))
+            else:
+                runs[(record["architecture"], record["method"], record["seed"])]=record
+    return (runs, scored)
+
+if __name__=="__main__":
+    (options, usage)=config_option_parser()
+    if not options.data:
+        print (usage)
+        sys.exit(1)
+    # every run copies config.yaml; report an invalid one before the workers
+    # start instead of in every run
+    from src.config import load_config
+    if load_config("config.yaml", mode="offline") is None:
+        sys.exit(1)
+    if not os.path.exists(options.output_dir):
+        os.makedirs(options.output_dir)
+    runs_fname=os.path.join(options.output_dir, "runs.jsonl")
+    contribution_fname=os.path.join(options.output_dir, "contribution.csv")
+    diversity_fname=os.path.join(options.output_dir, "diversity.csv")
+    (runs, scored)=load_runs(runs_fname)
+
+    methods=options.methods.split(",")
+    tasks=[]
+    for fname in options.data.split(","):
+        architecture=get_architecture(fname, pd.read_csv(fname, nrows=1))
+        for seed in range(0, options.seeds):
+            for method in methods:
+                if (architecture, method, seed) not in runs:
+                    tasks.append((fname, architecture, method, seed,
+                                  options.iterations, options.verbose))
+    print ("[STATUS]: {0} runs done, {1} to run".format(len(runs), len(tasks)))
+
+    def score(architecture, seed, fp):
+        """This function is used to score a group once all its methods ran
+        """
+        group=[runs.get((architecture, method, seed)) for method in methods]
+        if (architecture, seed) in scored or None in group:
+            return
+        (contribution, diversity)=score_group(group)
+        append_rows(contribution_fname, architecture, contribution)
+        append_rows(diversity_fname, architecture, diversity)
+        fp.write(json.dumps({"scored":[architecture, seed]})+"\n")
+        fp.flush()
+        scored.add((architecture, seed))
+
+    with open(runs_fname, "a") as fp:
+        # groups finished before an interruption but not scored yet
+        for (architecture, _, seed) in list(runs):
+            score(architecture, seed, fp)
+        with ProcessPoolExecutor(max_workers=options.jobs) as pool:
+            futures=[pool.submit(run_task, task) for task in tasks]
+            for future in as_completed(futures):
+                record=future.result()
+                runs[(record["architecture"], record["method"], record["seed"])]=record
+                fp.write(json.dumps(record)+"\n")
+                fp.flush()
+                print ("[STATUS]: finished {0} {1} seed {2}".format(
+                       record["architecture"], record["method"], record["seed"]))
+                score(record["architecture"], record["seed"], fp)
@@ -1,7 +1,6 @@
 import sys
 import os
 from optparse import OptionParser
-import pandas as pd
 
 def config_option_parser():
     """This function is used to configure option parser 
@@ -10,7 +9,12 @@ def config_option_parser():
     """
     usage="""USAGE: %python RunFlexiBO.py -m [mode] -d [data] -s [surrogate]
              online: python RunFlexiBO.py -m online -d measurements.csv -s GP
+             online without initial data: python RunFlexiBO.py -m online -s GP
              offline: python RunFlexiBO.py -m offline -d measurements.csv -s RF
+             store: python RunFlexiBO.py -m offline -d store_dir --model xception --resolution 200x200 -s GP
+             budget: python RunFlexiBO.py -m online -d measurements.csv -s GP --budget 86400
+             k objectives: python RunFlexiBO.py -m offline -d it_ec_te_obj.csv -s GP,RF,RF --objectives inference_time,energy_consumption,temperature
+             overrides: python RunFlexiBO.py -m offline -d measurements.csv -s GP --set loop.num_iter=50 --set evaluation_cost.O2=10
             
     """
     parser=OptionParser(usage=usage)
@@ -23,24 +27,82 @@ def config_option_parser():
                       action="store",
                       type="string",
                       dest="data",
-                      help="rows")
+                      help="measurement table or store; optional in online mode")
     parser.add_option('-s', "--surrogate",
                       action="store",
                       type="string",
                       dest="surrogate",
-                      help="surrogate")
+                      help="surrogate, or one per objective separated by commas")
+    parser.add_option("--system",
+                      action="store",
+                      type="string",
+                      dest="system",
+                      help="system slice when data is a measurement store")
+    parser.add_option("--model",
+                      action="store",
+                      type="string",
+                      dest="model",
+                      help="model slice when data is a measurement store")
+    parser.add_option("--resolution",
+                      action="store",
+                      type="string",
+                      dest="resolution",
+                      help="resolution slice when data is a measurement store")
+    parser.add_option("--objectives",
+                      action="store",
+                      type="string",
+                      dest="objectives",
+                      help="comma separated metrics to optimize instead of the configured objectives")
+    parser.add_option("--budget",
+                      action="store",
+                      type="float",
+                      dest="budget",
+                      help="total seconds to spend on evaluations")
+    parser.add_option("--resume",
+                      action="store_true",
+                      dest="resume",
+                      default=False,
+                      help="resume from the last checkpoint")
+    parser.add_option("--set",
+                      action="append",
+                      type="string",
+                      dest="overrides",
+                      default=[],
+                      help="override a value of config.yaml as section.key=value; repeatable")
     (options,args)=parser.parse_args()
     return (options, usage)
 
 if __name__=="__main__":
     options, _=config_option_parser()
-    data=pd.read_csv(os.path.join(os.getcwd(),options.data))
+    from src.config import load_config
+    # parsed once and passed to every class that needs it; the remote host
+    # is only validated for the online mode
+    config=load_config("config.yaml", options.overrides, options.mode)
+    if config is None:
+        sys.exit(1)
+    data=None
+    if options.data is None:
+        # online mode selects and measures its initial configs
+        if options.mode!="online":
+            print ("[ERROR]: offline mode needs a measurement table")
+            sys.exit(1)
+    elif os.path.isdir(os.path.join(os.getcwd(),options.data)):
+        # load only the slice of the measurement store this run needs
+        from src.measurement_store import MeasurementStore
+        data=MeasurementStore(os.path.join(os.getcwd(),options.data)).load(
+            options.system, options.model, options.resolution)
+    else:
+        import pandas as pd
+        data=pd.read_csv(os.path.join(os.getcwd(),options.data))
+    objectives=options.objectives.split(",") if options.objectives else None
     if options.mode=="online":
         from src.flexibo_online import FlexiBO
-        bo=FlexiBO(data, options.surrogate)
+        bo=FlexiBO(data, options.surrogate, options.resume, objectives,
+                   options.budget, config)
     elif options.mode=="offline":
         from src.flexibo_offline import FlexiBO
-        bo=FlexiBO(data, options.surrogate)
+        bo=FlexiBO(data, options.surrogate, options.resume, objectives,
+                   options.budget, config)
     else:
         print ("[ERROR]: Invalid Mode")
 
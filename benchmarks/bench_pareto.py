@@ -0,0 +1,146 @@
+"""-----------------------------------------------------------------------------
+@Name: Flexible Bayesian Optimization (FlexiBO): An active learning for optimiz-
+ing  multiple objectives of different cost
+@Version: 0.1
+@Author: Shahriar Iqbal
+--------------------------------------------------------------------------------
+Benchmarks of the pareto and sampling hot paths on synthetic uncertainty
+regions. Run from the repository root:
+
+    python -m benchmarks.bench_pareto
+    python -m benchmarks.bench_pareto --sizes 100,1000 --objectives 3 --output bench.json
+
+Every function is timed (best of --repeat runs) and its peak traced memory is
+measured in a separate run under tracemalloc. Every function runs once on a
+tiny region first so that compiling the numba kernels is not timed. Results
+are written as json.
+"""
+import gc
+import sys
+import json
+import time
+import platform
+import tracemalloc
+from optparse import OptionParser
+import numpy as np
+from src.pareto import Pareto
+from src.sampling import Sampling
+
+SIZES=[100, 1000, 10000, 100000, 1000000]
+
+# configs of the region the kernels are compiled on before timing
+WARMUP_SIZE=20
+
+def make_region(n, num_obj,
+                seed=0):
+    """This function is used to generate the uncertainty regions of n configs.
+    Means trade off the objectives so that the fronts are not trivial and a
+    tenth of the configs is measured
+    """
+    rng=np.random.RandomState(seed)
+    mu=rng.dirichlet(np.ones(num_obj), size=n)*rng.uniform(0.5, 1.0, size=(n, 1))
+    sigma=rng.uniform(0, 0.05, size=(n, num_obj))
+    sigma[rng.random_sample(n)<0.1]=0
+    pes=np.maximum(mu-sigma, 0).tolist()
+    opt=(mu+sigma).tolist()
+    avg=mu.tolist()
+    return {i: {"pes":pes[i], "avg":avg[i], "opt":opt[i]} for i in range(0, n)}
+
+def measure(fn, repeat):
+    """This function is used to get the best wall-clock of fn and its peak
+    traced memory
+    """
+    times=[]
+    for _ in range(0, repeat):
+        gc.collect()
+        start=time.perf_counter()
+        result=fn()
+        times.append(time.perf_counter()-start)
+    gc.collect()
+    tracemalloc.start()
+    fn()
+    (_, peak)=tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return (result, min(times), peak)
+
+def run_size(n, num_obj,
+             repeat):
+    """This function is used to benchmark every hot path on n configs
+    """
+    pareto=Pareto(num_obj)
+    objectives=["o{0}".format(j+1) for j in range(0, num_obj)]
+    sampling=Sampling(objectives, dict.fromkeys(objectives, 1.0), pareto)
+    REGION=make_region(n, num_obj)
+    region=list(REGION.values())
+    indices=list(REGION)
+    E=[[i] for i in range(0, n)]
+    results=[]
+
+    def record(name, fn):
+        (result, seconds, peak)=measure(fn, repeat)
+        print ("[STATUS]: N={0} {1}: {2:.4f}s {3:.1f}MB".format(n, name, seconds, peak/1024.0**2))
+        results.append({"function":name,
+                        "n":n,
+                        "num_obj":num_obj,
+                        "seconds":seconds,
+                        "peak_mb":peak/1024.0**2})
+        return result
+
+    (ind, points)=record("identify_undominated_points",
+                         lambda: pareto.identify_undominated_points(region, indices))
+    (pess_pareto, pess_map)=record("construct_pessimistic_pareto_front",
+                                   lambda: pareto.construct_pessimistic_pareto_front(ind, points, "CONSTRUCT"))
+    (opt_pareto, opt_map)=record("construct_optimistic_pareto_front",
+                                 lambda: pareto.construct_optimistic_pareto_front(ind, points, "CONSTRUCT"))
+    pess_volume=record("compute_pareto_volume",
+                       lambda: pareto.compute_pareto_volume(pess_pareto))
+    opt_volume=pareto.compute_pareto_volume(opt_pareto)
+    record("determine_next_sample",
+           lambda: sampling.determine_next_sample(pess_pareto, opt_pareto, pess_map,
+                                                  opt_map, pess_volume, opt_volume,
+                                                  REGION, E))
+    for result in results:
+        result.update({"num_undominated":len(ind),
+                       "pess_front_size":len(pess_pareto),
+                       "opt_front_size":len(opt_pareto)})
+    return results
+
+def warm_up(num_obj):
+    """This function is used to run every hot path once on a tiny region, so
+    that the numba kernels are compiled before the first size is timed
+    """
+    from src import kernels
+    kernels.compile_kernels()
+    print ("[STATUS]: warming up on N={0}".format(WARMUP_SIZE))
+    run_size(WARMUP_SIZE, num_obj, 1)
+
+def config_option_parser():
+    """This function is used to configure option parser
+    """
+    parser=OptionParser(usage="USAGE: python -m benchmarks.bench_pareto [options]")
+    parser.add_option("--sizes", action="store", type="string", dest="sizes",
+                      default=",".join(str(n) for n in SIZES),
+                      help="comma separated numbers of configs")
+    parser.add_option("--objectives", action="store", type="int", dest="objectives",
+                      default=2, help="number of objectives")
+    parser.add_option("--repeat", action="store", type="int", dest="repeat",
+                      default=3, help="timed runs per function")
+    parser.add_option("--output", action="store", type="string", dest="output",
+                      default="bench_pareto.json", help="json file of the results")
+    (options, _)=parser.parse_args()
+    return options
+
+if __name__=="__main__":
+    options=config_option_parser()
+    warm_up(options.objectives)
+    results=[]
+    for n in [int(n) for n in options.sizes.split(",")]:
+        results.extend(run_size(n, options.objectives, options.repeat))
+    with open(options.output, "w") as fp:
+        json.dump({"python":sys.version.split()[0],
+                   "numpy":np.__version__,
+                   "machine":platform.machine(),
+                   "processor":platform.processor(),
+                   "time":time.time(),
+                   "results":results}, fp, indent=2)
+    print ("[STATUS]: results written to {0}".format(options.output))
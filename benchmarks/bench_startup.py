@@ -0,0 +1,90 @@
+"""-----------------------------------------------------------------------------
+@Name: Flexible Bayesian Optimization (FlexiBO): An active learning for optimiz-
+ing  multiple objectives of different cost
+@Version: 0.1
+@Author: Shahriar Iqbal
+--------------------------------------------------------------------------------
+Benchmark of the startup of the command line and of importing each mode. Run
+from the repository root:
+
+    python -m benchmarks.bench_startup
+    python -m benchmarks.bench_startup --repeat 10 --output /tmp/bench_startup.json
+
+Every command runs in a fresh interpreter; the best wall-clock of --repeat runs
+is reported with the imports that took longest under python -X importtime.
+Results are written to benchmarks/bench_startup.json unless --output is given.
+"""
+import os
+import sys
+import json
+import time
+import subprocess
+from optparse import OptionParser
+
+COMMANDS={"cli":["RunFlexiBO.py", "--help"],
+          "offline":["-c", "import src.flexibo_offline"],
+          "online":["-c", "import src.flexibo_online"],
+          "config":["-c", "from src.config import load_config; load_config()"]}
+
+# results are kept next to the benchmark rather than in the working directory
+OUTPUT=os.path.join(os.path.dirname(os.path.abspath(__file__)), "bench_startup.json")
+
+def get_slowest_imports(args, top):
+    """This function is used to get the imports with the longest cumulative
+    time
+    """
+    output=subprocess.run([sys.executable, "-X", "importtime"]+args,
+                          stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+                          universal_newlines=True).stderr
+    imports=[]
+    for line in output.splitlines():
+        fields=line.split("|")
+        if len(fields)!=3 or not fields[1].strip().isdigit():
+            continue
+        imports.append((fields[2].strip(), int(fields[1])/1e6))
+    return sorted(imports, key=lambda i: -i[1])[:top]
+
+def run(name, repeat,
+        top):
+    """This function is used to time one command
+    """
+    args=COMMANDS[name]
+    times=[]
+    for _ in range(0, repeat):
+        start=time.perf_counter()
+        status=subprocess.run([sys.executable]+args, stdout=subprocess.DEVNULL,
+                              stderr=subprocess.DEVNULL).returncode
+        times.append(time.perf_counter()-start)
+    result={"command":name,
+            "status":status,
+            "seconds":min(times),
+            "imports":get_slowest_imports(args, top)}
+    print ("[STATUS]: {0}: {1:.3f}s (status {2}), slowest import {3}".format(
+           name, result["seconds"], status,
+           result["imports"][0][0] if result["imports"] else None))
+    return result
+
+def config_option_parser():
+    """This function is used to configure option parser
+    """
+    parser=OptionParser(usage="USAGE: python -m benchmarks.bench_startup [options]")
+    parser.add_option("--commands", action="store", type="string", dest="commands",
+                      default=",".join(sorted(COMMANDS)), help="comma separated commands")
+    parser.add_option("--repeat", action="store", type="int", dest="repeat",
+                      default=5, help="runs per command")
+    parser.add_option("--top", action="store", type="int", dest="top",
+                      default=10, help="slowest imports to report")
+    parser.add_option("--output", action="store", type="string", dest="output",
+                      default=OUTPUT, help="json file of the results")
+    (options, _)=parser.parse_args()
+    return options
+
+if __name__=="__main__":
+    options=config_option_parser()
+    results=[run(name, options.repeat, options.top)
+             for name in options.commands.split(",")]
+    with open(options.output, "w") as fp:
+        json.dump({"python":sys.version.split()[0],
+                   "time":time.time(),
+                   "results":results}, fp, indent=2)
+    print ("[STATUS]: results written to {0}".format(options.output))
@@ -0,0 +1,187 @@
+"""-----------------------------------------------------------------------------
+@Name: Flexible Bayesian Optimization (FlexiBO): An active learning for optimiz-
+ing  multiple objectives of different cost
+@Version: 0.1
+@Author: Shahriar Iqbal
+--------------------------------------------------------------------------------
+End-to-end benchmark of the bo loop on the synthetic ZDT1, ZDT6 and Kursawe
+problems. Run from the repository root:
+
+    python -m benchmarks.bench_synthetic
+    python -m benchmarks.bench_synthetic --problems ZDT1 --dim 6 --size 2000 --costs 1,10 --seeds 0,1,2
+
+Each run replays the full loop of FlexiBOBase on a random design space with
+simulated per-objective costs and records, after every measurement, the
+hypervolume of the configs measured on all objectives against the cumulative
+cost, and the wall-time of every iteration. Results are written as json.
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import tempfile
+from optparse import OptionParser
+import yaml
+import numpy as np
+import pandas as pd
+from src.flexibo_base import FlexiBOBase
+from src.config_space import ConfigSpaceSynthetic
+
+# bounds of the decision variables of each problem
+PROBLEMS={"ZDT1": (0.0, 1.0),
+          "ZDT6": (0.0, 1.0),
+          "Kursawe": (-5.0, 5.0)}
+
+def make_data(problem, dim,
+              size, seed):
+    """This function is used to evaluate a problem on a random design space.
+    The problems are minimized while FlexiBO maximizes from the origin, so
+    objectives are reported as the distance below a reference point 10% of
+    the range worse than every config
+    """
+    (low, high)=PROBLEMS[problem]
+    cfg=ConfigSpaceSynthetic(dim, size, low, high, seed)
+    (E, _, _)=cfg.set_design_space()
+    (Y1, Y2, _, _, _, _)=cfg.set_evaluation(problem)
+    F=np.column_stack([np.ravel(Y1), np.ravel(Y2)])
+    reference=F.max(axis=0)+0.1*(F.max(axis=0)-F.min(axis=0))
+    df=pd.DataFrame(E, columns=["x{0}".format(i) for i in range(0, dim)])
+    (df["f1"], df["f2"])=(reference-F).T
+    return df
+
+class SyntheticFlexiBO(FlexiBOBase):
+    """This class is used to run the bo loop on a synthetic problem. Every
+    measurement is looked up in the evaluated design space and costs the
+    simulated cost of its objective
+    """
+    def __init__(self, data, surrogate):
+        self.trace=[]
+        self.start=time.perf_counter()
+        FlexiBOBase.__init__(self, data, surrogate)
+        # configs of the initial design are measured on every objective
+        self.initial_cost=self.init_size*sum(self.costs.values())
+        self.perform_bo_loop()
+
+    def set_design_space(self):
+        """This function is used to set the evaluated configs as design space
+        """
+        E=self.df[self.get_config_columns()].values.tolist()
+        return (E, None, None)
+
+    def get_config_columns(self):
+        """This function is used to get the decision variables
+        """
+        return [c for c in self.df.columns if c.startswith("x")]
+
+    def get_hypervolume(self):
+        """This function is used to compute the hypervolume of the configs
+        measured on every objective
+        """
+        front=[[self.measurement[i][o] for o in self.objectives]
+               for i, cur_eval in enumerate(self.O) if all(cur_eval.values())]
+        return self.pareto.compute_pareto_volume(front)
+
+    def evaluate(self, index, config,
+                 objective):
+        """This function is used to measure an objective of a config and trace
+        the hypervolume against the cost spent
+        """
+        self.add_measurement(index, objective, self.df[self.metrics[objective]].values[index])
+        self.add_cost(index, objective, self.costs[objective])
+        self.trace.append({"cost":self.initial_cost+self.cost_model.get_spent(),
+                           "hypervolume":self.get_hypervolume(),
+                           "objective":objective,
+                           "elapsed":time.perf_counter()-self.start})
+
+def write_config(run_dir, options):
+    """This function is used to write the config of the runs: the objectives
+    and simulated costs of the problem, the loop length and telemetry in the
+    run directory; everything else is taken from config.yaml
+    """
+    with open("config.yaml", "r") as fp:
+        config=yaml.safe_load(fp)
+    costs=[float(c) for c in options.costs.split(",")]
+    config["config"]["objective"]={"O1":"f1", "O2":"f2"}
+    config["config"]["evaluation_cost"]={"O1":costs[0], "O2":costs[1]}
+    config["config"]["loop"]["num_iter"]=options.iterations
+    config["config"]["initial_design"]["size"]=options.init_size
+    config["config"]["warm_start"]["enabled"]=False
+    config["config"]["constraints"]["bounds"]=[]
+    config["config"]["telemetry"]["fname"]="telemetry.jsonl"
+    with open(os.path.join(run_dir, "config.yaml"), "w") as fp:
+        yaml.safe_dump(config, fp)
+
+def run(problem, seed,
+        options):
+    """This function is used to run the loop once in a scratch directory
+    """
+    df=make_data(problem, options.dim, options.size, seed)
+    cwd=os.getcwd()
+    run_dir=tempfile.mkdtemp(prefix="flexibo_bench_")
+    try:
+        write_config(run_dir, options)
+        os.chdir(run_dir)
+        np.random.seed(seed)
+        start=time.perf_counter()
+        bo=SyntheticFlexiBO(df, options.surrogate)
+        seconds=time.perf_counter()-start
+        with open("telemetry.jsonl", "r") as fp:
+            records=[json.loads(line) for line in fp]
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(run_dir)
+    # hypervolume of the whole design space, the best the loop can reach
+    best=bo.pareto.compute_pareto_volume(df[["f1", "f2"]].values)
+    result={"problem":problem,
+            "seed":seed,
+            "dim":options.dim,
+            "size":options.size,
+            "costs":options.costs,
+            "surrogate":options.surrogate,
+            "seconds":seconds,
+            "iterations":len(records),
+            "iteration_seconds":[sum(r["phases"].values()) for r in records],
+            "best_hypervolume":best,
+            "final_hypervolume":bo.trace[-1]["hypervolume"] if bo.trace else 0.0,
+            "trace":bo.trace}
+    print ("[STATUS]: {0} seed {1}: hypervolume {2:.4g} of {3:.4g} for cost {4:.4g} in {5:.1f}s".format(
+           problem, seed, result["final_hypervolume"], best,
+           bo.trace[-1]["cost"] if bo.trace else 0.0, seconds))
+    return result
+
+def config_option_parser():
+    """This function is used to configure option parser
+    """
+    parser=OptionParser(usage="USAGE: python -m benchmarks.bench_synthetic [options]")
+    parser.add_option("--problems", action="store", type="string", dest="problems",
+                      default=",".join(sorted(PROBLEMS)), help="comma separated problems")
+    parser.add_option("--dim", action="store", type="int", dest="dim",
+                      default=3, help="number of decision variables")
+    parser.add_option("--size", action="store", type="int", dest="size",
+                      default=500, help="number of configs of the design space")
+    parser.add_option("--costs", action="store", type="string", dest="costs",
+                      default="1,10", help="simulated cost of o1,o2")
+    parser.add_option("--iterations", action="store", type="int", dest="iterations",
+                      default=50, help="iterations of the bo loop")
+    parser.add_option("--init-size", action="store", type="int", dest="init_size",
+                      default=10, help="configs of the initial design")
+    parser.add_option("--seeds", action="store", type="string", dest="seeds",
+                      default="0", help="comma separated seeds")
+    parser.add_option("-s", "--surrogate", action="store", type="string", dest="surrogate",
+                      default="GP", help="surrogate")
+    parser.add_option("--output", action="store", type="string", dest="output",
+                      default="bench_synthetic.json", help="json file of the results")
+    (options, _)=parser.parse_args()
+    return options
+
+if __name__=="__main__":
+    options=config_option_parser()
+    results=[run(problem, int(seed), options)
+             for problem in options.problems.split(",")
+             for seed in options.seeds.split(",")]
+    with open(options.output, "w") as fp:
+        json.dump({"python":sys.version.split()[0],
+                   "time":time.time(),
+                   "results":results}, fp, indent=2)
+    print ("[STATUS]: results written to {0}".format(options.output))
@@ -0,0 +1,144 @@
+"""-----------------------------------------------------------------------------
+@Name: Flexible Bayesian Optimization (FlexiBO): An active learning for optimiz-
+ing  multiple objectives of different cost
+@Version: 0.1
+@Author: Shahriar Iqbal
+--------------------------------------------------------------------------------
+Checks the pareto engine against brute-force references on random cases. Run
+from the repository root:
+
+    python -m benchmarks.check_pareto
+    python -m benchmarks.check_pareto --cases 2000 --objectives 2,3,4 --seed 1
+
+Points are drawn from a small integer grid so that ties and duplicates, where
+fast paths go wrong, are common. If numba is installed its kernels are also
+checked to return exactly what the NumPy kernels return. Every failing case is
+printed with its seed.
+"""
+import sys
+import itertools
+from optparse import OptionParser
+import numpy as np
+from src import kernels
+from src.pareto import Pareto
+
+def dominates(p, q):
+    """This function is used to check if p dominates q
+    """
+    return all(a>=b for a, b in zip(p, q)) and any(a>b for a, b in zip(p, q))
+
+def brute_nondominated(P):
+    """This function is used to get the distinct points no point dominates
+    """
+    return {tuple(p) for p in P if not any(dominates(q, p) for q in P)}
+
+def brute_volume(P):
+    """This function is used to compute the volume dominated by points from
+    the origin by inclusion-exclusion over their boxes
+    """
+    volume=0.0
+    P=np.maximum(np.asarray(P, dtype=float), 0)
+    for size in range(1, len(P)+1):
+        for subset in itertools.combinations(range(0, len(P)), size):
+            volume+=(-1)**(size+1)*float(np.prod(P[list(subset)].min(axis=0)))
+    return volume
+
+def brute_undominated(region):
+    """This function is used to get the configs whose optimistic bound no
+    pessimistic bound dominates
+    """
+    return [i for i, point in enumerate(region)
+            if not any(dominates(other["pes"], point["opt"]) for other in region)]
+
+def make_case(rng, num_obj):
+    """This function is used to draw the uncertainty regions of a case
+    """
+    n=rng.randint(1, 9)
+    pes=rng.randint(0, 5, size=(n, num_obj)).astype(float)
+    opt=pes+rng.randint(0, 3, size=(n, num_obj))
+    return [{"pes":pes[i].tolist(), "avg":((pes[i]+opt[i])/2).tolist(),
+             "opt":opt[i].tolist()} for i in range(0, n)]
+
+def check_case(pareto, region):
+    """This function is used to check one case
+    @returns:
+        names of the failed checks
+    """
+    failed=[]
+    pes=[point["pes"] for point in region]
+    keep=pareto.get_nondominated(pes)
+    if {tuple(pes[i]) for i in keep}!=brute_nondominated(pes) or len(keep)!=len(brute_nondominated(pes)):
+        failed.append("get_nondominated")
+    if not np.isclose(pareto.compute_pareto_volume(pes), brute_volume(pes)):
+        failed.append("compute_pareto_volume")
+    (ind, points)=pareto.identify_undominated_points(region)
+    if ind!=brute_undominated(region):
+        failed.append("identify_undominated_points")
+    (front, indices_map)=pareto.construct_pessimistic_pareto_front(ind, points, "CONSTRUCT")
+    if ({tuple(p) for p in front}!=brute_nondominated([p["pes"] for p in points]) or
+            any(region[indices_map[pos]]["pes"]!=p for pos, p in enumerate(front))):
+        failed.append("construct_pessimistic_pareto_front")
+    rank=pareto.nondominated_sort(pes)
+    for i, p in enumerate(pes):
+        better=[rank[j] for j, q in enumerate(pes) if dominates(q, p)]
+        if (better and rank[i]!=max(better)+1) or (not better and rank[i]!=0):
+            failed.append("nondominated_sort")
+            break
+    return failed
+
+def check_kernels(rng, num_obj):
+    """This function is used to check that the numba kernels return what the
+    NumPy kernels return, on integer and on float points
+    @returns:
+        names of the failed checks
+    """
+    failed=[]
+    n=rng.randint(1, 40)
+    for P in (rng.randint(0, 5, size=(n, num_obj)).astype(float), rng.random_sample((n, num_obj))):
+        S=P[np.lexsort([-P[:, j] for j in range(num_obj-1, -1, -1)])]
+        if not np.array_equal(kernels.nondominated_mask_numba(S), kernels.nondominated_mask_numpy(S)):
+            failed.append("nondominated_mask")
+        front=P[rng.random_sample(n)<0.3]
+        if not np.array_equal(kernels.dominated_mask_numba(front, P), kernels.dominated_mask_numpy(front, P)):
+            failed.append("dominated_mask")
+        if num_obj==2 and kernels.volume_2d_numba(P)!=kernels.volume_2d_numpy(P):
+            failed.append("volume_2d")
+        if num_obj==3 and kernels.volume_3d_numba(P)!=kernels.volume_3d_numpy(P):
+            failed.append("volume_3d")
+        if num_obj in (2, 3):
+            (positions, objectives, values)=(rng.randint(0, n, 10), rng.randint(0, num_obj, 10),
+                                             rng.random_sample(10))
+            if not np.array_equal(kernels.shrunk_volumes_numba(P, positions, objectives, values),
+                                  kernels.shrunk_volumes_numpy(P, positions, objectives, values)):
+                failed.append("shrunk_volumes")
+    return failed
+
+def config_option_parser():
+    """This function is used to configure option parser
+    """
+    parser=OptionParser(usage="USAGE: python -m benchmarks.check_pareto [options]")
+    parser.add_option("--cases", action="store", type="int", dest="cases",
+                      default=500, help="random cases per number of objectives")
+    parser.add_option("--objectives", action="store", type="string", dest="objectives",
+                      default="2,3", help="comma separated numbers of objectives")
+    parser.add_option("--seed", action="store", type="int", dest="seed",
+                      default=0, help="seed of the first case")
+    (options, _)=parser.parse_args()
+    return options
+
+if __name__=="__main__":
+    options=config_option_parser()
+    kernels.compile_kernels()
+    failures=0
+    for num_obj in [int(k) for k in options.objectives.split(",")]:
+        # volumes of every number of objectives are checked exactly
+        pareto=Pareto(num_obj, exact_max_obj=num_obj)
+        for seed in range(options.seed, options.seed+options.cases):
+            failed=check_case(pareto, make_case(np.random.RandomState(seed), num_obj))
+            if kernels.NUMBA:
+                failed+=check_kernels(np.random.RandomState(seed), num_obj)
+            if failed:
+                failures+=1
+                print ("[ERROR]: {0} objectives, seed {1}: {2}".format(num_obj, seed, ", ".join(failed)))
+        print ("[STATUS]: {0} objectives: {1} cases checked".format(num_obj, options.cases))
+    sys.exit(1 if failures else 0)
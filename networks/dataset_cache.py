@@ -0,0 +1,145 @@
+"""This module is used to share preprocessed training data across the network
+builders. Datasets are preprocessed once and stored as .npy files that every
+trainer opens memory-mapped, and batches are gathered and prefetched on a
+background thread
+"""
+import os
+import threading
+import numpy as np
+from queue import Queue, Full
+
+CACHE_DIR=os.environ.get("FLEXIBO_DATA_CACHE",
+                         os.path.join(os.path.expanduser("~"), ".flexibo", "datasets"))
+SPLITS=("x_train", "y_train", "x_test", "y_test")
+
+def load_raw(name):
+    """This function is used to load a dataset from keras
+    """
+    if name=="cifar10":
+        try:
+            from tensorflow.keras.datasets import cifar10
+        except ImportError:
+            from keras.datasets import cifar10
+        return cifar10.load_data()
+    raise ValueError("unknown dataset {0}".format(name))
+
+def get_path(name, split, num_classes=None,
+             cache_dir=CACHE_DIR):
+    """This function is used to get the cache file of a dataset split
+    """
+    suffix="" if num_classes is None or split.startswith("x") else "_onehot"
+    return os.path.join(cache_dir, "{0}_{1}{2}.npy".format(name, split, suffix))
+
+def build_cache(name, num_classes=None,
+                cache_dir=CACHE_DIR):
+    """This function is used to preprocess a dataset once and store it
+    """
+    if not os.path.isdir(cache_dir):
+        os.makedirs(cache_dir)
+    (x_train, y_train), (x_test, y_test)=load_raw(name)
+    arrays={"x_train":x_train, "y_train":y_train, "x_test":x_test, "y_test":y_test}
+    for split in SPLITS:
+        if split.startswith("x"):
+            data=(arrays[split]/255.0).astype(np.float32)
+        elif num_classes is not None:
+            data=np.eye(num_classes, dtype=np.float32)[arrays[split].reshape(-1)]
+        else:
+            data=arrays[split]
+        path=get_path(name, split, num_classes, cache_dir)
+        # write next to the final file and rename so that concurrent trainers
+        # never open a partially written array
+        tmp_path="{0}.{1}.tmp.npy".format(path[:-4], os.getpid())
+        np.save(tmp_path, data)
+        os.replace(tmp_path, path)
+
+def get_dataset(name="cifar10", num_classes=None,
+                cache_dir=CACHE_DIR):
+    """This function is used to get a preprocessed dataset
+    ------------------------------------------------------------------------
+    @args:
+        name: name of the dataset
+        num_classes: one-hot encode labels with this many classes if given
+        cache_dir: directory of the .npy cache
+    @returns:
+        x_train, y_train, x_test, y_test as read-only memory-mapped arrays
+    ------------------------------------------------------------------------
+    """
+    paths=[get_path(name, split, num_classes, cache_dir) for split in SPLITS]
+    if not all(os.path.exists(path) for path in paths):
+        build_cache(name, num_classes, cache_dir)
+    return tuple(np.load(path, mmap_mode="r") for path in paths)
+
+class BatchPipeline(object):
+    """This class is used to feed batches from memory-mapped arrays to keras.
+    Only the rows of a batch are copied out of the map, and the next batches
+    are gathered on a background thread while the current one trains. The
+    threads stop when their generator is closed or on close()
+    """
+    def __init__(self, x, y, batch_size=32,
+                 validation_split=0.0, prefetch=4, seed=None):
+        self.x=x
+        self.y=y
+        self.batch_size=batch_size
+        self.prefetch=prefetch
+        self.rng=np.random.RandomState(seed)
+        num_val=int(len(x)*validation_split)
+        self.train_index=np.arange(0, len(x)-num_val)
+        self.val_index=np.arange(len(x)-num_val, len(x))
+        self.train_steps=int(np.ceil(len(self.train_index)/float(batch_size)))
+        self.validation_steps=int(np.ceil(len(self.val_index)/float(batch_size)))
+        self.stops=[]
+
+    def get_batches(self, index, shuffle):
+        """This function is used to yield batches forever, one epoch after the
+        other
+        """
+        while True:
+            order=self.rng.permutation(index) if shuffle else index
+            for start in range(0, len(order), self.batch_size):
+                # sorted indices keep reads from the map sequential
+                batch=np.sort(order[start:start+self.batch_size])
+                yield (np.asarray(self.x[batch]), np.asarray(self.y[batch]))
+
+    def prefetch_batches(self, batches):
+        """This function is used to gather batches on a background thread
+        """
+        queue=Queue(maxsize=self.prefetch)
+        stop=threading.Event()
+        self.stops.append(stop)
+
+        def producer():
+            for batch in batches:
+                # wait for room in the queue, but give up once stopped
+                while not stop.is_set():
+                    try:
+                        queue.put(batch, timeout=0.1)
+                        break
+                    except Full:
+                        continue
+                if stop.is_set():
+                    return
+
+        thread=threading.Thread(target=producer)
+        thread.daemon=True
+        thread.start()
+        try:
+            while True:
+                yield queue.get()
+        finally:
+            stop.set()
+
+    def close(self):
+        """This function is used to stop every prefetch thread
+        """
+        for stop in self.stops:
+            stop.set()
+
+    def train_batches(self):
+        """This function is used to get shuffled, prefetched training batches
+        """
+        return self.prefetch_batches(self.get_batches(self.train_index, True))
+
+    def validation_batches(self):
+        """This function is used to get prefetched validation batches
+        """
+        return self.prefetch_batches(self.get_batches(self.val_index, False))
@@ -1,6 +1,7 @@
 
 from __future__ import print_function
 import os
+import sys
 import keras
 from keras.models import Sequential
 from keras.layers import Dense, Dropout, Activation, Flatten
@@ -11,7 +12,8 @@ class Lenet(object):
     """
     def __init__(self, layer1_n_filters, layer1_filter_size,
                 layer2_n_filters, layer2_filter_size, layer3_n_filters, 
-                layer3_filter_size, layer4_n_filters, layer4_filter_size):
+                layer3_filter_size, layer4_n_filters, layer4_filter_size,
+                fmodel=None, epochs=1, data_fraction=1.0):
         print ("initializing lenet class")
         # network config options
         self.layer1_n_filters = layer1_n_filters
@@ -22,24 +24,19 @@ class Lenet(object):
         self.layer3_filter_size = layer3_filter_size
         self.layer4_n_filters = layer4_n_filters
         self.layer4_filter_size = layer4_filter_size 
+        self.fmodel = fmodel or os.path.join(os.getcwd(),"model.h5")
         # params
         self.batch_size = 32
         self.num_classes = 10
-        self.epochs = 1
+        self.epochs = epochs
+        self.data_fraction = data_fraction
         self.num_predictions = 20
         
         
-        from keras.datasets import cifar10
-        (self.x_train, self.y_train), (self.x_test, self.y_test) = cifar10.load_data()
-        self.x_train = self.x_train.astype('float32')
-        self.x_test = self.x_test.astype('float32')
-        self.x_train /= 255
-        self.x_test /= 255   
-        # Convert class vectors to binary class matrices.
-        self.y_train = keras.utils.to_categorical(self.y_train, 
-                                                  self.num_classes)
-        self.y_test = keras.utils.to_categorical(self.y_test, 
-                                                 self.num_classes)
+        # preprocessed once and shared memory-mapped by every trainer
+        from dataset_cache import get_dataset
+        (self.x_train, self.y_train,
+         self.x_test, self.y_test) = get_dataset("cifar10", self.num_classes)
 
         self.train_model()
     
@@ -74,29 +71,29 @@ class Lenet(object):
         model.compile(loss='categorical_crossentropy', optimizer=opt, metrics=['accuracy'])
     
         # fit the model 
-        model.fit(self.x_train, self.y_train, batch_size=self.batch_size,
-                  epochs=self.epochs, validation_data=(self.x_test, self.y_test), shuffle=True)
+        from dataset_cache import BatchPipeline
+        num_train = int(len(self.x_train)*self.data_fraction)
+        pipeline = BatchPipeline(self.x_train[:num_train], self.y_train[:num_train],
+                                 batch_size=self.batch_size)
+        history = model.fit(pipeline.train_batches(), steps_per_epoch=pipeline.train_steps,
+                            epochs=self.epochs, validation_data=(self.x_test, self.y_test))
+        pipeline.close()
+        from trainer_config import report_metrics
+        report_metrics(history)
         
          # save model
-        fmodel=os.path.join(os.getcwd(),"model.h5") 
-        model.save(fmodel)
-
-def get_configurable_hyperparams():
-    """This function is used to ge the configurable hyperparameters 
-    """
-    import yaml
-    with open("cur_config.yaml") as fp:
-            cur_cfg=yaml.load(fp)
-    return (cur_cfg["cur_conf"][0], cur_cfg["cur_conf"][1], cur_cfg["cur_conf"][2],
-            cur_cfg["cur_conf"][3], cur_cfg["cur_conf"][4], cur_cfg["cur_conf"][5],
-            cur_cfg["cur_conf"][6], cur_cfg["cur_conf"][7])    
+        model.save(self.fmodel)
 
 if __name__=="__main__":
+    from trainer_config import get_configurable_hyperparams, get_fidelity
+    conf_file=sys.argv[1] if len(sys.argv)>1 else "cur_config.yaml"
     (layer1_n_filters, layer1_filter_size, layer2_n_filters, 
     layer2_filter_size, layer3_n_filters, layer3_filter_size, 
-    layer4_n_filters, layer4_filter_size)=get_configurable_hyperparams()
+    layer4_n_filters, layer4_filter_size)=get_configurable_hyperparams(conf_file, 8)
+    epochs, data_fraction=get_fidelity(conf_file, 1)
     Lenet(layer1_n_filters, layer1_filter_size,
          layer2_n_filters, layer2_filter_size, layer3_n_filters, 
-         layer3_filter_size, layer4_n_filters, layer4_filter_size)
+         layer3_filter_size, layer4_n_filters, layer4_filter_size,
+         sys.argv[2] if len(sys.argv)>2 else None, epochs, data_fraction)
 
 
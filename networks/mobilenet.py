@@ -16,6 +16,7 @@
 # MobileNet 224 (2017)
 # Paper: https://arxiv.org/pdf/1704.04861.pdf
 import os 
+import sys
 import tensorflow as tf
 from tensorflow.keras import layers, Input, Model
 
@@ -88,26 +89,16 @@ def depthwise_block(x, n_filters, alpha, strides):
     x = layers.ReLU()(x)
     return x
 
-def get_configurable_hyperparams():
-    """This function is used to ge the configurable hyperparameters 
-    """
-    import yaml
-    with open("cur_config.yaml") as fp:
-            cur_cfg=yaml.load(fp)
-    return (cur_cfg["cur_conf"][0], cur_cfg["cur_conf"][1], cur_cfg["cur_conf"][2],
-            cur_cfg["cur_conf"][3], cur_cfg["cur_conf"][4])
-
 def get_data():
-    """This function is used to get train and test data
+    """This function is used to get train and test data from the shared
+    memory-mapped dataset cache
     """
-    from tensorflow.keras.datasets import cifar10 
-    import numpy as np
-    (x_train, y_train), (x_test, y_test) = cifar10.load_data() 
-    x_train = (x_train / 255.0).astype(np.float32) 
-    x_test = (x_test / 255.0).astype(np.float32) 
-    return x_train, y_train, x_test, y_test
+    from dataset_cache import get_dataset
+    return get_dataset("cifar10")
 
 if __name__=="__main__":
+    from trainer_config import get_configurable_hyperparams, get_fidelity, report_metrics
+    conf_file=sys.argv[1] if len(sys.argv)>1 else "cur_config.yaml"
     
     # get configurable hyperparams
     (stem_n_filters,
@@ -115,7 +106,7 @@ if __name__=="__main__":
     depthwise_block1_n_filters,
     depthwise_block2_n_filters,
     depthwise_block3_n_filters,
-    depthwise_block4_n_filters,)=get_configurable_hyperparams()
+    depthwise_block4_n_filters,)=get_configurable_hyperparams(conf_file, 5)
 
     alpha      = 1    # width multiplier
     dropout    = 0.5  # dropout percentage
@@ -156,11 +147,19 @@ if __name__=="__main__":
     model.compile(loss='sparse_categorical_crossentropy', optimizer='adam', metrics=['acc'])
     model.summary()
 
-    xtrain, ytrain, x_test, y_test=get_data()    
-    # train model
-    model.fit(x_train, y_train, epochs=10, 
-              batch_size=32, validation_split=0.1, verbose=1)
+    from dataset_cache import BatchPipeline
+    x_train, y_train, x_test, y_test=get_data()    
+    # train model with the budget of the requested fidelity
+    epochs, data_fraction=get_fidelity(conf_file, 10)
+    num_train=int(len(x_train)*data_fraction)
+    pipeline=BatchPipeline(x_train[:num_train], y_train[:num_train],
+                           batch_size=32, validation_split=0.1)
+    history=model.fit(pipeline.train_batches(), steps_per_epoch=pipeline.train_steps,
+                      epochs=epochs, validation_data=pipeline.validation_batches(),
+                      validation_steps=pipeline.validation_steps, verbose=1)
+    pipeline.close()
+    report_metrics(history)
     
     # save model
-    fmodel=os.path.join(os.getcwd(),"model.h5") 
+    fmodel=sys.argv[2] if len(sys.argv)>2 else os.path.join(os.getcwd(),"model.h5")
     model.save(fmodel)
@@ -0,0 +1,38 @@
+"""This module is used to share reading the current config across the network
+trainers. ConfigNetwork writes the config of the job, with the fidelity it is
+trained at, and the trainer reads it back. The validation metrics of the last
+epoch are printed back to ConfigNetwork, which reads them from the output of
+the job
+"""
+# prefix of the metrics line ConfigNetwork looks for
+METRICS_PREFIX="[METRICS]: "
+
+def read_config(fname="cur_config.yaml"):
+    """This function is used to read the config written for the job
+    """
+    import yaml
+    with open(fname) as fp:
+        return yaml.safe_load(fp)
+
+def get_fidelity(fname="cur_config.yaml", epochs=1):
+    """This function is used to get the training budget of the requested
+    fidelity; epochs is the full-fidelity budget of the trainer
+    @returns:
+        (epochs, fraction of the training data)
+    """
+    fidelity=read_config(fname).get("fidelity") or {}
+    return fidelity.get("epochs", epochs), fidelity.get("data_fraction", 1.0)
+
+def get_configurable_hyperparams(fname="cur_config.yaml", num_params=5):
+    """This function is used to get the first num_params configurable
+    hyperparameters of the network
+    """
+    return tuple(read_config(fname)["cur_conf"][:num_params])
+
+def report_metrics(history):
+    """This function is used to print the metrics of the last epoch of a keras
+    history, e.g. val_loss, so that low fidelity jobs can be ranked
+    """
+    import json
+    metrics={name: float(values[-1]) for name, values in history.history.items() if len(values)}
+    print (METRICS_PREFIX+json.dumps(metrics))
@@ -0,0 +1,117 @@
+"""-----------------------------------------------------------------------------
+@Name: Flexible Bayesian Optimization (FlexiBO): An active learning for optimiz-
+ing  multiple objectives of different cost
+@Version: 0.1
+@Author: Shahriar Iqbal
+--------------------------------------------------------------------------------
+"""
+import os
+import zlib
+import hashlib
+import tempfile
+
+CHUNK_SIZE=1<<20
+
+class ModelStore(object):
+    """This class is used to keep trained models in a local content-addressed
+    store. Models are named by their sha256 digest so a model that is already
+    present is never transferred again
+    """
+    def __init__(self, store_dir, compress=True,
+                 level=1, timeout=None):
+        print ("[STATUS]: Initializing ModelStore Class")
+        self.store_dir=store_dir
+        self.compress=compress
+        self.level=level
+        # seconds after which a remote hash or compression is abandoned
+        self.timeout=timeout
+        if not os.path.isdir(self.store_dir):
+            os.makedirs(self.store_dir)
+
+    def get_path(self, digest, suffix=".h5"):
+        """This function is used to get the store path of a digest
+        """
+        return os.path.join(self.store_dir, digest+suffix)
+
+    def contains(self, digest, suffix=".h5"):
+        """This function is used to check whether a model is already stored
+        """
+        return os.path.exists(self.get_path(digest, suffix))
+
+    def get_remote_digest(self, client, remote_path):
+        """This function is used to hash a model on the trainer side
+        @returns:
+            sha256 digest or None if the trainer cannot compute it
+        """
+        status, lines=client.run("sha256sum {0}".format(remote_path),
+                                 timeout=self.timeout)
+        if status!=0 or not lines:
+            return None
+        return lines[-1].split()[0]
+
+    def fetch(self, client, remote_path):
+        """This function is used to bring a remote model into the store
+        ------------------------------------------------------------------------
+        @args:
+            client: pooled transport of the trainer that holds the model
+            remote_path: path of the model on the trainer
+        @returns:
+            path of the model in the local store
+        ------------------------------------------------------------------------
+        """
+        suffix=os.path.splitext(remote_path)[1]
+        digest=self.get_remote_digest(client, remote_path)
+        if digest is not None and self.contains(digest, suffix):
+            print ("[STATUS]: model {0} already in store, skipping transfer".format(digest[:12]))
+            return self.get_path(digest, suffix)
+
+        source=remote_path
+        compressed=False
+        if self.compress:
+            status, _=client.run("gzip -c -{0} {1} > {1}.gz".format(self.level, remote_path),
+                                 timeout=self.timeout)
+            if status==0:
+                (source, compressed)=(remote_path+".gz", True)
+        try:
+            local_digest, tmp_path=self.stream(client, source, compressed)
+        finally:
+            if compressed:
+                client.run("rm -f {0}".format(source), timeout=self.timeout)
+        if digest is not None and digest!=local_digest:
+            os.remove(tmp_path)
+            raise IOError("model transfer corrupted: expected {0} got {1}".format(
+                          digest, local_digest))
+        path=self.get_path(local_digest, suffix)
+        os.replace(tmp_path, path)
+        return path
+
+    def stream(self, client, source, compressed):
+        """This function is used to stream a remote file into a temporary file
+        of the store, decompressing and hashing it on the fly
+        @returns:
+            (digest, tmp_path): sha256 of the decompressed model and its path
+        """
+        sha=hashlib.sha256()
+        decompressor=zlib.decompressobj(16+zlib.MAX_WBITS) if compressed else None
+        fd, tmp_path=tempfile.mkstemp(dir=self.store_dir, suffix=".part")
+        try:
+            with client.open(source, "rb") as src, os.fdopen(fd, "wb") as dst:
+                if hasattr(src, "prefetch"):
+                    # pipeline sftp reads instead of one round trip per chunk
+                    src.prefetch()
+                while True:
+                    chunk=src.read(CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    if decompressor is not None:
+                        chunk=decompressor.decompress(chunk)
+                    sha.update(chunk)
+                    dst.write(chunk)
+                if decompressor is not None:
+                    chunk=decompressor.flush()
+                    sha.update(chunk)
+                    dst.write(chunk)
+        except Exception:
+            os.remove(tmp_path)
+            raise
+        return (sha.hexdigest(), tmp_path)
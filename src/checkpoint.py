@@ -0,0 +1,58 @@
+"""-----------------------------------------------------------------------------
+@Name: Flexible Bayesian Optimization (FlexiBO): An active learning for optimiz-
+ing  multiple objectives of different cost
+@Version: 0.1
+@Author: Shahriar Iqbal
+--------------------------------------------------------------------------------
+"""
+import os
+import zlib
+import pickle
+
+class Checkpoint(object):
+    """This class is used to persist the optimizer state to a compact binary
+    file. Writes are atomic: the state is written to a temporary file, synced
+    and renamed over the previous checkpoint, so a crash or reboot while
+    saving leaves the last complete checkpoint in place
+    """
+    def __init__(self, fname, interval=1):
+        print ("[STATUS]: Initializing Checkpoint Class")
+        self.fname=fname
+        self.interval=interval
+
+    def exists(self):
+        """This function is used to check whether there is a checkpoint
+        """
+        return os.path.exists(self.fname)
+
+    def is_due(self, iteration):
+        """This function is used to check whether to save after an iteration
+        """
+        return (iteration+1)%self.interval==0
+
+    def save(self, state):
+        """This function is used to atomically save the optimizer state
+        """
+        data=zlib.compress(pickle.dumps(state, pickle.HIGHEST_PROTOCOL))
+        tmp_fname=self.fname+".tmp"
+        with open(tmp_fname, "wb") as fp:
+            fp.write(data)
+            fp.flush()
+            os.fsync(fp.fileno())
+        os.replace(tmp_fname, self.fname)
+        # sync the directory so the rename itself survives a power loss
+        dir_fd=os.open(os.path.dirname(os.path.abspath(self.fname)), os.O_RDONLY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+    def load(self):
+        """This function is used to load the optimizer state
+        @returns:
+            saved state or None if there is no checkpoint
+        """
+        if not self.exists():
+            return None
+        with open(self.fname, "rb") as fp:
+            return pickle.loads(zlib.decompress(fp.read()))
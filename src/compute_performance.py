@@ -3,24 +3,25 @@ import sys
 import subprocess
 import time
 import json
-import yaml
 import numpy as np
 from multiprocessing import Process
-from apscheduler.schedulers.background import BackgroundScheduler
+from src.config import get_config, DEVICE_METRICS
 
 class ComputePerformance(object):
     """This function is used to compute accuracy and energy consumption
     """
     def __init__(self, fname, objectives,
-                data):
+                data, cfg=None):
         print ("[STATUS]: Initializing Compute Performance Class")
-        with open("config.yaml") as fp:
-            self.cfg=yaml.load(fp)
+        from apscheduler.schedulers.background import BackgroundScheduler
+        self.cfg=get_config(cfg)
         self.cur_sys="TX2"
         self.fname=fname 
         self.model=self.get_model()
         (self.x_test, self.y_test)=self.get_test_data()
         self.total_power=list()
+        self.inference_time=None
+        self.accuracy=None
        
         # create scheduler
         job_defaults= {"coalesce":False,
@@ -47,7 +48,7 @@ class ComputePerformance(object):
     def compute_power(self):
         """This function is used to read power consumption using from INA monitor 
         """
-        filename=self.cfg["config"]["systems"][self.cur_sys]["power"]["total"]
+        filename=self.cfg.systems[self.cur_sys].power["total"]
         try:
             
             self.total_power.append(subprocess.getstatusoutput("cat {0}".format(filename))[1])
@@ -62,6 +63,9 @@ class ComputePerformance(object):
             output=self.model.evaluate(self.x_test,self.y_test)
             
             duration=time.time()-start
+            # evaluate returns the loss followed by the compiled metrics
+            if isinstance(output, (list, tuple)) and len(output)>1:
+                self.accuracy=float(output[1])
             return duration         
         except Exception as e:
             print("[ERROR]: prediction failed due to {0}".format (str(e)))
@@ -72,5 +76,17 @@ class ComputePerformance(object):
         self.total_power=[int(i) if i is not None else 0 for i in self.total_power ]    
         self.total_power=np.sum(self.total_power)   
         return self.inference_time, self.total_power
+
+    def get_metric(self, metric):
+        """This function is used to get the measured value of a metric, one
+        of DEVICE_METRICS
+        """
+        if metric not in DEVICE_METRICS:
+            raise ValueError("metric {0} cannot be measured on the device".format(metric))
+        (inference_time, total_power)=self.get_output_metrics()
+        return {"inference_time":inference_time,
+                "energy":total_power,
+                "accuracy":self.accuracy}[metric]
         
-ComputePerformance("model.h5",["energy","accuracy"],"x")      
+if __name__=="__main__":
+    ComputePerformance("model.h5",["energy","accuracy"],"x")
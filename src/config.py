@@ -0,0 +1,721 @@
+"""-----------------------------------------------------------------------------
+@Name: Flexible Bayesian Optimization (FlexiBO): An active learning for optimiz-
+ing  multiple objectives of different cost
+@Version: 0.1
+@Author: Shahriar Iqbal
+--------------------------------------------------------------------------------
+"""
+import os
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+import yaml
+
+# libyaml's loader when PyYAML was built with it
+LOADER=getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# sections every mode reads
+SECTIONS=("objective", "evaluation_cost", "design_space", "network", "loop",
+          "initial_design", "checkpoint", "cost_model", "hypervolume",
+          "telemetry")
+
+# parsed configs by path, overrides and mode, dropped when the file changes
+CACHE={}
+
+# beta schedules and profilers the loop supports
+SCHEDULES=("fixed", "gp-ucb")
+PROFILERS=("cprofile", "pyinstrument")
+
+# metrics ComputePerformance measures on the device in online mode
+DEVICE_METRICS=("inference_time", "energy", "accuracy")
+
+@dataclass
+class DesignSpace(object):
+    """This class is used to keep the levels of every option of every layer
+    of the design space. Levels and mixed-radix tables of a selection of
+    layers are derived once and cached
+    """
+    layers: Dict[str, Dict[str, list]]
+    tables: dict=field(default_factory=dict, repr=False, compare=False)
+
+    def get_levels(self, layers):
+        """This function is used to get the levels of the options of the
+        layers, in the order of the config
+        """
+        return self.get_table(layers)[0]
+
+    def get_table(self, layers):
+        """This function is used to get the levels and the (radix, strides)
+        table configs of the layers are indexed with
+        """
+        key=tuple(layers)
+        if key not in self.tables:
+            from src.initial_design import get_strides
+            levels=[list(values) for name, options in self.layers.items()
+                    if name in key for values in options.values()]
+            self.tables[key]=(levels, get_strides(levels))
+        return self.tables[key]
+
+@dataclass
+class System(object):
+    """This class is used to keep the sysfs files of a device
+    """
+    cores: Dict[str, str]
+    gpu: Dict[str, str]
+    emc: Dict[str, str]
+    power: Dict[str, str]
+
+@dataclass
+class Remote(object):
+    """This class is used to keep the remote training host. entry is the
+    mapping the connection pool is keyed and connected with
+    """
+    host: str
+    user: str
+    password: Optional[str]
+    keyfile: Optional[str]
+    port: int
+    transport: str
+    timeout: Optional[float]
+    compress: bool
+    max_retries: int
+    code_dir: str
+    model_dir: str
+    conf_dir: str
+    entry: dict=field(repr=False)
+
+@dataclass
+class Beta(object):
+    """This class is used to keep the beta schedule of the uncertainty regions
+    """
+    schedule: str
+    value: float
+    delta: float
+    scale: float
+
+@dataclass
+class Stopping(object):
+    """This class is used to keep the stopping rules of the bo loop; a rule
+    set to None is not checked
+    """
+    min_iter: int
+    volume_gap: Optional[float]
+    patience: Optional[int]
+    cost_budget: Optional[float]
+
+@dataclass
+class Loop(object):
+    """This class is used to keep the length, beta schedule and stopping
+    rules of the bo loop
+    """
+    num_iter: int
+    beta: Beta
+    stopping: Stopping
+
+@dataclass
+class Telemetry(object):
+    """This class is used to keep the telemetry file and profiler of the loop
+    """
+    fname: Optional[str]
+    profile: Optional[str]
+    profile_dir: str
+
+@dataclass
+class Features(object):
+    """This class is used to keep the features the surrogates are fitted on
+    """
+    enabled: bool
+    log_columns: List[str]
+    cores_column: Optional[str]
+    interactions: List[List[str]]
+
+@dataclass
+class Fidelity(object):
+    """This class is used to keep the fidelity levels of the network
+    objective. Every level is a mapping of epochs, data_fraction and cost;
+    configs are ranked by the validation metric the trainer reports
+    """
+    enabled: bool
+    objective: Optional[str]
+    promote_fraction: float
+    levels: List[dict]
+    metric: str
+
+@dataclass
+class Constraints(object):
+    """This class is used to keep the budgets deployed configs have to meet.
+    Every bound is a mapping of an objective metric, an operator and a value
+    """
+    min_probability: float
+    bounds: List[dict]
+
+@dataclass
+class CostModel(object):
+    """This class is used to keep the number of measured evaluation costs an
+    objective needs before its costs are predicted
+    """
+    min_samples: int
+
+@dataclass
+class Hypervolume(object):
+    """This class is used to keep up to how many objectives the hypervolume
+    is exact and the monte carlo samples above that
+    """
+    exact_max_objectives: int
+    mc_samples: int
+
+@dataclass
+class Checkpoint(object):
+    """This class is used to keep the checkpoint file and how often it is saved
+    """
+    fname: str
+    interval: int
+
+@dataclass
+class InitialDesign(object):
+    """This class is used to keep the method, size and seed of the configs
+    measured before the bo loop
+    """
+    method: str
+    size: int
+    seed: Optional[int]
+
+@dataclass
+class WarmStart(object):
+    """This class is used to keep the measurement tables used as prior of the
+    surrogates and the initial design size when a prior is used
+    """
+    enabled: bool
+    sources: List[str]
+    init_size: int
+
+@dataclass
+class Tuning(object):
+    """This class is used to keep the cross validation the hyperparameters of
+    the surrogates are tuned with
+    """
+    enabled: bool
+    n_calls: int
+    folds: int
+    n_jobs: int
+    retune_fraction: float
+    min_samples: int
+
+@dataclass
+class Offline(object):
+    """This class is used to keep the measurement table replayed in offline
+    mode: the columns that form a config and the column of every objective
+    """
+    measurement_dir: Optional[str]
+    config_columns: List[str]
+    objective: Dict[str, str]
+
+@dataclass
+class Online(object):
+    """This class is used to keep the network objective, the training hosts
+    of the job queue and the local model and config files of online mode
+    """
+    network_objective: str
+    workers: List[dict]
+    model_dir: str
+    conf_dir: str
+    store_dir: Optional[str]
+
+@dataclass
+class Config(object):
+    """This class is used to keep the parsed config. Every section the
+    optimizer reads is validated into a typed field; the raw sections are
+    still readable as config["config"][section]. The online section and
+    remote host are only validated for the online mode, the offline section
+    for every other mode
+    """
+    network: str
+    objectives: Dict[str, str]
+    costs: Dict[str, float]
+    design_space: DesignSpace
+    systems: Dict[str, System]
+    loop: Loop
+    telemetry: Telemetry
+    features: Features
+    fidelity: Fidelity
+    constraints: Constraints
+    cost_model: CostModel
+    hypervolume: Hypervolume
+    checkpoint: Checkpoint
+    initial_design: InitialDesign
+    warm_start: WarmStart
+    tuning: Tuning
+    offline: Optional[Offline]
+    online: Optional[Online]
+    remote: Optional[Remote]
+    raw: dict=field(repr=False)
+
+    def __getitem__(self, key):
+        return self.raw[key]
+
+def get_objectives(cfg, errors):
+    """This function is used to validate the objectives O1..Ok and their costs
+    @returns:
+        (dict from objective o1..ok to its metric, dict to its cost)
+    """
+    objectives={}
+    for key, metric in (cfg.get("objective") or {}).items():
+        if not (str(key)[:1] in "Oo" and str(key)[1:].isdigit()):
+            errors.append("objective {0} is not named O1..Ok".format(key))
+        elif not isinstance(metric, str):
+            errors.append("objective {0} has no metric".format(key))
+        else:
+            objectives[str(key).lower()]=metric
+    if not objectives:
+        errors.append("no objectives")
+    names=sorted(objectives, key=lambda o: int(o[1:]))
+    if names!=["o{0}".format(i+1) for i in range(0, len(names))]:
+        errors.append("objectives are not numbered O1..O{0}".format(len(names)))
+    costs={}
+    evaluation_cost={str(k).lower(): v for k, v in (cfg.get("evaluation_cost") or {}).items()}
+    for objective in objectives:
+        cost=evaluation_cost.get(objective, 1.0)
+        if isinstance(cost, bool) or not isinstance(cost, (int, float)) or cost<=0:
+            errors.append("evaluation cost of {0} is not a positive number".format(objective))
+        else:
+            costs[objective]=float(cost)
+    return (objectives, costs)
+
+def is_number(value, low=None,
+              high=None, integer=False):
+    """This function is used to check a value of the config is a number,
+    optionally an integer, in (low, high]
+    """
+    if isinstance(value, bool) or not isinstance(value, int if integer else (int, float)):
+        return False
+    return (low is None or value>low) and (high is None or value<=high)
+
+def get_loop(cfg, errors):
+    """This function is used to validate the length, beta schedule and
+    stopping rules of the bo loop
+    """
+    loop=cfg.get("loop") or {}
+    beta=loop.get("beta") or {}
+    stopping=loop.get("stopping") or {}
+    num_iter=loop.get("num_iter", 0)
+    if not is_number(num_iter, -1, integer=True):
+        errors.append("loop.num_iter is not a non-negative integer")
+    schedule=beta.get("schedule", "fixed")
+    if schedule not in SCHEDULES:
+        errors.append("loop.beta.schedule {0} is not one of {1}".format(schedule, ", ".join(SCHEDULES)))
+    for key in ("value", "scale"):
+        if not is_number(beta.get(key, 1.0), 0):
+            errors.append("loop.beta.{0} is not a positive number".format(key))
+    if not is_number(beta.get("delta", 0.1), 0, 1):
+        errors.append("loop.beta.delta is not in (0, 1]")
+    min_iter=stopping.get("min_iter", 0)
+    if not is_number(min_iter, -1, integer=True):
+        errors.append("loop.stopping.min_iter is not a non-negative integer")
+    volume_gap=stopping.get("volume_gap")
+    if volume_gap is not None and not is_number(volume_gap, 0, 1):
+        errors.append("loop.stopping.volume_gap is not null or in (0, 1]")
+    patience=stopping.get("patience")
+    if patience is not None and not is_number(patience, 0, integer=True):
+        errors.append("loop.stopping.patience is not null or a positive integer")
+    cost_budget=stopping.get("cost_budget")
+    if cost_budget is not None and not is_number(cost_budget, 0):
+        errors.append("loop.stopping.cost_budget is not null or a positive number")
+    return Loop(num_iter,
+                Beta(schedule, beta.get("value", 1.0), beta.get("delta", 0.1),
+                     beta.get("scale", 1.0)),
+                Stopping(min_iter, volume_gap, patience, cost_budget))
+
+def get_telemetry(cfg, errors):
+    """This function is used to validate the telemetry file and profiler
+    """
+    telemetry=cfg.get("telemetry") or {}
+    fname=telemetry.get("fname")
+    if fname is not None and not isinstance(fname, str):
+        errors.append("telemetry.fname is not null or a file name")
+    profile=telemetry.get("profile")
+    if profile is not None and profile not in PROFILERS:
+        errors.append("telemetry.profile {0} is not null, {1}".format(profile, " or ".join(PROFILERS)))
+    return Telemetry(fname, profile, str(telemetry.get("profile_dir", "profiles")))
+
+def get_features(cfg, errors):
+    """This function is used to validate the features of the surrogates
+    """
+    features=cfg.get("features") or {}
+    log_columns=features.get("log_columns") or []
+    if not isinstance(log_columns, list) or not all(isinstance(c, str) for c in log_columns):
+        errors.append("features.log_columns is not a list of columns")
+        log_columns=[]
+    interactions=features.get("interactions") or []
+    if not isinstance(interactions, list) or not all(
+            isinstance(pair, list) and len(pair)==2 for pair in interactions):
+        errors.append("features.interactions is not a list of pairs")
+        interactions=[]
+    return Features(bool(features.get("enabled", False)), log_columns,
+                    features.get("cores_column", "num_cores"), interactions)
+
+def get_fidelity(cfg, objectives,
+                 errors):
+    """This function is used to validate the fidelity levels of the network
+    objective. Levels are only checked if fidelity is enabled
+    """
+    fidelity=cfg.get("fidelity") or {}
+    enabled=bool(fidelity.get("enabled", False))
+    objective=fidelity.get("objective")
+    promote_fraction=fidelity.get("promote_fraction", 0.5)
+    levels=fidelity.get("levels") or []
+    metric=fidelity.get("metric", "val_loss")
+    if not enabled:
+        return Fidelity(False, objective, promote_fraction, levels, metric)
+    objective=str(objective).lower()
+    if objective not in objectives:
+        errors.append("fidelity.objective {0} is not an objective".format(fidelity.get("objective")))
+    if not is_number(promote_fraction, 0, 1):
+        errors.append("fidelity.promote_fraction is not in (0, 1]")
+    if not isinstance(metric, str) or not metric.startswith("val_"):
+        errors.append("fidelity.metric {0} is not a validation metric such as val_loss".format(metric))
+    if not isinstance(levels, list) or len(levels)==0:
+        errors.append("fidelity has no levels")
+        levels=[]
+    for i, level in enumerate(levels):
+        if not isinstance(level, dict):
+            errors.append("fidelity level {0} is not a mapping".format(i))
+        elif not is_number(level.get("epochs"), 0, integer=True):
+            errors.append("fidelity level {0} epochs is not a positive integer".format(i))
+        elif not is_number(level.get("data_fraction"), 0, 1):
+            errors.append("fidelity level {0} data_fraction is not in (0, 1]".format(i))
+        elif not is_number(level.get("cost"), 0, 1):
+            errors.append("fidelity level {0} cost is not in (0, 1]".format(i))
+    return Fidelity(True, objective, promote_fraction, levels, metric)
+
+def get_constraints(cfg, objectives,
+                    mode, errors):
+    """This function is used to validate the budgets. A bound has to be on
+    the metric of an objective: the configured objectives online, the
+    replayed table columns offline and either if the mode is not known
+    """
+    constraints=cfg.get("constraints") or {}
+    min_probability=constraints.get("min_probability", 0.05)
+    if not is_number(min_probability, -1e-12, 1):
+        errors.append("constraints.min_probability is not in [0, 1]")
+    metrics=set()
+    if mode!="offline":
+        metrics.update(objectives.values())
+    if mode!="online":
+        metrics.update(str(m) for m in ((cfg.get("offline") or {}).get("objective") or {}).values())
+    bounds=constraints.get("bounds") or []
+    if not isinstance(bounds, list):
+        errors.append("constraints.bounds is not a list")
+        bounds=[]
+    from src.constraints import OPERATORS
+    for bound in bounds:
+        if not isinstance(bound, dict):
+            errors.append("constraint {0} is not a mapping".format(bound))
+        elif bound.get("metric") not in metrics:
+            errors.append("constraint on {0} which is not an objective metric, one of {1}".format(
+                          bound.get("metric"), ", ".join(sorted(metrics))))
+        elif bound.get("op") not in OPERATORS:
+            errors.append("constraint operator {0} is not one of {1}".format(
+                          bound.get("op"), ", ".join(OPERATORS)))
+        elif not is_number(bound.get("value")):
+            errors.append("constraint on {0} has no numeric value".format(bound["metric"]))
+    return Constraints(min_probability, bounds)
+
+def get_cost_model(cfg, errors):
+    """This function is used to validate the cost model
+    """
+    min_samples=(cfg.get("cost_model") or {}).get("min_samples", 5)
+    if not is_number(min_samples, 0, integer=True):
+        errors.append("cost_model.min_samples is not a positive integer")
+    return CostModel(min_samples)
+
+def get_hypervolume(cfg, errors):
+    """This function is used to validate how the hypervolume is computed
+    """
+    hypervolume=cfg.get("hypervolume") or {}
+    exact_max_objectives=hypervolume.get("exact_max_objectives", 3)
+    mc_samples=hypervolume.get("mc_samples", 10000)
+    for key, value in (("exact_max_objectives", exact_max_objectives),
+                       ("mc_samples", mc_samples)):
+        if not is_number(value, 0, integer=True):
+            errors.append("hypervolume.{0} is not a positive integer".format(key))
+    return Hypervolume(exact_max_objectives, mc_samples)
+
+def get_checkpoint(cfg, errors):
+    """This function is used to validate the checkpoint file and interval
+    """
+    checkpoint=cfg.get("checkpoint") or {}
+    fname=checkpoint.get("fname", "flexibo_checkpoint.bin")
+    if not isinstance(fname, str) or not fname:
+        errors.append("checkpoint.fname is not a file name")
+    interval=checkpoint.get("interval", 1)
+    if not is_number(interval, 0, integer=True):
+        errors.append("checkpoint.interval is not a positive integer")
+    return Checkpoint(fname, interval)
+
+def get_initial_design(cfg, errors):
+    """This function is used to validate the method, size and seed of the
+    initial design
+    """
+    from src.initial_design import METHODS
+    initial_design=cfg.get("initial_design") or {}
+    method=initial_design.get("method", "sobol")
+    if method not in METHODS:
+        errors.append("initial_design.method {0} is not one of {1}".format(method, ", ".join(METHODS)))
+    size=initial_design.get("size", 20)
+    if not is_number(size, 0, integer=True):
+        errors.append("initial_design.size is not a positive integer")
+    seed=initial_design.get("seed")
+    if seed is not None and not is_number(seed, -1, integer=True):
+        errors.append("initial_design.seed is not null or a non-negative integer")
+    return InitialDesign(method, size, seed)
+
+def get_warm_start(cfg, errors):
+    """This function is used to validate the prior of the surrogates. The
+    sources are only checked if warm start is enabled
+    """
+    warm_start=cfg.get("warm_start") or {}
+    enabled=bool(warm_start.get("enabled", False))
+    sources=warm_start.get("sources") or []
+    init_size=warm_start.get("init_size", 5)
+    if not enabled:
+        return WarmStart(False, sources, init_size)
+    if not isinstance(sources, list) or len(sources)==0 or not all(
+            isinstance(s, str) for s in sources):
+        errors.append("warm_start.sources is not a list of measurement tables")
+        sources=[]
+    if not is_number(init_size, 0, integer=True):
+        errors.append("warm_start.init_size is not a positive integer")
+    return WarmStart(True, sources, init_size)
+
+def get_tuning(cfg, errors):
+    """This function is used to validate the tuning of the surrogates. The
+    cross validation is only checked if tuning is enabled
+    """
+    tuning=cfg.get("tuning") or {}
+    enabled=bool(tuning.get("enabled", False))
+    n_calls=tuning.get("n_calls", 20)
+    folds=tuning.get("folds", 5)
+    n_jobs=tuning.get("n_jobs", -1)
+    retune_fraction=tuning.get("retune_fraction", 0.5)
+    min_samples=tuning.get("min_samples", 10)
+    if not enabled:
+        return Tuning(False, n_calls, folds, n_jobs, retune_fraction, min_samples)
+    if not is_number(n_calls, 0, integer=True):
+        errors.append("tuning.n_calls is not a positive integer")
+    if not is_number(folds, 1, integer=True):
+        errors.append("tuning.folds is not an integer of at least 2")
+    if not is_number(n_jobs, integer=True) or n_jobs==0:
+        errors.append("tuning.n_jobs is not a non-zero integer")
+    if not is_number(retune_fraction, 0):
+        errors.append("tuning.retune_fraction is not a positive number")
+    if not is_number(min_samples, 0, integer=True):
+        errors.append("tuning.min_samples is not a positive integer")
+    return Tuning(True, n_calls, folds, n_jobs, retune_fraction, min_samples)
+
+def get_offline(cfg, errors):
+    """This function is used to validate the measurement table replayed in
+    offline mode
+    """
+    offline=cfg.get("offline")
+    if not isinstance(offline, dict):
+        errors.append("offline mode has no offline section")
+        return None
+    config_columns=offline.get("config_columns")
+    if not isinstance(config_columns, list) or len(config_columns)==0 or not all(
+            isinstance(c, str) for c in config_columns):
+        errors.append("offline.config_columns is not a list of columns")
+        config_columns=[]
+    objective={}
+    for key, column in (offline.get("objective") or {}).items():
+        if not (str(key)[:1] in "Oo" and str(key)[1:].isdigit()) or not isinstance(column, str):
+            errors.append("offline.objective {0} is not an objective O1..Ok and its column".format(key))
+        else:
+            objective[str(key).lower()]=column
+    if not objective:
+        errors.append("offline.objective has no columns")
+    return Offline(offline.get("measurement_dir"), config_columns, objective)
+
+def get_online(cfg, objectives,
+               errors):
+    """This function is used to validate the network objective, training
+    hosts and local files of the online mode
+    """
+    online=cfg.get("online")
+    if not isinstance(online, dict):
+        errors.append("online mode has no online section")
+        return None
+    network_objective=str(online.get("network_objective")).lower()
+    if network_objective not in objectives:
+        errors.append("online.network_objective {0} is not an objective".format(
+                      online.get("network_objective")))
+    workers=online.get("workers") or [{}]
+    if not isinstance(workers, list) or not all(isinstance(w, dict) for w in workers):
+        errors.append("online.workers is not a list of hosts")
+        workers=[{}]
+    local=online.get("local") or {}
+    for key in ("model_dir", "conf_dir"):
+        if not isinstance(local.get(key), str):
+            errors.append("online.local.{0} is not a file name".format(key))
+    store_dir=local.get("store_dir")
+    if store_dir is not None and not isinstance(store_dir, str):
+        errors.append("online.local.store_dir is not null or a directory")
+    return Online(network_objective, workers, local.get("model_dir"),
+                  local.get("conf_dir"), store_dir)
+
+def get_design_space(cfg, errors):
+    """This function is used to validate the levels of the design space
+    """
+    layers={}
+    for name, options in (cfg.get("design_space") or {}).items():
+        if not isinstance(options, dict):
+            errors.append("design space layer {0} has no options".format(name))
+            continue
+        for option, values in options.items():
+            if not isinstance(values, list) or len(values)==0:
+                errors.append("design space option {0}.{1} has no levels".format(name, option))
+        layers[name]=options
+    return DesignSpace(layers)
+
+def get_systems(cfg, errors):
+    """This function is used to validate the sysfs files of every device
+    """
+    systems={}
+    for name, system in (cfg.get("systems") or {}).items():
+        try:
+            systems[name]=System(dict(system["cpu"]["cores"]),
+                                 {"current":system["gpu"]["frequency"]["current"],
+                                  "available":system["gpu"]["frequency"]["available"],
+                                  "status":system["gpu"]["status"]},
+                                 {"current":system["emc"]["frequency"]["current"],
+                                  "available":system["emc"]["frequency"]["available"],
+                                  "status":system["emc"]["status"]},
+                                 dict(system["power"]))
+        except (KeyError, TypeError) as e:
+            errors.append("system {0} is missing {1}".format(name, e))
+    return systems
+
+def get_remote(cfg, errors):
+    """This function is used to validate the remote training host of the
+    online mode
+    """
+    remote=(cfg.get("online") or {}).get("remote")
+    if remote is None:
+        errors.append("online mode has no remote")
+        return None
+    try:
+        return Remote(remote["host"], remote["user"], remote.get("pass"),
+                      remote.get("keyfile"), int(remote.get("port", 22)),
+                      remote.get("transport", "ssh"), remote.get("timeout"),
+                      bool(remote.get("compress", True)),
+                      int(remote.get("max_retries", 2)),
+                      remote["network"]["code_dir"], remote["network"]["model_dir"],
+                      remote["network"]["conf_dir"], remote)
+    except (KeyError, TypeError, ValueError) as e:
+        errors.append("remote is missing or has an invalid {0}".format(e))
+        return None
+
+def set_override(raw, override):
+    """This function is used to set a value of the config from a
+    section.key=value override; the value is parsed as yaml
+    """
+    if "=" not in override:
+        print ("[ERROR]: override {0} is not section.key=value".format(override))
+        return False
+    (path, value)=override.split("=", 1)
+    keys=path.strip().split(".")
+    cur=raw["config"]
+    for key in keys[:-1]:
+        if not isinstance(cur.get(key), dict):
+            cur[key]={}
+        cur=cur[key]
+    cur[keys[-1]]=yaml.load(value, Loader=LOADER)
+    return True
+
+def parse_config(raw, overrides=(),
+                 mode=None):
+    """This function is used to validate a parsed config into a Config. The
+    online section and remote host are only validated, and only set, for the
+    online mode; the offline section for every other mode
+    @returns:
+        Config or None if it is invalid
+    """
+    if not isinstance(raw, dict) or not isinstance(raw.get("config"), dict):
+        print ("[ERROR]: config has no config section")
+        return None
+    for override in overrides:
+        if not set_override(raw, override):
+            return None
+    cfg=raw["config"]
+    errors=["config is missing {0}".format(s) for s in SECTIONS if s not in cfg]
+    (objectives, costs)=get_objectives(cfg, errors)
+    design_space=get_design_space(cfg, errors)
+    systems=get_systems(cfg, errors)
+    loop=get_loop(cfg, errors)
+    telemetry=get_telemetry(cfg, errors)
+    features=get_features(cfg, errors)
+    fidelity=get_fidelity(cfg, objectives, errors)
+    constraints=get_constraints(cfg, objectives, mode, errors)
+    cost_model=get_cost_model(cfg, errors)
+    hypervolume=get_hypervolume(cfg, errors)
+    checkpoint=get_checkpoint(cfg, errors)
+    initial_design=get_initial_design(cfg, errors)
+    warm_start=get_warm_start(cfg, errors)
+    tuning=get_tuning(cfg, errors)
+    (offline, online, remote)=(None, None, None)
+    if mode!="online":
+        offline=get_offline(cfg, errors)
+    if mode=="online":
+        online=get_online(cfg, objectives, errors)
+        remote=get_remote(cfg, errors)
+        for objective, metric in sorted(objectives.items()):
+            if metric not in DEVICE_METRICS:
+                errors.append("objective {0} metric {1} cannot be measured on the device, "
+                              "only {2}".format(objective, metric, ", ".join(DEVICE_METRICS)))
+    network=(cfg.get("network") or {}).get("net")
+    if network not in design_space.layers:
+        errors.append("network {0} has no design space".format(network))
+    for error in errors:
+        print ("[ERROR]: {0}".format(error))
+    if errors:
+        return None
+    return Config(network, objectives, costs, design_space, systems, loop,
+                  telemetry, features, fidelity, constraints, cost_model,
+                  hypervolume, checkpoint, initial_design, warm_start, tuning,
+                  offline, online, remote, raw)
+
+def load_config(fname="config.yaml", overrides=(),
+                mode=None):
+    """This function is used to parse the config once. The classes that need
+    the config get it passed from the entry point; a class constructed on its
+    own loads it through here and shares the parsed config. mode is online
+    or offline; the online section and remote host are only validated for
+    the online mode
+    @returns:
+        Config or None if it is invalid
+    """
+    path=os.path.abspath(fname)
+    try:
+        mtime=os.path.getmtime(path)
+    except OSError:
+        print ("[ERROR]: config {0} not found".format(path))
+        return None
+    key=(path, tuple(overrides), mode)
+    if key in CACHE and CACHE[key][0]==mtime:
+        return CACHE[key][1]
+    with open(path, "r") as fp:
+        config=parse_config(yaml.load(fp, Loader=LOADER), overrides, mode)
+    if config is not None:
+        CACHE[key]=(mtime, config)
+    return config
+
+def get_config(config=None, mode=None):
+    """This function is used to get the config a class was given, or else
+    the shared config parsed from config.yaml
+    @returns:
+        Config; a missing or invalid config.yaml raises ValueError after its
+        errors are printed
+    """
+    if config is None:
+        config=load_config(mode=mode)
+        if config is None:
+            raise ValueError("config.yaml is missing or invalid, see the errors above")
+    return config
@@ -1,29 +1,28 @@
 import os 
 import sys
-import yaml
 import subprocess
+from src.config import get_config
 
 class ConfigHardware(object):
     """This class is used to create different configuration space for jetson  tx2
     """
     def __init__(self,
-                 config):
+                 config, cfg=None):
                
         print("[STATUS]: Initializing ConfigHardware Class")
         self.cur_config=self.process(config)
-        with open("config.yaml") as fp:
-            self.cfg=yaml.load(fp)
+        self.cfg=get_config(cfg)
         self.cur_sys="TX2"
         # define constant variables
         self.ENABLE="1"
         self.DISABLE="0"
         
         # set specific configuration    
-        self.set_big_core_status(self.cfg["config"]["systems"][self.cur_sys]["cpu"]["cores"]["core1"],self.cur_config[1])
-        self.set_big_core_status(self.cfg["config"]["systems"][self.cur_sys]["cpu"]["cores"]["core2"],self.cur_config[2])
-        self.set_big_core_status(self.cfg["config"]["systems"][self.cur_sys]["cpu"]["cores"]["core3"],self.cur_config[3])
+        self.set_big_core_status(self.cfg.systems[self.cur_sys].cores["core1"],self.cur_config[1])
+        self.set_big_core_status(self.cfg.systems[self.cur_sys].cores["core2"],self.cur_config[2])
+        self.set_big_core_status(self.cfg.systems[self.cur_sys].cores["core3"],self.cur_config[3])
         
-        self.set_big_core_freq(self.cfg["config"]["systems"][self.cur_sys]["cpu"]["cores"]["core0"],self.cur_config[4])  
+        self.set_big_core_freq(self.cfg.systems[self.cur_sys].cores["core0"],self.cur_config[4])  
         self.set_gpu_freq(self.cur_config[5])
         self.set_emc_freq(self.cur_config[6])
         
@@ -132,7 +131,7 @@ class ConfigHardware(object):
         """
         
         if frequency is not None:
-            filename=self.cfg["config"]["systems"][self.cur_sys]["gpu"]["frequency"]["current"]
+            filename=self.cfg.systems[self.cur_sys].gpu["current"]
             try:
                 if frequency is not None:
                     cur_freq=subprocess.getstatusoutput("cat {0}".format(filename))[1]
@@ -165,7 +164,7 @@ class ConfigHardware(object):
         """
         
         if frequency is not None:
-            filename=self.cfg["config"]["systems"][self.cur_sys]["emc"]["frequency"]["current"]
+            filename=self.cfg.systems[self.cur_sys].emc["current"]
             try:
                 if frequency is not None:
                     cur_freq=subprocess.getstatusoutput("cat {0}".format(filename))[1]
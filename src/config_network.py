@@ -1,70 +1,133 @@
 #!/usr/bin/python
 import os 
 import sys
-import paramiko
+import json
 import traceback 
 import yaml
+from src.config import get_config
+from src.remote_client import POOL
+from src.artifact_store import ModelStore
+
+# modules the trainers import, uploaded next to the trainer for every job
+NETWORK_DIR=os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "networks")
+TRAINER_MODULES=("dataset_cache.py", "trainer_config.py")
+# prefix of the line trainer_config.report_metrics prints the validation
+# metrics of the last epoch with
+METRICS_PREFIX="[METRICS]: "
 
 class ConfigNetwork(object):
     """This class is used to 
     """
-    def __init__(self, cur_net, cur_config):
+    def __init__(self, cur_net, cur_config,
+                 remote=None, job_id=None, fidelity=None,
+                 cfg=None):
                
         self.cur_config=cur_config[8:]
         self.network=cur_net
-        with open("config.yaml") as fp:
-            cfg=yaml.load(fp)
+        cfg=get_config(cfg, "online")
+        # remote connection entry shared with the connection pool; a worker
+        # of the training job queue overrides it with its own host
+        self.remote=dict(cfg.remote.entry, **(remote or {}))
+        # remote command timeout
+        self.timeout=self.remote.get("timeout")
         # host
-        self.host=cfg["config"]["online"]["remote"]["host"]
+        self.host=self.remote["host"]
         # username
-        self.user=cfg["config"]["online"]["remote"]["user"]
+        self.user=self.remote["user"]
         # password
-        self.passwd=cfg["config"]["online"]["remote"]["pass"]
+        self.passwd=self.remote["pass"]
         # keyfile
-        self.keyfile=cfg["config"]["online"]["remote"]["keyfile"]
+        self.keyfile=self.remote["keyfile"]
         # remote code directory
-        self.remote_code_dir=cfg["config"]["online"]["remote"]["network"]["code_dir"]
+        self.remote_code_dir=cfg.remote.code_dir
         self.remote_code_dir=self.remote_code_dir.replace("network",cur_net)
         # remote model directory
-        self.remote_model_dir=cfg["config"]["online"]["remote"]["network"]["model_dir"]
+        self.remote_model_dir=cfg.remote.model_dir
         self.remote_model_dir=self.remote_model_dir.replace("network",cur_net)
         # remote current configuration directory
-        self.remote_conf_dir=cfg["config"]["online"]["remote"]["network"]["conf_dir"]
+        self.remote_conf_dir=cfg.remote.conf_dir
         self.remote_conf_dir=self.remote_conf_dir.replace("network",cur_net)
         # local model directory
-        self.local_model_dir=cfg["config"]["online"]["local"]["model_dir"]
+        self.local_model_dir=cfg.online.model_dir
         # local model directory
-        self.local_conf_dir=cfg["config"]["online"]["local"]["conf_dir"]
+        self.local_conf_dir=cfg.online.conf_dir
+        # local content-addressed model store
+        self.store=None
+        if cfg.online.store_dir is not None:
+            self.store=ModelStore(cfg.online.store_dir,
+                                  self.remote.get("compress", True),
+                                  timeout=self.timeout)
+        # concurrent jobs must not overwrite each other's files
+        if job_id is not None:
+            (self.remote_model_dir, self.remote_conf_dir, self.local_model_dir,
+            self.local_conf_dir)=[self.get_job_path(i, job_id) for i in (
+                self.remote_model_dir, self.remote_conf_dir, self.local_model_dir,
+                self.local_conf_dir)]
         # current configuration
         self.cur_config=cur_config
+        # training budget of the requested fidelity
+        self.fidelity=fidelity
+        # validation metrics the trainer reported, e.g. val_loss
+        self.metrics={}
         self.store_conf()
-        self.get_model()
+        self.status=self.get_model()
+
+    def get_job_path(self, path, job_id):
+        """This function is used to make a file path unique to a training job
+        """
+        root, ext=os.path.splitext(path)
+        return "{0}_{1}{2}".format(root, job_id, ext)
 
     def get_model(self):
-        """This is a function for establishing remote connection
+        """This is a function for running remote training over a pooled
+        connection
         """
         try:
-            key=paramiko.RSAKey.from_private_key_file(self.keyfile)
-            ssh_client=paramiko.SSHClient()
-            ssh_client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-            ssh_client.connect(hostname=self.host, username=self.user, password=self.passwd, 
-                               pkey=key)
-            ftp_client=ssh_client.open_sftp()
-            ftp_client.put(self.local_conf_dir,self.remote_conf_dir)
-            command= "python "+str(self.remote_code_dir)
-            stdin, stdout, stderr=ssh_client.exec_command(command)
-            print (stdout.readlines())
-            ftp_client.get(self.remote_model_dir, self.local_model_dir)
-            ftp_client.close()
+            with POOL.session(self.remote) as client:
+                client.put(self.local_conf_dir,self.remote_conf_dir)
+                # the trainer at remote_code_dir is deployed on the host; the
+                # modules it imports are uploaded next to it
+                for module in TRAINER_MODULES:
+                    client.put(os.path.join(NETWORK_DIR, module),
+                               os.path.join(os.path.dirname(self.remote_code_dir), module))
+                command= "python {0} {1} {2}".format(self.remote_code_dir,
+                                                     self.remote_conf_dir,
+                                                     self.remote_model_dir)
+                status, lines=client.run(command, timeout=self.timeout, callback=print)
+                if status!=0:
+                    print ("[ERROR]: remote training failed with status {0}".format(status))
+                    return False
+                self.metrics=self.get_metrics(lines)
+                if self.store is not None:
+                    self.local_model_dir=self.store.fetch(client, self.remote_model_dir)
+                else:
+                    client.get(self.remote_model_dir, self.local_model_dir)
+            return True
         except:
             traceback.print_exc()
             print ("[ERROR]: could not ssh")
+            return False
+
+    def get_metrics(self, lines):
+        """This function is used to get the validation metrics the trainer
+        printed; the last report wins
+        """
+        metrics={}
+        for line in lines:
+            if line.startswith(METRICS_PREFIX):
+                try:
+                    metrics=json.loads(line[len(METRICS_PREFIX):])
+                except ValueError:
+                    print ("[ERROR]: could not parse trainer metrics {0}".format(line))
+        return metrics
 
     def store_conf(self):
         """This function is used to store current configuration to yaml
         """
         conf=dict(cur_conf=self.cur_config)
-        with open ("cur_config.yaml","w", ) as curfp:
+        if self.fidelity is not None:
+            conf["fidelity"]=self.fidelity
+        with open (self.local_conf_dir,"w", ) as curfp:
             yaml.dump(conf, curfp, default_flow_style=False)
 
 
@@ -1,61 +1,89 @@
-import itertools
-import pandas as pd
 import numpy as np
+from src.config import get_config
+
+# the bo loop keeps every config of the design space with its measured flags
+# and predicts all of them every iteration, so larger grids do not fit
+MAX_CONFIGS=1000000
 
 class ConfigSpaceReal:
     """This class is used to create configuration space for real cases for DNN systems
     """
     def __init__(self, layer1, layer2, 
-                layer3):
+                layer3, config=None):
         print ("[STATUS]: initializing configreal class")
         self.LAYER1=layer1 
         self.LAYER2=layer2 
         self.LAYER3=layer3
-        self.set_design_space()
+        self.config=get_config(config)
+
+    def get_levels(self):
+        """This function is used to get the values of each option of the
+        design space; configs are indexed by these levels in mixed radix"""
+
+        return self.config.design_space.get_levels((self.LAYER1, self.LAYER2,
+                                                    self.LAYER3))
+
+    def get_initial_design(self, design):
+        """This function is used to select initial configs of the design space
+        without building it"""
+        from src.initial_design import decode
+        # levels and radix table are cached on the parsed config
+        (levels, table)=self.config.design_space.get_table((self.LAYER1, self.LAYER2,
+                                                            self.LAYER3))
+        return decode(levels, design.select_grid(levels, table), table).tolist()
 
-    def set_design_space(self):
-        """This function is used to set design space for real cases"""
-      
-        import yaml
-        with open("config.yaml","r") as fp:
-            config=yaml.load(fp)
-        config=config["config"]["design_space"]
-        # build design space
-        bounds=list()
-        for key, _ in config.items():
-            if (key==self.LAYER1 or key==self.LAYER2 or key==self.LAYER3):
-                cur=config[key]
-                for _, val in cur.items():
-                    bounds.append(val)
+    def set_design_space(self, objectives=None):
+        """This function is used to set design space for real cases. Every
+        grid index is decoded with the cached radix table, in the order of
+        itertools.product. Measured flags are kept for the objectives, by
+        default the configured objectives o1..ok. Grids of more than
+        MAX_CONFIGS configs are rejected"""
 
-        permutation = list(itertools.product(*bounds))
+        (levels, (radix, strides))=self.config.design_space.get_table((self.LAYER1, self.LAYER2,
+                                                                       self.LAYER3))
+        num_configs=int(np.prod(radix))
+        if num_configs>MAX_CONFIGS:
+            raise ValueError("design space of {0} has {1} configs, more than the {2} the bo "
+                             "loop can hold; remove levels from design_space".format(
+                             self.LAYER3, num_configs, MAX_CONFIGS))
+        from src.initial_design import decode
+        permutation=decode(levels, np.arange(num_configs), (radix, strides)).tolist()
+        if objectives is None:
+            objectives=sorted(self.config.objectives, key=lambda o: int(o[1:]))
         return (
-                [list(x) for x in permutation],
-                [{"o1":False, "o2":False} for _ in permutation],
-                [{"o1":False, "o2":False} for _ in permutation])
+                permutation,
+                [dict.fromkeys(objectives, False) for _ in permutation],
+                [dict.fromkeys(objectives, False) for _ in permutation])
 
 class ConfigSpaceSynthetic:
     """This class is used to create configuration space for synthetic cases
     """
-    def __init__(self):
+    def __init__(self, n_var=3, size=100,
+                 low=0.0, high=1.0, seed=None):
         print ("[STATUS]: initializing configsynthetic class")
-        self.n_var = 3
+        self.n_var = n_var
+        self.size = size
+        self.low = low
+        self.high = high
+        self.seed = seed
 
-    def set_design_space(self):
-        """This function is used to set design space for synthetic functions"""
+    def set_design_space(self, objectives=("o1", "o2")):
+        """This function is used to set design space for synthetic functions;
+        the synthetic problems have two objectives"""
 
-        self.X = np.random.random((100,self.n_var))
+        rng = np.random.RandomState(self.seed)
+        self.X = rng.uniform(self.low, self.high, (self.size, self.n_var))
         return (
                 [list(i) for i in self.X],
-                [{"o1":False, "o2":False} for _ in self.X],
-                [{"o1":False, "o2":False} for _ in self.X])
+                [dict.fromkeys(objectives, False) for _ in self.X],
+                [dict.fromkeys(objectives, False) for _ in self.X])
 
-    def set_evaluation(self):
+    def set_evaluation(self, problem="Kursawe"):
         """This function is used to evaluate synthetic objective functions"""
-        from objective_synthetic import ObjectiveSynthetic
+        from src.objective_synthetic import ObjectiveSynthetic
         OS=ObjectiveSynthetic()
         (Y1,
-        Y2) = OS.Kursawe(self.X, self.n_var)
+        Y2) = getattr(OS, problem)(self.X, self.n_var)
         Y1=[[i] for i in Y1]
         Y2=[[i] for i in Y2]
 
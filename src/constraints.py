@@ -0,0 +1,63 @@
+"""-----------------------------------------------------------------------------
+@Name: Flexible Bayesian Optimization (FlexiBO): An active learning for optimiz-
+ing  multiple objectives of different cost
+@Version: 0.1
+@Author: Shahriar Iqbal
+--------------------------------------------------------------------------------
+"""
+import numpy as np
+
+OPERATORS=("<=", ">=")
+
+class Constraints(object):
+    """This class is used to estimate the probability that a config satisfies
+    budgets on objectives such as inference_time <= X. The surrogate of the
+    objective gives a normal belief of its value, so the probability of a
+    budget is the normal cdf at the bound; budgets are independent
+    """
+    def __init__(self, bounds, metrics,
+                 objectives, min_probability):
+        print ("[STATUS]: Initializing Constraints Class")
+        self.min_probability=min_probability
+        self.bounds=[]
+        for bound in bounds:
+            # bounds are validated with the config; objectives given on the
+            # command line may still leave one without its metric
+            objective=[o for o in objectives if metrics[o]==bound["metric"]]
+            if not objective:
+                raise ValueError("constraint on {0} which is not an objective".format(bound["metric"]))
+            if bound["op"] not in OPERATORS:
+                raise ValueError("constraint operator {0} not supported".format(bound["op"]))
+            self.bounds.append((objectives.index(objective[0]), bound["op"],
+                                float(bound["value"])))
+
+    def get_probability(self, mu, sigma):
+        """This function is used to compute the probability that each config
+        satisfies every budget
+        ------------------------------------------------------------------------
+        @args:
+            mu: mean of each config and objective
+            sigma: standard deviation of each config and objective, 0 for
+                   measured objectives
+        ------------------------------------------------------------------------
+        """
+        from scipy.stats import norm
+        probability=np.ones(len(mu))
+        for (j, op, value) in self.bounds:
+            slack=value-mu[:, j] if op=="<=" else mu[:, j]-value
+            measured=sigma[:, j]==0
+            # measured objectives are feasible or not
+            probability*=np.where(measured, slack>=0,
+                                  norm.cdf(slack/np.where(measured, 1.0, sigma[:, j])))
+        return probability
+
+    def get_feasible(self, probability):
+        """This function is used to get the configs that are likely feasible.
+        If no config is, the most likely ones are kept so that the loop can go
+        on learning the constraints
+        """
+        feasible=np.flatnonzero(probability>=self.min_probability)
+        if len(feasible)==0:
+            print ("[ERROR]: no config is likely to satisfy the constraints")
+            feasible=np.flatnonzero(probability==probability.max())
+        return feasible.tolist()
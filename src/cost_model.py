@@ -0,0 +1,70 @@
+"""-----------------------------------------------------------------------------
+@Name: Flexible Bayesian Optimization (FlexiBO): An active learning for optimiz-
+ing  multiple objectives of different cost
+@Version: 0.1
+@Author: Shahriar Iqbal
+--------------------------------------------------------------------------------
+"""
+import numpy as np
+
+class CostModel(object):
+    """This class is used to learn the evaluation cost of each objective from
+    the measured wall-clock of its evaluations. Cost depends on the config
+    (bigger filters train slower), so once an objective has min_samples
+    measurements a random forest on log seconds predicts the cost of every
+    config; before that the configured evaluation_cost is used. The budget
+    is charged the seconds actually spent, while the model learns the
+    full-fidelity cost of an evaluation
+    """
+    def __init__(self, objectives, prior_costs,
+                 min_samples=5):
+        print ("[STATUS]: Initializing CostModel Class")
+        self.objectives=objectives
+        self.prior_costs=prior_costs
+        self.min_samples=min_samples
+        self.X={o: [] for o in objectives}
+        self.seconds={o: [] for o in objectives}
+        self.targets={o: [] for o in objectives}
+
+    def add_cost(self, config, objective,
+                 seconds, target=None):
+        """This function is used to record the cost of an evaluation
+        ------------------------------------------------------------------------
+        @args:
+            config: evaluated config
+            objective: evaluated objective
+            seconds: wall-clock of the evaluation
+            target: full-fidelity wall-clock the model learns when the
+                    evaluation ran at a lower fidelity
+        ------------------------------------------------------------------------
+        """
+        self.X[objective].append(list(config))
+        self.seconds[objective].append(max(float(seconds), 1e-6))
+        self.targets[objective].append(max(float(seconds if target is None else target), 1e-6))
+
+    def get_spent(self):
+        """This function is used to get the wall-clock spent on evaluations
+        """
+        return float(sum(sum(self.seconds[o]) for o in self.objectives))
+
+    def predict(self, U):
+        """This function is used to predict the cost of evaluating each
+        objective of every config
+        @returns:
+            dict from objective to the cost of every config
+        """
+        from sklearn.ensemble import RandomForestRegressor
+        costs={}
+        for objective in self.objectives:
+            seconds=self.targets[objective]
+            if len(seconds)<self.min_samples:
+                costs[objective]=np.full(len(U), float(self.prior_costs[objective]))
+                continue
+            if min(seconds)==max(seconds):
+                costs[objective]=np.full(len(U), seconds[0])
+                continue
+            model=RandomForestRegressor(n_estimators=32, min_samples_leaf=2)
+            model.fit(np.array(self.X[objective], dtype=float),
+                      np.log(seconds))
+            costs[objective]=np.exp(model.predict(U))
+        return costs
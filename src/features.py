@@ -0,0 +1,104 @@
+"""-----------------------------------------------------------------------------
+@Name: Flexible Bayesian Optimization (FlexiBO): An active learning for optimiz-
+ing  multiple objectives of different cost
+@Version: 0.1
+@Author: Shahriar Iqbal
+--------------------------------------------------------------------------------
+"""
+import re
+import numpy as np
+
+# columns of measurement tables that flag an active core
+CORE_STATUS=re.compile(r"^core[0-9]+_status$")
+
+class FeatureTransform(object):
+    """This class is used to map configs to the features the surrogates are
+    fitted on. Frequencies are taken in log, the number of active cores is
+    expanded into one flag per core as ConfigHardware.process sets them,
+    products of related options are added and every feature is scaled to
+    [0,1]. It is fitted once on the design space and shared by the surrogates
+    of every objective
+    """
+    def __init__(self, columns, log_columns=(),
+                 cores_column="num_cores", interactions=()):
+        print ("[STATUS]: Initializing FeatureTransform Class")
+        self.columns=list(columns)
+        self.log_columns=set(log_columns)
+        self.cores_column=cores_column if cores_column in self.columns else None
+        self.status_columns=[j for j, c in enumerate(self.columns) if CORE_STATUS.match(c)]
+        self.interactions=[list(pair) for pair in interactions]
+        self.max_cores=0
+        self.low=None
+        self.high=None
+        self.keep=None
+        self.names=None
+
+    def get_base_features(self, X):
+        """This function is used to get the features before the interactions:
+        every option, frequencies in log and the number of active cores as
+        per-core flags
+        @returns:
+            (names, features as a 2-d array, number of active cores)
+        """
+        (names, features)=([], [])
+        cores=None
+        for j, column in enumerate(self.columns):
+            cur=X[:, j]
+            if column==self.cores_column:
+                cores=cur
+                # core k is enabled when more than k cores are active
+                for k in range(0, self.max_cores):
+                    names.append("core{0}_status".format(k))
+                    features.append((cur>k).astype(float))
+                continue
+            if column in self.log_columns:
+                cur=np.log(np.maximum(cur, 1e-12))
+            names.append(column)
+            features.append(cur)
+        if cores is None and self.status_columns:
+            cores=X[:, self.status_columns].sum(axis=1)
+        return (names, np.column_stack(features) if features else np.zeros((len(X), 0)),
+                cores)
+
+    def get_features(self, X):
+        """This function is used to get every feature of the configs, scaled
+        by the design space but before constant features are dropped
+        """
+        (names, F, cores)=self.get_base_features(X)
+        F=(F-self.low)/self.high
+        scaled=dict(zip(names, F.T))
+        if cores is not None:
+            scaled["cores"]=cores/max(self.max_cores, 1)
+        products=[scaled[a]*scaled[b] for (a, b) in self.interactions
+                  if a in scaled and b in scaled]
+        return (names+["{0}*{1}".format(a, b) for (a, b) in self.interactions
+                       if a in scaled and b in scaled],
+                np.column_stack([F]+products))
+
+    def fit(self, X):
+        """This function is used to fit the scaling of every feature on the
+        design space
+        """
+        X=np.asarray(X, dtype=float)
+        if self.cores_column is not None:
+            self.max_cores=int(X[:, self.columns.index(self.cores_column)].max())
+        elif self.status_columns:
+            self.max_cores=len(self.status_columns)
+        (_, F, _)=self.get_base_features(X)
+        self.low=F.min(axis=0)
+        # constant features are scaled by one and dropped below
+        self.high=np.where(F.max(axis=0)>self.low, F.max(axis=0)-self.low, 1.0)
+        (names, F)=self.get_features(X)
+        self.keep=F.max(axis=0)>F.min(axis=0)
+        self.names=[name for name, keep in zip(names, self.keep) if keep]
+        print ("[STATUS]: {0} features of {1} config columns".format(len(self.names),
+                                                                      len(self.columns)))
+        return self
+
+    def transform(self, X):
+        """This function is used to get the features of configs
+        @returns:
+            features as a 2-d array
+        """
+        X=np.asarray(X, dtype=float).reshape(-1, len(self.columns))
+        return self.get_features(X)[1][:, self.keep]
@@ -0,0 +1,125 @@
+"""-----------------------------------------------------------------------------
+@Name: Flexible Bayesian Optimization (FlexiBO): An active learning for optimiz-
+ing  multiple objectives of different cost
+@Version: 0.1
+@Author: Shahriar Iqbal
+--------------------------------------------------------------------------------
+"""
+import math
+
+class FidelitySchedule(object):
+    """This class is used to evaluate the network objective at increasing
+    fidelity (training epochs and fraction of the training data). Every
+    config starts at the lowest fidelity and is only promoted to the next one
+    if it ranks among the best configs evaluated at its current fidelity, so
+    unpromising architectures are discarded at a fraction of the training cost.
+    Configs are ranked by the validation metric their trainer reports, e.g.
+    val_loss, since the on-device measurement of a partly trained network
+    hardly depends on the fidelity. A fidelity ranks its configs once it has
+    at least 1/promote_fraction results
+    """
+    def __init__(self, levels, objective,
+                 promote_fraction=0.5, metric="val_loss"):
+        print ("[STATUS]: Initializing FidelitySchedule Class")
+        self.levels=levels
+        self.objective=objective
+        self.promote_fraction=promote_fraction
+        self.metric=metric
+        # losses are minimized, accuracies maximized
+        self.maximize="loss" not in metric
+        self.min_results=int(math.ceil(1.0/promote_fraction))
+        # index -> highest fidelity evaluated so far
+        self.evaluated={}
+        # fidelity -> {index: objective value}
+        self.results=[{} for _ in self.levels]
+        # fidelity -> {index: score of the validation metric, higher is better}
+        self.scores=[{} for _ in self.levels]
+
+    def is_final(self, level):
+        """This function is used to check whether a fidelity is the full budget
+        """
+        return level==len(self.levels)-1
+
+    def get_score(self, metrics):
+        """This function is used to get the score configs are ranked by from
+        the metrics a trainer reported
+        @returns:
+            score, higher is better, or None if the metric was not reported
+        """
+        if self.metric not in (metrics or {}):
+            return None
+        value=float(metrics[self.metric])
+        return value if self.maximize else -value
+
+    def is_promoted(self, index):
+        """This function is used to check whether a config ranks among the top
+        promote_fraction of the configs evaluated at its current fidelity.
+        Nothing is promoted before the fidelity has min_results scores
+        """
+        level=self.evaluated[index]
+        scores=self.scores[level]
+        if index not in scores or len(scores)<self.min_results:
+            return False
+        values=sorted(scores.values(), reverse=True)
+        num_promoted=max(1, int(len(values)*self.promote_fraction))
+        return scores[index]>=values[num_promoted-1]
+
+    def get_promoted(self, level):
+        """This function is used to get the configs evaluated at a fidelity
+        that are promoted to the next one
+        """
+        if self.is_final(level):
+            return []
+        return [index for index in self.scores[level]
+                if self.evaluated[index]==level and self.is_promoted(index)]
+
+    def get_next_level(self, index):
+        """This function is used to get the fidelity at which a config should
+        be evaluated next
+        @returns:
+            next fidelity or None if the config was discarded or is complete
+        """
+        if index not in self.evaluated:
+            return 0
+        level=self.evaluated[index]
+        if self.is_final(level) or not self.is_promoted(index):
+            return None
+        return level+1
+
+    def get_cost(self, index, base_cost):
+        """This function is used to scale the evaluation cost of the network
+        objective by the relative cost of the fidelity a config would get next
+        """
+        level=self.get_next_level(index)
+        if level is None:
+            return base_cost
+        return base_cost*self.levels[level]["cost"]
+
+    def get_budget(self, level):
+        """This function is used to get the training budget of a fidelity
+        """
+        return {"epochs":self.levels[level]["epochs"],
+                "data_fraction":self.levels[level]["data_fraction"]}
+
+    def get_value(self, index):
+        """This function is used to get the value of a config at the highest
+        fidelity it was evaluated at
+        """
+        return self.results[self.evaluated[index]][index]
+
+    def record(self, index, level,
+               value, metrics=None):
+        """This function is used to record the objective value of a config at
+        a fidelity and the validation metrics its trainer reported
+        @returns:
+            True if the value is final, i.e. the config reached the full budget
+        """
+        self.evaluated[index]=level
+        self.results[level][index]=value
+        score=self.get_score(metrics)
+        if score is None:
+            print ("[ERROR]: trainer reported no {0}, config {1} is not promoted".format(
+                   self.metric, index))
+        else:
+            self.scores[level][index]=score
+        return self.is_final(level)
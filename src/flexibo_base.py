@@ -0,0 +1,438 @@
+"""-----------------------------------------------------------------------------
+@Name: Flexible Bayesian Optimization (FlexiBO): An active learning for optimiz-
+ing  multiple objectives of different cost
+@Version: 0.1
+@Author: Shahriar Iqbal
+--------------------------------------------------------------------------------
+"""
+import math
+import random
+from abc import ABC, abstractmethod
+import numpy as np
+from src.config import get_config
+from src.pareto import Pareto
+from src.sampling import Sampling
+from src.checkpoint import Checkpoint
+from src.warm_start import WarmStartPrior
+from src.initial_design import InitialDesign
+from src.constraints import Constraints
+from src.stopping import BetaSchedule, StoppingRules
+from src.cost_model import CostModel
+from src.telemetry import Telemetry
+
+class FlexiBOBase(ABC):
+    """This class is used to implement the bo loop shared by the online and
+    offline modes. A mode defines the design space, its config columns and
+    how an objective of a config is measured; a mode missing one of them
+    cannot be constructed
+    E: design space
+    O: evaluated objectives
+    n: number of objectives
+    metrics: metric of each objective o1..ok
+    """
+    def __init__(self, data, surrogate,
+                 resume=False, objectives=None,
+                 budget=None, config=None):
+        print ("Initializing FlexiBO class")
+
+        self.df= data
+        # parsed once by the entry point and passed through
+        config=get_config(config)
+        self.config=config
+        # metrics given on the command line replace the configured objectives
+        self.objective_metrics=objectives
+        self.metrics=self.get_objectives()
+        self.objectives=sorted(self.metrics, key=lambda o: int(o[1:]))
+        self.NUM_OBJ=len(self.objectives)
+        (self.E, _, _)=self.set_design_space()
+        self.O=[dict.fromkeys(self.objectives, False) for _ in self.E]
+        self.measurement=[dict.fromkeys(self.objectives, False) for _ in self.E]
+        # hash from config tuple to its index in the design space
+        self.index={tuple(x): i for i, x in enumerate(self.E)}
+        self.network=config.network
+        loop=config.loop
+        self.NUM_ITER=loop.num_iter
+        self.beta=BetaSchedule(loop.beta.schedule, len(self.E),
+                               loop.beta.value, loop.beta.delta,
+                               loop.beta.scale)
+        # a budget in seconds given on the command line replaces cost_budget
+        self.stopping=StoppingRules(loop.stopping.min_iter,
+                                    loop.stopping.volume_gap,
+                                    loop.stopping.patience,
+                                    budget if budget is not None else loop.stopping.cost_budget)
+        self.costs={o: config.costs.get(o, 1.0) for o in self.objectives}
+        # measured evaluation costs, predicted for every config
+        self.cost_model=CostModel(self.objectives, self.costs,
+                                  config.cost_model.min_samples)
+        self.pareto= Pareto(self.NUM_OBJ, config.hypervolume.exact_max_objectives,
+                          config.hypervolume.mc_samples)
+        self.sampling= Sampling(self.objectives, self.costs, self.pareto)
+        self.fidelity=None
+        # one surrogate for all objectives or one per objective
+        self.surrogate=surrogate
+        names=surrogate.split(",")
+        if len(names)!=1 and len(names)!=self.NUM_OBJ:
+            print ("[ERROR]: expected 1 or {0} surrogates, using {1}".format(self.NUM_OBJ, names[0]))
+            names=names[:1]
+        self.surrogates={o: names[i if len(names)>1 else 0] for i, o in enumerate(self.objectives)}
+        self.SM={}
+        for name in set(self.surrogates.values()):
+            if name=="GP":
+                from src.surrogate_model import GPSurrogateModel
+                self.SM[name]=GPSurrogateModel()
+            elif name=="RF":
+                from src.surrogate_model import RFSurrogateModel
+                self.SM[name]=RFSurrogateModel()
+            else:
+                print ("[ERROR]: Surrogate model not supported")
+        # hyperparameters of the surrogates tuned by cross validation as
+        # measurements arrive
+        self.tuner=None
+        tuning=config.tuning
+        if tuning.enabled:
+            from src.surrogate_model import TuneSurrogateHyperparams
+            self.tuner=TuneSurrogateHyperparams(tuning.n_calls, tuning.folds,
+                                                tuning.n_jobs, tuning.retune_fraction,
+                                                tuning.min_samples)
+        # features the surrogates of every objective are fitted on, fitted
+        # once on the design space
+        self.features=None
+        features=config.features
+        if features.enabled:
+            from src.features import FeatureTransform
+            self.features=FeatureTransform(self.get_config_columns(), features.log_columns,
+                                           features.cores_column, features.interactions)
+        (self.X, self.Y)=self.prepare_training_data()
+        # measured configs and values of each objective the surrogates are
+        # fitted on
+        self.train_X={o: [] for o in self.objectives}
+        self.train_Y={o: [] for o in self.objectives}
+        # optimizer state is checkpointed so that a crashed run can resume
+        self.checkpoint=Checkpoint(config.checkpoint.fname,
+                                   config.checkpoint.interval)
+        self.resume=resume
+        self.start_iteration=0
+        self.fronts=None
+        # measurements of related models and resolutions used as prior so
+        # that fewer configs have to be measured to start from
+        self.init_size=config.initial_design.size
+        self.prior=None
+        warm_start=config.warm_start
+        if warm_start.enabled:
+            self.prior=WarmStartPrior(warm_start.sources, self.get_config_columns(),
+                                      self.metrics)
+            self.init_size=warm_start.init_size
+        # per iteration records and optional profiles of the loop phases
+        telemetry=config.telemetry
+        self.telemetry=Telemetry(telemetry.fname, telemetry.profile,
+                                 telemetry.profile_dir)
+        # configs unlikely to meet the budgets are pruned before the pareto
+        # fronts are computed
+        self.constraints=None
+        constraints=config.constraints
+        if constraints.bounds:
+            self.constraints=Constraints(constraints.bounds, self.metrics,
+                                         self.objectives, constraints.min_probability)
+
+    @abstractmethod
+    def set_design_space(self):
+        """This function is used to set the design space of the mode
+        @returns:
+            (E, O, measurement)
+        """
+
+    def get_objectives(self):
+        """This function is used to get the metric of each objective
+        @returns:
+            dict from objective o1..ok to its metric
+        """
+        if self.objective_metrics:
+            return {"o{0}".format(i+1): metric for i, metric in enumerate(self.objective_metrics)}
+        return dict(self.config.objectives)
+
+    @abstractmethod
+    def get_config_columns(self):
+        """This function is used to get the config columns of the data
+        """
+
+    @abstractmethod
+    def evaluate(self, index, config,
+                 objective):
+        """This function is used to measure an objective of a config. A mode
+        either records the value with add_measurement or defers it to
+        collect_measurements
+        """
+
+    def collect_measurements(self):
+        """This function is used to record measurements that finished in the
+        background; modes measuring synchronously have none
+        """
+
+    def finish(self):
+        """This function is used to release resources once the loop is done
+        """
+
+    def get_state(self, iteration):
+        """This function is used to get the optimizer state after an iteration
+        """
+        return {"iteration":iteration+1,
+                "num_configs":len(self.E),
+                "O":self.O,
+                "measurement":self.measurement,
+                "train_X":self.train_X,
+                "train_Y":self.train_Y,
+                "fidelity":self.fidelity,
+                "stopping":self.stopping.get_state(),
+                "cost_model":self.cost_model,
+                "tuned":None if self.tuner is None else self.tuner.tuned,
+                "random":random.getstate(),
+                "np_random":np.random.get_state()}
+
+    def set_state(self, state):
+        """This function is used to restore the optimizer state
+        """
+        if state["num_configs"]!=len(self.E):
+            print ("[ERROR]: checkpoint does not match the design space")
+            return False
+        self.start_iteration=state["iteration"]
+        self.O=state["O"]
+        self.measurement=state["measurement"]
+        self.train_X=state["train_X"]
+        self.train_Y=state["train_Y"]
+        self.fidelity=state["fidelity"]
+        # the limits come from the config and command line of this run
+        self.stopping.set_state(state["stopping"])
+        self.cost_model=state["cost_model"]
+        if self.tuner is not None and state.get("tuned"):
+            self.tuner.tuned=state["tuned"]
+        random.setstate(state["random"])
+        np.random.set_state(state["np_random"])
+        return True
+
+    def prepare_training_data(self):
+        """This function is used to prepare training data
+        """
+        if self.df is None:
+            return (None, None)
+        X=self.df[self.get_config_columns()].values
+        Y={o: self.df[metric].values for o, metric in self.metrics.items()}
+
+        return (X, Y)
+
+    def initialize(self):
+        """This function is used to initialize data
+        """
+        initial_design=self.config.initial_design
+        design=InitialDesign(initial_design.method, self.init_size,
+                             initial_design.seed)
+        index=design.select(self.X)
+        X=[self.X[i] for i in index]
+        Y={o: [self.Y[o][i] for i in index] for o in self.objectives}
+        return (X, Y,
+                index)
+
+    def add_measurement(self, index, objective,
+                        value, config=None):
+        """This function is used to record a measured objective of a config
+        and add it to the training data of the surrogate of the objective
+        """
+        if config is None:
+            config=self.E[index]
+        if index is not None:
+            self.O[index][objective]=True
+            self.measurement[index][objective]=value
+        self.train_X[objective].append(list(config))
+        self.train_Y[objective].append(value)
+
+    def remove_measurement(self, index, objective):
+        """This function is used to drop a measured objective of a config from
+        the training data of the surrogate of the objective
+        """
+        config=list(self.E[index])
+        X=self.train_X[objective]
+        for i in range(len(X)-1, -1, -1):
+            if list(X[i])==config:
+                del X[i]
+                del self.train_Y[objective][i]
+                break
+        self.O[index][objective]=False
+        self.measurement[index][objective]=False
+
+    def add_cost(self, index, objective,
+                 seconds, target=None):
+        """This function is used to record the measured cost of evaluating an
+        objective of a config; target is the full-fidelity cost the cost
+        model learns when the evaluation ran at a lower fidelity
+        """
+        self.cost_model.add_cost(self.E[index], objective, seconds, target)
+
+    def fit_surrogate(self, objective):
+        """This function is used to fit the surrogate of an objective
+        """
+        name=self.surrogates[objective]
+        if name=="GP":
+            (model, _)=self.SM[name].fit_gp()
+        else:
+            (model, _)=self.SM[name].fit_rf()
+        X=np.array(self.train_X[objective], dtype=float)
+        Y=np.array(self.train_Y[objective], dtype=float)
+        if self.prior is not None:
+            # stacked surrogate: fit the residual of the calibrated prior
+            prior=self.prior.get_raw_prediction(objective, X)
+            self.prior.calibrate(objective, prior, Y)
+            Y=Y-self.prior.get_prediction(objective, prior)
+        if self.features is not None:
+            X=self.features.transform(X)
+        if self.tuner is not None:
+            model.set_params(**self.tuner.get_params(objective, name, model, X, Y))
+        return model.fit(X, Y)
+
+    def predict(self, model, U,
+                objective):
+        """This function is used to predict mean and standard deviation of
+        every config of the design space at once
+        """
+        if self.surrogates[objective]=="GP":
+            (mu, sigma)=model.predict(U, return_std=True)
+        else:
+            tree_pred=np.array([tree.predict(U) for tree in model.estimators_])
+            (mu, sigma)=(tree_pred.mean(axis=0), tree_pred.std(axis=0))
+        mu=np.ravel(mu).astype(float)
+        if self.prior is not None:
+            mu=mu+self.prior.get_prediction(objective, self.prior_U[objective])
+        return (mu, np.ravel(sigma).astype(float))
+
+    def compute_uncertainty_region(self, U, BETA):
+        """This function is used to compute the uncertainty region of every
+        config using mu and sigma of each objective. Measured objectives have
+        no uncertainty. With constraints only the configs likely to be feasible
+        get a region, with their probability of being feasible
+        @returns:
+            dict from config index to its region
+        """
+        mu=np.zeros((len(U), self.NUM_OBJ))
+        sigma=np.zeros((len(U), self.NUM_OBJ))
+        for j, objective in enumerate(self.objectives):
+            with self.telemetry.phase("fit"):
+                model=self.fit_surrogate(objective)
+            with self.telemetry.phase("predict"):
+                (mu[:, j], sigma[:, j])=self.predict(model, U, objective)
+            measured=[i for i, cur_eval in enumerate(self.O) if cur_eval[objective] is True]
+            mu[measured, j]=[self.measurement[i][objective] for i in measured]
+            sigma[measured, j]=0
+        probability=np.ones(len(U))
+        candidates=range(0, len(U))
+        if self.constraints is not None:
+            probability=self.constraints.get_probability(mu, sigma)
+            candidates=self.constraints.get_feasible(probability)
+            print ("[STATUS]: {0} of {1} configs likely feasible".format(len(candidates), len(U)))
+        ci=math.sqrt(BETA)*sigma[candidates]
+        pes=np.maximum(mu[candidates]-ci, 0).tolist()
+        opt=(mu[candidates]+ci).tolist()
+        avg=mu[candidates].tolist()
+        probability=probability[candidates].tolist()
+        return {index: {"pes":pes[i],
+                        "avg":avg[i],
+                        "opt":opt[i],
+                        "feasible":probability[i]} for i, index in enumerate(candidates)}
+
+    def perform_bo_loop(self):
+        """This function is used to perform bayesian optimization loop
+        U: Design Space
+        REGION: Uncertainty Region for each configuration in design space
+        """
+        # Initialization
+        if self.resume and self.checkpoint.exists():
+            print ("[STATUS]: resuming from {0}".format(self.checkpoint.fname))
+            self.resume=self.set_state(self.checkpoint.load())
+        if not self.resume:
+            (init_X, init_Y, init_measured_indices)=self.initialize()
+            for i in range(0,len(init_measured_indices)):
+                index=self.index.get(tuple(init_X[i]))
+                for objective in self.objectives:
+                    self.add_measurement(index, objective, init_Y[objective][i], init_X[i])
+
+        U=np.array(self.E[:], dtype=float)
+        # surrogates predict every config from its features
+        F=U
+        if self.features is not None:
+            F=self.features.fit(U).transform(U)
+        if self.prior is not None:
+            # the prior does not change during the run; predict it once
+            self.prior_U={objective: self.prior.get_raw_prediction(objective, U)
+                          for objective in self.objectives}
+
+        # bo loop
+        for iteration in range(self.start_iteration,self.NUM_ITER):
+            print ("---------------------------------------Iteration: ",iteration)
+            with self.telemetry.phase("measurement"):
+                self.collect_measurements()
+            BETA=self.beta.get_beta(iteration)
+            with self.telemetry.phase("cost"):
+                self.sampling.set_costs(self.cost_model.predict(U))
+            REGION=self.compute_uncertainty_region(F, BETA)
+
+            # Determine undominated points
+            with self.telemetry.phase("dominance"):
+                (undominated_points_ind,
+                undominated_points)=self.pareto.identify_undominated_points(list(REGION.values()),
+                                                                         list(REGION))
+            with self.telemetry.phase("front"):
+                # Determine pessimistic pareto front
+                (pess_pareto,
+                pess_indices_map)=self.pareto.construct_pessimistic_pareto_front(
+                                    undominated_points_ind, undominated_points, "CONSTRUCT")
+                # Determine optimistic pareto front
+                (opt_pareto,
+                opt_indices_map)=self.pareto.construct_optimistic_pareto_front(
+                                    undominated_points_ind, undominated_points, "CONSTRUCT")
+                # Determine pessimistic pareto volume
+                pess_pareto_volume=self.pareto.compute_pareto_volume(pess_pareto)
+                # Determine optimistic pareto volume
+                opt_pareto_volume=self.pareto.compute_pareto_volume(opt_pareto)
+            # fronts of the last iteration are the result of the run
+            self.fronts={"pes":(pess_pareto, pess_indices_map),
+                         "opt":(opt_pareto, opt_indices_map)}
+            # Determine volume of the pareto front
+            volume_of_pareto_front=opt_pareto_volume-pess_pareto_volume
+            print ("[STATUS]: beta: {0:.4g} volume of pareto front: {1:.4g} cost spent: {2:.4g}".format(
+                   BETA, volume_of_pareto_front, self.cost_model.get_spent()))
+            record={"beta":BETA,
+                    "num_candidates":len(REGION),
+                    "num_undominated":len(undominated_points_ind),
+                    "pess_front_size":len(pess_pareto),
+                    "opt_front_size":len(opt_pareto),
+                    "pess_volume":pess_pareto_volume,
+                    "opt_volume":opt_pareto_volume,
+                    "volume_gap":volume_of_pareto_front,
+                    "cost_spent":self.cost_model.get_spent()}
+            # Stop once further measurements stop paying off
+            reason=self.stopping.update(iteration, pess_indices_map.values(), pess_pareto_volume,
+                                        opt_pareto_volume, self.cost_model.get_spent())
+            if reason is not None:
+                print ("[STATUS]: stopping at iteration {0}: {1}".format(iteration, reason))
+                self.telemetry.emit(iteration, stopped=reason, **record)
+                break
+            # Determine next configuration and objective
+            with self.telemetry.phase("sampling"):
+                (next_sample_index,
+                next_sample,
+                objective)=self.sampling.determine_next_sample(pess_pareto, opt_pareto, pess_indices_map,
+                                                             opt_indices_map, pess_pareto_volume, opt_pareto_volume,
+                                                             REGION, self.E, self.fidelity)
+            if next_sample_index is None:
+                reason="every objective of the pareto front configs is measured"
+                print ("[STATUS]: stopping at iteration {0}: {1}".format(iteration, reason))
+                self.telemetry.emit(iteration, stopped=reason, **record)
+                break
+
+            # Perform measurement on next sample on the objective returned
+            with self.telemetry.phase("measurement"):
+                self.evaluate(next_sample_index, next_sample, objective)
+            if self.checkpoint.is_due(iteration):
+                with self.telemetry.phase("checkpoint"):
+                    self.checkpoint.save(self.get_state(iteration))
+            self.telemetry.emit(iteration, index=next_sample_index,
+                                objective=objective, **record)
+        self.telemetry.close()
+        self.finish()
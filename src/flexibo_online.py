@@ -5,188 +5,185 @@ ing  multiple objectives of different cost
 @Author: Shahriar Iqbal
 --------------------------------------------------------------------------------
 """
-import os 
-import math
-import yaml
-import numpy as np
-from src.utils import Utils
-from src.sampling import Sampling
+import time
+from concurrent.futures import wait
+from src.config import get_config, DEVICE_METRICS
+from src.flexibo_base import FlexiBOBase
 from src.config_space import ConfigSpaceReal
+from src.initial_design import InitialDesign
 from src.config_hardware import ConfigHardware
-from src.config_network import ConfigNetwork
-from src.compute_performance import ComputePerformance 
- 
-class FlexiBO(object):
+from src.job_queue import TrainingJobQueue
+from src.fidelity import FidelitySchedule
+from src.compute_performance import ComputePerformance
+
+class FlexiBO(FlexiBOBase):
     """This class is used to implement an active learning approach to optimize
-    multiple objectives of different cost
-    E: design space
-    O: evaluated objectives
-    n: number of objectives
-    m1: objective 1
-    m2: objective 2
+    multiple objectives of different cost on the device
     """
-    def __init__(self, data, surrogate):
-        print ("Initializing FlexiBO class")
-    
-        self.df= data
-        with open("config.yaml","r") as fp:
-            config= yaml.load(fp)
-        cfg=ConfigSpaceReal("hardware","os",config["config"]["network"]["net"])
-        (self.E, 
-        self.O, 
-        self.measurement)=cfg.set_design_space()
-        self.network=config["config"]["network"]["net"]
-        self.NUM_ITER=200
-        self.NUM_OBJ=2
-        self.O1_IND=config["config"]["index"]["O1"]
-        self.O2_IND=config["config"]["index"]["O2"]
-        self.m1= config["config"]["objective"]["O1"]
-        self.m2= config["config"]["objective"]["O2"]
-        self.O1_COST= config["config"]["evaluation_cost"]["O1"]
-        self.O2_COST= config["config"]["evaluation_cost"]["O2"]    
-        self.sampling= Sampling(self.O1_IND, self.O2_IND, self.O1_COST,
-                                self.O2_COST)
-        self.utils= Utils(self.O1_IND, self.O2_IND)
-        self.surrogate=surrogate
-        if self.surrogate=="GP":
-             from src.surrogate_model import GPSurrogateModel
-             self.SM=GPSurrogateModel()
-        else:
-            print ("[ERROR]: Surrogate model not supported")
-        (self.X, self.Y1, self.Y2)=self.prepare_training_data()
-        
+    def __init__(self, data, surrogate,
+                 resume=False, objectives=None,
+                 budget=None, config=None):
+        # the remote host is only validated for the online mode
+        config=get_config(config, "online")
+        # metrics given on the command line are checked like configured ones
+        unknown=[m for m in objectives or () if m not in DEVICE_METRICS]
+        if unknown:
+            raise ValueError("metrics {0} cannot be measured on the device, only {1}".format(
+                             ", ".join(unknown), ", ".join(DEVICE_METRICS)))
+        FlexiBOBase.__init__(self, data, surrogate, resume, objectives,
+                             budget, config)
+        config=self.config
+        # the objective measured on a trained network; the others are measured
+        # on the device with the deployed model
+        self.network_objective=config.online.network_objective
+        # networks are trained on the job queue so that the bo loop does not
+        # block on remote training
+        self.queue=TrainingJobQueue(config.online.workers,
+                                    config.remote.max_retries,
+                                    config=config)
+        self.pending={}
+        # network objective evaluated at increasing fidelity
+        if config.fidelity.enabled:
+            self.fidelity=FidelitySchedule(config.fidelity.levels,
+                                           config.fidelity.objective,
+                                           config.fidelity.promote_fraction,
+                                           config.fidelity.metric)
         self.perform_bo_loop()
-          
-    def prepare_training_data(self):
-        """This function is used to prepare training data
+
+    def set_design_space(self):
+        """This function is used to set the design space of hardware, os and
+        network options
         """
-    
-        X=self.df[["num_cores", "core_freq", "gpu_freq",
-                   "emc_freq", "cache_pressure", "swappiness",
-                   "dirty_bg","dirty_ratio","entry_num_filters",
-                   "entry_filter_size","middle_num_filters","middle_filter_size",
-                   "exit_filter_size"]].values
-        
-        Y1=self.df[self.m1].values
-        Y2=self.df[self.m2].values
-        Y1=[[i] for i in Y1]
-        Y2=[[i] for i in Y2]
-        
-        return (X, Y1, Y2)
-    
+        self.config_space=ConfigSpaceReal("hardware","os",self.config.network,
+                                          self.config)
+        return self.config_space.set_design_space(self.objectives)
+
     def initialize(self):
-        """This function is used to initialize data
+        """This function is used to choose the initial configs. Without
+        initial data they are selected on the design space grid without
+        building it and measured on the device
+        """
+        if self.df is not None:
+            return FlexiBOBase.initialize(self)
+        initial_design=self.config.initial_design
+        design=InitialDesign(initial_design.method, self.init_size,
+                             initial_design.seed)
+        for config in self.config_space.get_initial_design(design):
+            index=self.index[tuple(config)]
+            for objective in self.objectives:
+                self.evaluate(index, config, objective)
+        # measured as they finish, like the configs the loop samples
+        return ([], {o: [] for o in self.objectives}, [])
+
+    def get_config_columns(self):
+        """This function is used to get the config columns of the initial data
+        """
+        return ["num_cores", "core_freq", "gpu_freq",
+                "emc_freq", "cache_pressure", "swappiness",
+                "dirty_bg","dirty_ratio","entry_num_filters",
+                "entry_filter_size","middle_num_filters","middle_filter_size",
+                "exit_filter_size"]
+
+    def evaluate(self, index, config,
+                 objective):
+        """This function is used to measure an objective of a config on the
+        device. The network objective is trained on the job queue and recorded
+        once its job has finished
+        """
+        if objective!=self.network_objective:
+            # Evaluate a device objective
+            start=time.time()
+            ConfigHardware(config, self.config)
+            value=self.measure_model(self.config.online.model_dir,
+                                     self.metrics[objective])
+            self.add_measurement(index, objective, value)
+            self.add_cost(index, objective, time.time()-start)
+        else:
+            pending=[job.future for job, (i, _) in self.pending.items() if i==index]
+            if pending:
+                # The network of this sample is still training; wait for it
+                wait(pending)
+                return
+            # Train the network on the job queue and keep optimizing while it
+            # trains
+            (level, budget)=(None, None)
+            if self.fidelity is not None:
+                level=self.fidelity.get_next_level(index)
+                if level is None:
+                    # Outranked at its fidelity since it was evaluated; the
+                    # config is discarded with its low fidelity value
+                    self.add_measurement(index, objective, self.fidelity.get_value(index))
+                    return
+                budget=self.fidelity.get_budget(level)
+            job=self.queue.submit(self.network, config, budget)
+            self.pending[job]=(index, level)
+
+    def get_state(self, iteration):
+        """This function is used to get the optimizer state including the
+        networks that are still training
+        """
+        state=FlexiBOBase.get_state(self, iteration)
+        state["pending"]=list(self.pending.values())
+        return state
+
+    def set_state(self, state):
+        """This function is used to restore the optimizer state and retrain
+        the networks whose jobs were lost with the crash
+        """
+        if not FlexiBOBase.set_state(self, state):
+            return False
+        for (index, level) in state["pending"]:
+            budget=None if level is None else self.fidelity.get_budget(level)
+            job=self.queue.submit(self.network, self.E[index], budget)
+            self.pending[job]=(index, level)
+        return True
+
+    def collect_measurements(self):
+        """This function is used to record networks whose training has finished
+        """
+        for job in [j for j in self.pending if j.future.done()]:
+            (index, level)=self.pending.pop(job)
+            # the budget is charged the seconds spent; the cost model learns
+            # the full-fidelity cost, which the fidelity schedule scales down
+            # for lower levels
+            seconds=job.seconds
+            target=None
+            if level is not None:
+                target=seconds/self.fidelity.levels[level]["cost"]
+            self.add_cost(index, self.network_objective, seconds, target)
+            if job.future.exception() is not None:
+                print ("[ERROR]: could not train network for config {0}".format(index))
+                continue
+            result=job.future.result()
+            value=self.measure_model(result.model, self.metrics[self.network_objective])
+            # a low fidelity value is kept until the config is promoted
+            self.add_measurement(index, self.network_objective, value)
+            if level is not None and not self.fidelity.record(index, level, value,
+                                                              result.metrics):
+                self.reopen_promoted(level)
+
+    def reopen_promoted(self, level):
+        """This function is used to drop the low fidelity values of configs
+        promoted at a fidelity, so that they can be selected again at the next
+        fidelity
+        """
+        for index in self.fidelity.get_promoted(level):
+            if self.O[index][self.network_objective]:
+                self.remove_measurement(index, self.network_objective)
+
+    def finish(self):
+        """This function is used to stop the training workers. Networks whose
+        training has not started are no longer needed once the loop is done;
+        only the running jobs are waited for
         """
-        import random
-        index=random.sample(range(0,len(self.X)-1),20)
-        X=[self.X[i] for i in index]
-        Y1=[self.Y1[i] for i in index]
-        Y2=[self.Y2[i] for i in index]
-        return (X, Y1, Y2,
-                index)
-                           
-    def perform_bo_loop(self):
-        """This function is used to perform bayesian optimization loop
-        U: Design Space
-        REGION: Uncertainty Region for each configuration in design space
+        self.queue.shutdown(cancel_pending=True)
+
+    def measure_model(self, fname_model, metric):
+        """This function is used to measure a metric of a trained network on
+        the device
+        @returns:
+            value of the metric
         """
-        # Initialization
-        BETA=1.0
-        (init_X, init_Y1, init_Y2, init_measured_indices)=self.initialize()
-        
-        for i in range(0,len(init_measured_indices)):
-            self.O[i]["o1"]=True
-            self.measurement[init_measured_indices[i]]["o1"]=init_Y1[i][0]
-            self.O[i]["o2"]=True
-            self.measurement[init_measured_indices[i]]["o2"]=init_Y2[i][0]    
-        (init_X, init_Y1, init_Y2)=(np.array(init_X), np.array(init_Y1), np.array(init_Y2))
-        
-        U=np.array(self.E[:])
-        init_X1=init_X[:]
-        init_X2=init_X[:]
-        
-        # bo loop
-        for iteration in range(0,self.NUM_ITER):
-            print ("---------------------------------------Iteration: ",iteration)
-            REGION=[{} for _ in U]
-            if self.surrogate=="GP":
-                # Fit a GP for each objective
-                gpr1, gpr2= self.SM.fit_gp()
-                model_o1=gpr1.fit(init_X1,init_Y1)
-                model_o2=gpr2.fit(init_X2,init_Y2)
-            
-            for config in range(0,len(U)):
-                # Compute mu and sigma of each points for each objective 
-                cur=np.array([U[config]])
-                cur_eval=self.O[config]
-                # Objective 1
-                if cur_eval["o1"] is False:
-                    if self.surrogate=="GP":
-                        mu_o1, sigma_o1= model_o1.predict(cur,return_std=True)
-                    
-                else:
-                    (mu_o1,sigma_o1)=(self.measurement[config]["o1"],0)
-                 
-                # Objective 2
-                if cur_eval["o2"] is False:
-                    if self.surrogate=="GP":                  
-                        mu_o2, sigma_o2= model_o2.predict(cur,return_std=True)
-                else:
-                    (mu_o2,sigma_o2)=(self.measurement[config]["o2"],0)
-                
-                # Compute uncertainty region for each point using mu and sigma                
-                REGION[config]["pes"]=[
-                0 if (mu_o1-math.sqrt(BETA)*sigma_o1)<0 else mu_o1-math.sqrt(BETA)*sigma_o1,
-                0 if (mu_o2-math.sqrt(BETA)*sigma_o2)<0 else mu_o2-math.sqrt(BETA)*sigma_o2
-                ]
-                REGION[config]["avg"]=[mu_o1,mu_o2]
-                REGION[config]["opt"]=[mu_o1+math.sqrt(BETA)*sigma_o1, mu_o2+math.sqrt(BETA)*sigma_o2]
-            
-           
-            # Determine undominated points
-            (undominated_points_ind,
-            undominated_points)=self.utils.identify_undominated_points(REGION)
-            # Determine pessimistic pareto front
-            (pess_pareto,
-            pess_indices_map)=self.utils.construct_pessimistic_pareto_front(
-                                undominated_points_ind, undominated_points, "CONSTRUCT")
-            # Determine optimistic pareto front
-            (opt_pareto,
-            opt_indices_map)=self.utils.construct_optimistic_pareto_front(
-                                undominated_points_ind, undominated_points, "CONSTRUCT")
-            # Determine pessimistic pareto volume
-            pess_pareto_volume=self.utils.compute_pareto_volume(pess_pareto)
-            # Determine optimistic pareto volume
-            opt_pareto_volume=self.utils.compute_pareto_volume(opt_pareto)
-            # Determine volume of the pareto front
-            volume_of_pareto_front=opt_pareto_volume-pess_pareto_volume
-            # Determine next configuration and objective
-            (next_sample_index, 
-            next_sample, 
-            objective)=self.sampling.determine_next_sample(pess_pareto, opt_pareto, pess_indices_map,
-                                                         opt_indices_map, pess_pareto_volume, opt_pareto_volume,
-                                                         REGION, self.E)
-            
-            # Perform measurement on next sample on the objective returned
-            # Update init_X and init_Y
-              
-            if objective=="o1":
-                # Evaluate Objective O1
-                ConfigHardware(next_sample)
-                ComputePerformance(fname_model)
-                cur_X1=np.array(next_sample)                              
-                self.O[next_sample_index]["o1"]=True
-                self.measurement[next_sample_index]["o1"]=cur_Y1[0]
-                np.vstack((init_X1,cur_X1))
-                np.vstack((init_Y1,cur_Y1))
-            if objective=="o2":
-                cur_X2=np.array(next_sample)
-                ConfigNetwork(self.network, next_sample)
-                ComputePerformance(fname_model)
-                self.O[next_sample_index]["o2"]=True
-                self.measurement[next_sample_index]["o2"]=cur_Y2[0]
-                np.vstack((init_X2,np.array(next_sample)))
-                np.vstack((init_Y2,cur_Y2))
-            
-            
-                   
\ No newline at end of file
+        perf=ComputePerformance(fname_model, ["energy", "accuracy"], None,
+                                self.config)
+        return perf.get_metric(metric)
@@ -0,0 +1,157 @@
+"""-----------------------------------------------------------------------------
+@Name: Flexible Bayesian Optimization (FlexiBO): An active learning for optimiz-
+ing  multiple objectives of different cost
+@Version: 0.1
+@Author: Shahriar Iqbal
+--------------------------------------------------------------------------------
+"""
+import numpy as np
+
+METHODS=("sobol", "lhs", "maximin", "random")
+
+def get_strides(levels):
+    """This function is used to get the mixed-radix strides of a grid given
+    the levels of each option. The last option varies fastest, as in
+    itertools.product
+    """
+    radix=np.array([len(cur) for cur in levels], dtype=np.int64)
+    strides=np.ones(len(radix), dtype=np.int64)
+    strides[:-1]=np.cumprod(radix[::-1])[::-1][1:]
+    return (radix, strides)
+
+def decode(levels, indices,
+           table=None):
+    """This function is used to get the configs of grid indices without
+    building the grid
+    ----------------------------------------------------------------------------
+    @args:
+        levels: values of each option
+        indices: flat indices into the grid
+        table: (radix, strides) of the levels if already computed
+    @returns:
+        configs as a 2-d array
+    ----------------------------------------------------------------------------
+    """
+    (radix, strides)=table if table is not None else get_strides(levels)
+    coords=(np.asarray(indices, dtype=np.int64)[:, None]//strides)%radix
+    return np.column_stack([np.asarray(cur)[coords[:, j]]
+                            for j, cur in enumerate(levels)])
+
+def normalize(X):
+    """This function is used to map each column to [0,1] by the rank of its
+    discrete levels, so that unevenly spaced options (frequencies) are spread
+    like the grid they come from
+    """
+    X=np.asarray(X, dtype=float)
+    U=np.full(X.shape, 0.5)
+    for j in range(X.shape[1]):
+        (levels, pos)=np.unique(X[:, j], return_inverse=True)
+        if len(levels)>1:
+            U[:, j]=pos/(len(levels)-1.0)
+    return U
+
+class InitialDesign(object):
+    """This class is used to choose the configs measured before the bo loop
+    starts. Sobol and latin hypercube points are snapped to the nearest
+    candidate, maximin greedily adds the candidate farthest from the design
+    """
+    def __init__(self, method="sobol", size=20,
+                 seed=None):
+        print ("[STATUS]: Initializing InitialDesign Class")
+        if method not in METHODS:
+            print ("[ERROR]: initial design {0} not supported, using random".format(method))
+            method="random"
+        self.method=method
+        self.size=size
+        self.rng=np.random.RandomState(seed)
+
+    def get_unit_points(self, n, d):
+        """This function is used to generate n design points in [0,1)^d
+        """
+        from scipy.stats import qmc
+        seed=self.rng.randint(2**31)
+        if self.method=="sobol":
+            # sobol points are balanced in powers of two
+            m=int(np.ceil(np.log2(max(n, 2))))
+            return qmc.Sobol(d, scramble=True, seed=seed).random_base2(m)[:n]
+        if self.method=="lhs":
+            return qmc.LatinHypercube(d, seed=seed).random(n)
+        return self.rng.random_sample((n, d))
+
+    def select_maximin(self, U, size):
+        """This function is used to greedily select the points maximizing the
+        minimum distance to the points already selected
+        """
+        selected=[self.rng.randint(len(U))]
+        min_dist=np.sum((U-U[selected[0]])**2, axis=1)
+        for _ in range(1, size):
+            cur=int(np.argmax(min_dist))
+            selected.append(cur)
+            min_dist=np.minimum(min_dist, np.sum((U-U[cur])**2, axis=1))
+        return selected
+
+    def select(self, X):
+        """This function is used to select distinct rows of a candidate table
+        ------------------------------------------------------------------------
+        @args:
+            X: candidate configs, one row per config; duplicate rows are
+               considered once
+        @returns:
+            indices of the selected rows
+        ------------------------------------------------------------------------
+        """
+        (_, first)=np.unique(np.asarray(X, dtype=float), axis=0, return_index=True)
+        first=np.sort(first)
+        size=min(self.size, len(first))
+        U=normalize(np.asarray(X, dtype=float)[first])
+        if self.method=="random":
+            selected=self.rng.choice(len(first), size, replace=False)
+        elif self.method=="maximin":
+            selected=self.select_maximin(U, size)
+        else:
+            from scipy.spatial import cKDTree
+            tree=cKDTree(U)
+            points=self.get_unit_points(size, U.shape[1])
+            # snap every point to its nearest candidate not taken yet
+            (_, neighbors)=tree.query(points, k=min(len(first), 2*size))
+            neighbors=neighbors.reshape(size, -1)
+            (selected, taken)=([], set())
+            for row in neighbors:
+                cur=next((i for i in row if i not in taken), None)
+                if cur is None:
+                    cur=next(i for i in range(len(first)) if i not in taken)
+                taken.add(cur)
+                selected.append(cur)
+        return [int(first[i]) for i in selected]
+
+    def select_grid(self, levels,
+                    table=None):
+        """This function is used to select configs of a full factorial grid
+        by their grid index, so that the grid is not built to choose them
+        ------------------------------------------------------------------------
+        @args:
+            levels: values of each option
+            table: (radix, strides) of the levels if already computed
+        @returns:
+            flat indices of the selected configs in the grid
+        ------------------------------------------------------------------------
+        """
+        (radix, strides)=table if table is not None else get_strides(levels)
+        num_configs=int(np.prod(radix))
+        size=min(self.size, num_configs)
+        if self.method=="maximin":
+            # maximin over a random pool of the grid
+            pool=np.unique(self.rng.randint(num_configs, size=min(num_configs, 64*size)))
+            U=normalize(decode(levels, pool, (radix, strides)))
+            return [int(pool[i]) for i in self.select_maximin(U, min(size, len(pool)))]
+        (selected, taken, n)=([], set(), size)
+        while len(selected)<size:
+            points=self.get_unit_points(n, len(radix))
+            coords=np.minimum((points*radix).astype(np.int64), radix-1)
+            for index in coords.dot(strides).tolist():
+                if index not in taken and len(selected)<size:
+                    taken.add(index)
+                    selected.append(index)
+            # duplicates on small grids; draw more points
+            n*=2
+        return selected
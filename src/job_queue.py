@@ -0,0 +1,173 @@
+"""-----------------------------------------------------------------------------
+@Name: Flexible Bayesian Optimization (FlexiBO): An active learning for optimiz-
+ing  multiple objectives of different cost
+@Version: 0.1
+@Author: Shahriar Iqbal
+--------------------------------------------------------------------------------
+"""
+import itertools
+import time
+import threading
+import traceback
+from queue import Queue
+from collections import namedtuple
+from concurrent.futures import Future
+
+PENDING="PENDING"
+RUNNING="RUNNING"
+DONE="DONE"
+FAILED="FAILED"
+CANCELLED="CANCELLED"
+
+# local path of a trained model and the validation metrics its trainer reported
+TrainingResult=namedtuple("TrainingResult", ["model", "metrics"])
+
+class TrainingJob(object):
+    """This class is used to keep the state of one network training job
+    """
+    def __init__(self, job_id, network,
+                 config, fidelity=None):
+        self.job_id=job_id
+        self.network=network
+        self.config=config
+        self.fidelity=fidelity
+        self.state=PENDING
+        self.attempts=0
+        self.worker=None
+        self.result=None
+        self.error=None
+        # wall-clock of all attempts
+        self.seconds=0.0
+        self.future=Future()
+
+class TrainingJobQueue(object):
+    """This class is used to schedule network training jobs across a set of
+    remote (or local) training workers. Each submitted job returns its
+    TrainingJob, whose future resolves once the network is trained, so that
+    the bo loop can keep selecting samples while networks train
+    """
+    def __init__(self, workers, max_retries=2,
+                 run_job=None, config=None):
+        print ("[STATUS]: Initializing TrainingJobQueue Class")
+        self.workers=workers
+        self.max_retries=max_retries
+        self.run_job=run_job or self.train_network
+        self.config=config
+        self.queue=Queue()
+        self.jobs={}
+        self.counter=itertools.count()
+        self.lock=threading.Lock()
+        # set by shutdown to drop jobs that have not started
+        self.cancel_pending=False
+        self.threads=list()
+        for worker_id, worker in enumerate(self.workers):
+            for slot in range(0, worker.get("slots", 1)):
+                thread=threading.Thread(target=self.serve, args=(worker_id, worker),
+                                        name="trainer-{0}-{1}".format(worker_id, slot))
+                thread.daemon=True
+                thread.start()
+                self.threads.append(thread)
+
+    def submit(self, network, config,
+               fidelity=None):
+        """This function is used to enqueue a network configuration for training
+        ------------------------------------------------------------------------
+        @args:
+            network: name of the network to train
+            config: configuration of the design space to train with
+            fidelity: training budget (epochs, data_fraction), full if None
+        @returns:
+            job: TrainingJob whose future resolves to the TrainingResult of
+                 the trained model
+        ------------------------------------------------------------------------
+        """
+        with self.lock:
+            job=TrainingJob(next(self.counter), network, list(config), fidelity)
+            self.jobs[job.job_id]=job
+        self.queue.put(job)
+        return job
+
+    def serve(self, worker_id, worker):
+        """This function is used by a worker thread to run jobs until shutdown
+        """
+        while True:
+            job=self.queue.get()
+            if job is None:
+                self.queue.task_done()
+                return
+            with self.lock:
+                if job.state==CANCELLED:
+                    self.queue.task_done()
+                    continue
+                job.state=RUNNING
+            job.worker=worker_id
+            job.attempts+=1
+            start=time.time()
+            try:
+                result=self.run_job(job, worker)
+            except Exception as e:
+                traceback.print_exc()
+                result=None
+                job.error=e
+            job.seconds+=time.time()-start
+            if result is not None:
+                job.state=DONE
+                job.result=result
+                job.future.set_result(result)
+            elif job.attempts<=self.max_retries and not self.cancel_pending:
+                print ("[WARNING]: job {0} failed on worker {1}, retrying".format(
+                       job.job_id, worker_id))
+                job.state=PENDING
+                self.queue.put(job)
+            else:
+                print ("[ERROR]: job {0} failed after {1} attempts".format(
+                       job.job_id, job.attempts))
+                job.state=FAILED
+                job.future.set_exception(job.error or RuntimeError(
+                    "training job {0} failed".format(job.job_id)))
+            self.queue.task_done()
+
+    def train_network(self, job, worker):
+        """This function is used to train a network on a worker
+        @returns:
+            TrainingResult or None if training failed
+        """
+        from src.config_network import ConfigNetwork
+        net=ConfigNetwork(job.network, job.config, worker, job.job_id,
+                          job.fidelity, self.config)
+        if net.status:
+            return TrainingResult(net.local_model_dir, net.metrics)
+        return None
+
+    def get_status(self):
+        """This function is used to count jobs in every state
+        """
+        status={PENDING:0, RUNNING:0, DONE:0, FAILED:0, CANCELLED:0}
+        with self.lock:
+            for job in self.jobs.values():
+                status[job.state]+=1
+        return status
+
+    def shutdown(self, wait=True,
+                 cancel_pending=False):
+        """This function is used to stop the workers once queued jobs are
+        done. With cancel_pending, jobs that have not started are cancelled
+        and failed jobs are not retried, so only running jobs are waited for
+        """
+        if cancel_pending:
+            with self.lock:
+                self.cancel_pending=True
+                for job in self.jobs.values():
+                    if job.state==PENDING:
+                        job.state=CANCELLED
+                        job.future.cancel()
+            print ("[STATUS]: cancelled training jobs that had not started")
+        if wait:
+            # retried jobs are requeued before being marked done, so this also
+            # waits for retries
+            self.queue.join()
+        for _ in self.threads:
+            self.queue.put(None)
+        if wait:
+            for thread in self.threads:
+                thread.join()
@@ -0,0 +1,284 @@
+"""-----------------------------------------------------------------------------
+@Name: Flexible Bayesian Optimization (FlexiBO): An active learning for optimiz-
+ing  multiple objectives of different cost
+@Version: 0.1
+@Author: Shahriar Iqbal
+--------------------------------------------------------------------------------
+Kernels of the pareto engine. The dominance checks and front sweeps are branchy
+loops with early exits, so they are compiled with numba when it is installed;
+otherwise the NumPy versions are used. Both versions return identical results:
+masks are exact and volumes add the same terms in the same order.
+"""
+import os
+import importlib.util
+import numpy as np
+
+# numba is imported and the kernels compiled on first use, so that importing
+# the engine stays cheap
+NUMBA=(os.environ.get("FLEXIBO_NUMBA", "1")!="0" and
+       importlib.util.find_spec("numba") is not None)
+COMPILED=False
+
+#-------------------------------------------------------------------------------
+# NumPy kernels
+#-------------------------------------------------------------------------------
+def nondominated_mask_numpy(S):
+    """This function is used to mark the points of S, sorted lexicographically
+    in descending order, no earlier point weakly dominates
+    """
+    keep=np.zeros(len(S), dtype=bool)
+    if len(S)==0:
+        return keep
+    front=[0]
+    for i in range(1, len(S)):
+        if not np.any(np.all(S[front]>=S[i], axis=1)):
+            front.append(i)
+    keep[front]=True
+    return keep
+
+def dominated_mask_numpy(front, points,
+                         chunk=1000000):
+    """This function is used to mark the points a point of front dominates
+    """
+    dominated=np.zeros(len(points), dtype=bool)
+    step=max(1, chunk//max(1, front.size))
+    for start in range(0, len(points), step):
+        cur=points[start:start+step][:, None, :]
+        dominated[start:start+step]=np.any(np.all(front>=cur, axis=2) &
+                                           np.any(front>cur, axis=2), axis=1)
+    return dominated
+
+def volume_2d_numpy(P):
+    """This function is used to compute the volume points of two objectives,
+    clipped at the origin, dominate. Points sorted by o1 descending are kept
+    if they improve o2 and each kept point adds the strip down to the o1 of
+    the next kept point
+    """
+    if len(P)==0:
+        return 0.0
+    order=np.lexsort((-P[:, 1], -P[:, 0]))
+    S=P[order]
+    best=np.maximum.accumulate(S[:, 1])
+    keep=np.ones(len(S), dtype=bool)
+    keep[1:]=S[1:, 1]>best[:-1]
+    S=S[keep]
+    widths=S[:, 0]-np.append(S[1:, 0], 0.0)
+    # cumulative sum adds in order, like the compiled kernel
+    return float(np.cumsum(widths*S[:, 1])[-1])
+
+def volume_3d_numpy(P):
+    """This function is used to compute the volume points of three objectives
+    dominate. Sweeping o3 down, every level adds the area the points above it
+    dominate in o1 and o2 times the depth to the next level
+    """
+    if len(P)==0:
+        return 0.0
+    order=np.argsort(-P[:, 2], kind="mergesort")
+    (S, z)=(P[order], P[order, 2])
+    volume=0.0
+    for i in range(0, len(S)):
+        depth=z[i]-(z[i+1] if i+1<len(S) else 0.0)
+        if i+1<len(S) and depth==0:
+            continue
+        volume+=volume_2d_numpy(S[:i+1, :2])*depth
+    return volume
+
+def shrunk_volumes_numpy(P, positions,
+                         objectives, values):
+    """This function is used to compute the volume of a front of two or three
+    objectives after, for every task, one coordinate of one point is replaced
+    """
+    volume=volume_2d_numpy if P.shape[1]==2 else volume_3d_numpy
+    volumes=np.zeros(len(positions))
+    for t in range(0, len(positions)):
+        cur=P.copy()
+        cur[positions[t], objectives[t]]=max(values[t], 0.0)
+        volumes[t]=volume(cur)
+    return volumes
+
+#-------------------------------------------------------------------------------
+# numba kernels, compiled by compile_kernels
+#-------------------------------------------------------------------------------
+def nondominated_mask_numba(S):
+    (n, k)=S.shape
+    keep=np.zeros(n, dtype=np.bool_)
+    front=np.empty(n, dtype=np.int64)
+    size=0
+    for i in range(0, n):
+        dominated=False
+        for f in range(0, size):
+            weak=True
+            for j in range(0, k):
+                if S[front[f], j]<S[i, j]:
+                    weak=False
+                    break
+            if weak:
+                dominated=True
+                break
+        if not dominated:
+            front[size]=i
+            size+=1
+            keep[i]=True
+    return keep
+
+def dominated_mask_numba(front, points):
+    (n, k)=points.shape
+    dominated=np.zeros(n, dtype=np.bool_)
+    for i in range(0, n):
+        for f in range(0, front.shape[0]):
+            weak=True
+            strict=False
+            for j in range(0, k):
+                if front[f, j]<points[i, j]:
+                    weak=False
+                    break
+                if front[f, j]>points[i, j]:
+                    strict=True
+            if weak and strict:
+                dominated[i]=True
+                break
+    return dominated
+
+def volume_2d_numba(P):
+    n=P.shape[0]
+    if n==0:
+        return 0.0
+    # o1 descending and o2 descending among equal o1
+    order=np.argsort(-P[:, 1], kind="mergesort")
+    order=order[np.argsort(-P[order, 0], kind="mergesort")]
+    volume=0.0
+    best=-np.inf
+    (last_x, last_y)=(0.0, 0.0)
+    for i in order:
+        if P[i, 1]<=best:
+            continue
+        if best>-np.inf:
+            volume+=(last_x-P[i, 0])*last_y
+        (last_x, last_y)=(P[i, 0], P[i, 1])
+        best=P[i, 1]
+    return volume+(last_x-0.0)*last_y
+
+def volume_3d_numba(P):
+    n=P.shape[0]
+    order=np.argsort(-P[:, 2], kind="mergesort")
+    # projections of the points above the level, o1 descending and o2
+    # descending among equal o1
+    xs=np.empty(n)
+    ys=np.empty(n)
+    size=0
+    volume=0.0
+    for i in range(0, n):
+        (x, y, z)=(P[order[i], 0], P[order[i], 1], P[order[i], 2])
+        pos=0
+        while pos<size and (xs[pos]>x or (xs[pos]==x and ys[pos]>=y)):
+            pos+=1
+        for p in range(size, pos, -1):
+            xs[p]=xs[p-1]
+            ys[p]=ys[p-1]
+        (xs[pos], ys[pos])=(x, y)
+        size+=1
+        depth=z-(P[order[i+1], 2] if i+1<n else 0.0)
+        if i+1<n and depth==0:
+            continue
+        area=0.0
+        best=-np.inf
+        (last_x, last_y)=(0.0, 0.0)
+        for p in range(0, size):
+            if ys[p]<=best:
+                continue
+            if best>-np.inf:
+                area+=(last_x-xs[p])*last_y
+            (last_x, last_y)=(xs[p], ys[p])
+            best=ys[p]
+        volume+=(area+(last_x-0.0)*last_y)*depth
+    return volume
+
+def shrunk_volumes_numba(P, positions,
+                         objectives, values):
+    volumes=np.zeros(positions.shape[0])
+    cur=P.copy()
+    for t in range(0, positions.shape[0]):
+        (pos, j)=(positions[t], objectives[t])
+        previous=cur[pos, j]
+        cur[pos, j]=max(values[t], 0.0)
+        if cur.shape[1]==2:
+            volumes[t]=volume_2d_numba(cur)
+        else:
+            volumes[t]=volume_3d_numba(cur)
+        cur[pos, j]=previous
+    return volumes
+
+def compile_kernels():
+    """This function is used to compile the numba kernels; kernels calling
+    each other are compiled after the kernels they call
+    """
+    global NUMBA, COMPILED
+    if COMPILED or not NUMBA:
+        return
+    try:
+        import numba
+    except ImportError:
+        NUMBA=False
+        return
+    for name in ("nondominated_mask_numba", "dominated_mask_numba", "volume_2d_numba",
+                 "volume_3d_numba", "shrunk_volumes_numba"):
+        globals()[name]=numba.njit(cache=True)(globals()[name])
+    COMPILED=True
+
+#-------------------------------------------------------------------------------
+# dispatch
+#-------------------------------------------------------------------------------
+def nondominated_mask(S):
+    """This function is used to mark the undominated points of S sorted
+    lexicographically in descending order
+    """
+    S=np.ascontiguousarray(S, dtype=float)
+    compile_kernels()
+    if NUMBA:
+        return nondominated_mask_numba(S)
+    return nondominated_mask_numpy(S)
+
+def dominated_mask(front, points):
+    """This function is used to mark the points a point of front dominates
+    """
+    front=np.ascontiguousarray(front, dtype=float)
+    points=np.ascontiguousarray(points, dtype=float)
+    compile_kernels()
+    if NUMBA:
+        return dominated_mask_numba(front, points)
+    return dominated_mask_numpy(front, points)
+
+def volume_2d(P):
+    """This function is used to compute the volume points of two objectives
+    dominate from the origin
+    """
+    P=np.maximum(np.ascontiguousarray(P, dtype=float).reshape(len(P), 2), 0)
+    compile_kernels()
+    if NUMBA:
+        return float(volume_2d_numba(P))
+    return volume_2d_numpy(P)
+
+def volume_3d(P):
+    """This function is used to compute the volume points of three objectives
+    dominate from the origin
+    """
+    P=np.maximum(np.ascontiguousarray(P, dtype=float).reshape(len(P), 3), 0)
+    compile_kernels()
+    if NUMBA:
+        return float(volume_3d_numba(P))
+    return volume_3d_numpy(P)
+
+def shrunk_volumes(P, positions,
+                   objectives, values):
+    """This function is used to compute the volumes of a front of two or
+    three objectives with one coordinate of one point replaced, for many
+    replacements at once
+    """
+    P=np.maximum(np.ascontiguousarray(P, dtype=float).reshape(len(P), -1), 0)
+    positions=np.asarray(positions, dtype=np.int64)
+    objectives=np.asarray(objectives, dtype=np.int64)
+    values=np.asarray(values, dtype=float)
+    compile_kernels()
+    if NUMBA:
+        return shrunk_volumes_numba(P, positions, objectives, values)
+    return shrunk_volumes_numpy(P, positions, objectives, values)
@@ -0,0 +1,185 @@
+"""-----------------------------------------------------------------------------
+@Name: Flexible Bayesian Optimization (FlexiBO): An active learning for optimiz-
+ing  multiple objectives of different cost
+@Version: 0.1
+@Author: Shahriar Iqbal
+--------------------------------------------------------------------------------
+"""
+import os
+import sys
+import json
+import pandas as pd
+
+META_COLUMNS=["system", "model", "resolution"]
+CONFIG_COLUMNS=["core0_status", "core1_status", "core2_status", "core3_status",
+                "core_freq", "gpu_freq", "emc_freq"]
+OBJECTIVE_COLUMNS=["inference_time", "power_consumption", "energy_consumption",
+                   "temperature"]
+# column names of the measurement csvs that differ from the store schema
+RENAME={"system_name":"system", "model_name":"model", "size":"resolution"}
+INDEX_FILE="_index.json"
+
+def get_schema():
+    """This function is used to get the typed schema of the store
+    """
+    import pyarrow as pa
+    return pa.schema([(c, pa.string()) for c in META_COLUMNS]+
+                     [("config_key", pa.int64())]+
+                     [(c, pa.int64()) for c in CONFIG_COLUMNS]+
+                     [(c, pa.float64()) for c in OBJECTIVE_COLUMNS])
+
+def get_config_key(df):
+    """This function is used to hash the config columns of every row into a
+    stable 64 bit key
+    """
+    return pd.util.hash_pandas_object(df[CONFIG_COLUMNS].astype("int64"),
+                                      index=False).values.view("int64")
+
+def get_slice(system, model, resolution):
+    """This function is used to name a slice of the store
+    """
+    return "{0}/{1}/{2}".format(system, model, resolution)
+
+class MeasurementStore(object):
+    """This class is used to keep measurements in an append-only columnar
+    store. Every append writes a new parquet part sorted by config key, and a
+    small index records which slices (system, model, resolution) each part
+    holds so that a run only reads the parts it needs
+    """
+    def __init__(self, store_dir):
+        print ("[STATUS]: Initializing MeasurementStore Class")
+        self.store_dir=store_dir
+        if not os.path.isdir(self.store_dir):
+            os.makedirs(self.store_dir)
+        self.index=self.read_index()
+
+    def read_index(self):
+        """This function is used to read the part index of the store
+        """
+        path=os.path.join(self.store_dir, INDEX_FILE)
+        if not os.path.exists(path):
+            return {"parts":[]}
+        with open(path) as fp:
+            return json.load(fp)
+
+    def write_index(self):
+        """This function is used to atomically replace the part index
+        """
+        path=os.path.join(self.store_dir, INDEX_FILE)
+        with open(path+".tmp", "w") as fp:
+            json.dump(self.index, fp, indent=1)
+        os.replace(path+".tmp", path)
+
+    def append(self, df):
+        """This function is used to append measurements as a new part
+        ------------------------------------------------------------------------
+        @args:
+            df: measurements with the meta, config and objective columns; any
+                missing objective column is stored as null
+        @returns:
+            name of the written part
+        ------------------------------------------------------------------------
+        """
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        missing=[c for c in META_COLUMNS+CONFIG_COLUMNS if c not in df]
+        if missing:
+            print ("[ERROR]: measurements miss columns {0}".format(missing))
+            return None
+        df=df.copy()
+        for column in OBJECTIVE_COLUMNS:
+            if column not in df:
+                df[column]=float("nan")
+        df["config_key"]=get_config_key(df)
+        # sorted keys give tight row group statistics for config lookups
+        df=df.sort_values("config_key")
+        table=pa.Table.from_pandas(df[get_schema().names], schema=get_schema(),
+                                   preserve_index=False)
+        name="part-{0:05d}.parquet".format(len(self.index["parts"]))
+        path=os.path.join(self.store_dir, name)
+        pq.write_table(table, path+".tmp", row_group_size=4096)
+        os.replace(path+".tmp", path)
+        slices=df.groupby(META_COLUMNS).size()
+        self.index["parts"].append({"file":name, "rows":len(df),
+                                    "slices":{get_slice(*k):int(v) for k, v in slices.items()}})
+        self.write_index()
+        return name
+
+    def import_csv(self, fname, system=None,
+                   model=None, resolution=None):
+        """This function is used to append a measurement csv to the store. Meta
+        columns the csv does not have are taken from the arguments
+        """
+        df=pd.read_csv(fname).rename(columns=RENAME)
+        for column, value in zip(META_COLUMNS, (system, model, resolution)):
+            if value is not None:
+                df[column]=value
+        return self.append(df)
+
+    def get_parts(self, system=None, model=None,
+                  resolution=None):
+        """This function is used to get the parts holding a slice
+        """
+        parts=list()
+        for part in self.index["parts"]:
+            for name in part["slices"]:
+                (cur_system, cur_model, cur_resolution)=name.split("/")
+                if ((system is None or system==cur_system) and
+                    (model is None or model==cur_model) and
+                    (resolution is None or resolution==cur_resolution)):
+                    parts.append(os.path.join(self.store_dir, part["file"]))
+                    break
+        return parts
+
+    def load(self, system=None, model=None,
+             resolution=None, columns=None, config_key=None):
+        """This function is used to load a slice of the store
+        ------------------------------------------------------------------------
+        @args:
+            system, model, resolution: slice to load, all if None
+            columns: columns to read, all if None
+            config_key: only rows of this config
+        @returns:
+            measurements as a dataframe
+        ------------------------------------------------------------------------
+        """
+        import pyarrow.parquet as pq
+        filters=[(c, "=", v) for c, v in zip(META_COLUMNS, (system, model, resolution))
+                 if v is not None]
+        if config_key is not None:
+            filters.append(("config_key", "=", config_key))
+        tables=[pq.read_table(part, columns=columns, filters=filters or None).to_pandas()
+                for part in self.get_parts(system, model, resolution)]
+        if not tables:
+            return pd.DataFrame(columns=columns or get_schema().names)
+        return pd.concat(tables, ignore_index=True)
+
+    def lookup(self, config, system=None,
+               model=None, resolution=None):
+        """This function is used to load the measurements of one config
+        """
+        key=get_config_key(pd.DataFrame([list(config)], columns=CONFIG_COLUMNS))[0]
+        return self.load(system, model, resolution, config_key=int(key))
+
+def config_option_parser():
+    """This function is used to configure option parser
+    """
+    from optparse import OptionParser
+    parser=OptionParser(usage="USAGE: python -m src.measurement_store [options] store_dir file.csv [file.csv ...]")
+    parser.add_option("--system", action="store", type="string", dest="system",
+                      help="system of csvs without a system_name column")
+    parser.add_option("--model", action="store", type="string", dest="model",
+                      help="model of csvs without a model_name column")
+    parser.add_option("--resolution", action="store", type="string", dest="resolution",
+                      help="resolution of csvs without a size column")
+    (options, args)=parser.parse_args()
+    if len(args)<2:
+        parser.error("a store directory and at least one csv are needed")
+    return (options, args)
+
+if __name__=="__main__":
+    (options, args)=config_option_parser()
+    store=MeasurementStore(args[0])
+    for fname in args[1:]:
+        print ("[STATUS]: importing {0} as {1}".format(fname, store.import_csv(
+               fname, options.system, options.model, options.resolution)))
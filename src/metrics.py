@@ -0,0 +1,191 @@
+"""-----------------------------------------------------------------------------
+@Name: Flexible Bayesian Optimization (FlexiBO): An active learning for optimiz-
+ing  multiple objectives of different cost
+@Version: 0.1
+@Author: Shahriar Iqbal
+--------------------------------------------------------------------------------
+Pareto-front quality metrics of many runs at once. The fronts of all runs are
+stacked into one array of points with the run each point belongs to, so every
+metric is a few vectorized passes over that array instead of a loop over runs.
+Pairwise distances to the reference front are computed in chunks of at most
+CHUNK elements. Every objective is maximized.
+"""
+import numpy as np
+from src.pareto import Pareto
+
+CHUNK=4000000
+
+def stack_fronts(fronts):
+    """This function is used to stack the fronts of many runs
+    @returns:
+        P: points of all fronts
+        owner: run of every point
+        num_runs: number of runs
+    """
+    fronts=[np.asarray(f, dtype=float) for f in fronts]
+    num_obj=max([f.shape[-1] for f in fronts if f.size]+[0])
+    fronts=[f.reshape(len(f), num_obj) if f.size else np.zeros((0, num_obj)) for f in fronts]
+    P=np.concatenate(fronts) if fronts else np.zeros((0, num_obj))
+    owner=np.repeat(np.arange(len(fronts)), [len(f) for f in fronts])
+    return (P, owner, len(fronts))
+
+def get_reference_front(fronts):
+    """This function is used to get the undominated points of the union of
+    the fronts, the reference front of the runs
+    """
+    (P, _, _)=stack_fronts(fronts)
+    if len(P)==0:
+        return P
+    return P[Pareto(P.shape[1]).get_nondominated(P)]
+
+def reduce_by_run(ufunc, values,
+                  owner, num_runs,
+                  initial):
+    """This function is used to reduce the rows of values of each run; runs
+    without points keep initial
+    """
+    result=np.full((num_runs,)+values.shape[1:], initial, dtype=float)
+    if len(values)==0:
+        return result
+    # points are stacked run after run, so each run is one segment
+    starts=np.flatnonzero(np.r_[True, owner[1:]!=owner[:-1]])
+    result[owner[starts]]=ufunc.reduceat(values, starts, axis=0)
+    return result
+
+def reduce_pairwise(fronts, reference,
+                    fn, ufunc,
+                    initial):
+    """This function is used to reduce a pairwise quantity between the points
+    of each run and the reference points, in chunks of points
+    @args:
+        fn: function of (points, reference) to a matrix of points by
+            reference points
+    @returns:
+        matrix of runs by reference points
+    """
+    (P, owner, num_runs)=stack_fronts(fronts)
+    R=np.asarray(reference, dtype=float).reshape(len(reference), -1)
+    result=np.full((num_runs, len(R)), initial, dtype=float)
+    chunk=max(1, CHUNK//max(1, len(R)*R.shape[1]))
+    for start in range(0, len(P), chunk):
+        cur=reduce_by_run(ufunc, fn(P[start:start+chunk], R),
+                          owner[start:start+chunk], num_runs, initial)
+        result=ufunc(result, cur)
+    return result
+
+def contribution(fronts, reference=None):
+    """@CONTRIBUTION
+    ----------------------------------------------------------------------------
+    This function is used to compute the fraction of the reference front each
+    front contains. Points are matched exactly, as reference points are copies
+    of front points
+    ----------------------------------------------------------------------------
+    """
+    if reference is None:
+        reference=get_reference_front(fronts)
+    (P, owner, num_runs)=stack_fronts(fronts)
+    R=np.asarray(reference, dtype=float).reshape(len(reference), -1)
+    if len(R)==0 or len(P)==0:
+        return np.zeros(num_runs)
+    (_, inverse)=np.unique(np.vstack([R, P]), axis=0, return_inverse=True)
+    inverse=np.ravel(inverse)
+    column=np.full(inverse.max()+1, -1)
+    column[inverse[:len(R)]]=np.arange(len(R))
+    column=column[inverse[len(R):]]
+    covered=np.zeros((num_runs, len(R)), dtype=bool)
+    covered[owner[column>=0], column[column>=0]]=True
+    return covered.mean(axis=1)
+
+def diversity(fronts, reference=None):
+    """@DIVERSITY
+    ----------------------------------------------------------------------------
+    This function is used to compute the extent each front spans along each
+    objective relative to the extent of the reference front, averaged over
+    objectives
+    ----------------------------------------------------------------------------
+    """
+    if reference is None:
+        reference=get_reference_front(fronts)
+    (P, owner, num_runs)=stack_fronts(fronts)
+    if len(P)==0:
+        return np.zeros(num_runs)
+    R=np.asarray(reference, dtype=float).reshape(len(reference), -1)
+    extent=np.ptp(R, axis=0) if len(R) else np.ones(P.shape[1])
+    extent[extent==0]=1.0
+    upper=reduce_by_run(np.maximum, P, owner, num_runs, 0.0)
+    lower=reduce_by_run(np.minimum, P, owner, num_runs, 0.0)
+    return np.mean((upper-lower)/extent, axis=1)
+
+def hypervolume(fronts, pareto=None):
+    """@HYPERVOLUME
+    ----------------------------------------------------------------------------
+    This function is used to compute the volume each front dominates from the
+    origin. Fronts of two objectives are swept all at once: points sorted by
+    run and o1 descending add their o1 times the gain over the best o2 of the
+    run so far. More objectives go through Pareto one front at a time
+    ----------------------------------------------------------------------------
+    """
+    (P, owner, num_runs)=stack_fronts(fronts)
+    if len(P)==0:
+        return np.zeros(num_runs)
+    P=np.maximum(P, 0)
+    if P.shape[1]!=2:
+        pareto=pareto or Pareto(P.shape[1])
+        return np.array([pareto.compute_pareto_volume(P[owner==run])
+                         for run in range(0, num_runs)])
+    order=np.lexsort((-P[:, 1], -P[:, 0], owner))
+    (x, y, owner)=(P[order, 0], P[order, 1], owner[order])
+    # offsetting o2 by run keeps the running maximum within each run
+    offset=owner*(y.max()+1.0)
+    best=np.maximum.accumulate(y+offset)-offset
+    previous=np.r_[0.0, best[:-1]]
+    previous[np.r_[True, owner[1:]!=owner[:-1]]]=0.0
+    return np.bincount(owner, weights=x*(best-previous), minlength=num_runs)
+
+def igd(fronts, reference,
+        plus=False):
+    """@IGD
+    ----------------------------------------------------------------------------
+    This function is used to compute the inverted generational distance of
+    each front, the mean distance from a reference point to its nearest front
+    point. IGD+ only counts the objectives the reference point is better in
+    ----------------------------------------------------------------------------
+    """
+    def distance(P, R):
+        D=R[None, :, :]-P[:, None, :]
+        if plus:
+            D=np.maximum(D, 0)
+        return np.sqrt(np.sum(D**2, axis=2))
+    return np.mean(reduce_pairwise(fronts, reference, distance, np.minimum, np.inf), axis=1)
+
+def igd_plus(fronts, reference):
+    """This function is used to compute the IGD+ of each front
+    """
+    return igd(fronts, reference, plus=True)
+
+def epsilon(fronts, reference):
+    """@EPSILON
+    ----------------------------------------------------------------------------
+    This function is used to compute the additive epsilon indicator of each
+    front, the smallest amount the front has to be shifted by to weakly
+    dominate every reference point
+    ----------------------------------------------------------------------------
+    """
+    def shift(P, R):
+        return np.max(R[None, :, :]-P[:, None, :], axis=2)
+    return np.max(reduce_pairwise(fronts, reference, shift, np.minimum, np.inf), axis=1)
+
+def score(fronts, reference=None):
+    """This function is used to compute every metric of the fronts against a
+    reference front, by default the undominated union of the fronts
+    @returns:
+        dict from metric to the value of every front
+    """
+    if reference is None:
+        reference=get_reference_front(fronts)
+    return {"contribution":contribution(fronts, reference),
+            "diversity":diversity(fronts, reference),
+            "hypervolume":hypervolume(fronts),
+            "igd":igd(fronts, reference),
+            "igd_plus":igd_plus(fronts, reference),
+            "epsilon":epsilon(fronts, reference)}
@@ -1,10 +1,10 @@
 from __future__ import division
-import autograd.numpy as anp
+import numpy as anp
 
 class ObjectiveSynthetic:
     """This class is used to create objective space for synthetic cases"""
     def __init__(self):
-        print "[STATUS]: initializing objectivesynthetic class"
+        print ("[STATUS]: initializing objectivesynthetic class")
 
     def ZDT1(self,
              x,
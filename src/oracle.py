@@ -0,0 +1,55 @@
+"""-----------------------------------------------------------------------------
+@Name: Flexible Bayesian Optimization (FlexiBO): An active learning for optimiz-
+ing  multiple objectives of different cost
+@Version: 0.1
+@Author: Shahriar Iqbal
+--------------------------------------------------------------------------------
+"""
+import numpy as np
+
+class MeasurementOracle(object):
+    """This class is used to answer (config, objective) measurements from a
+    measurement table instead of the device, so that the bo loop can be
+    replayed off-device
+    """
+    def __init__(self, df, config_columns,
+                 objectives):
+        print ("[STATUS]: Initializing MeasurementOracle Class")
+        self.config_columns=config_columns
+        self.objectives=objectives
+        X=df[config_columns].values.tolist()
+        # hash from config tuple to the rows that measured it; repeated
+        # measurements of a config are averaged
+        rows={}
+        for row, config in enumerate(X):
+            rows.setdefault(tuple(config), []).append(row)
+        self.configs=[list(config) for config in rows]
+        self.index={config: position for position, config in enumerate(rows)}
+        self.values={}
+        for objective, column in objectives.items():
+            values=df[column].values
+            self.values[objective]=np.array([values[r].mean() for r in rows.values()])
+
+    def get_design_space(self):
+        """This function is used to get the measured configs as design space
+        """
+        return (
+                [list(x) for x in self.configs],
+                [dict.fromkeys(self.objectives, False) for _ in self.configs],
+                [dict.fromkeys(self.objectives, False) for _ in self.configs])
+
+    def lookup(self, config):
+        """This function is used to get the position of a config in the table
+        @returns:
+            position of the config or None if it was never measured
+        """
+        return self.index.get(tuple(config))
+
+    def measure(self, config, objective):
+        """This function is used to replay the measurement of an objective
+        """
+        position=self.lookup(config)
+        if position is None:
+            print ("[ERROR]: config {0} was not measured".format(config))
+            return None
+        return self.values[objective][position]
@@ -1,148 +1,249 @@
+"""-----------------------------------------------------------------------------
+@Name: Flexible Bayesian Optimization (FlexiBO): An active learning for optimiz-
+ing  multiple objectives of different cost
+@Version: 0.1
+@Author: Shahriar Iqbal
+--------------------------------------------------------------------------------
+"""
 import numpy as np
-from operator import itemgetter
+from src import kernels
 
 class Pareto(object):
-    def __init__(self, o1_ind, o2_ind):
-        print ("[STATUS]: initializing pareto class")
-        self.O1_IND = o1_ind
-        self.O2_IND = o2_ind
+    """This class is the pareto engine of FlexiBO: undominated filtering,
+    pessimistic and optimistic front construction and volumes of k objectives.
+    Every objective is maximized and volumes are measured from the origin
+    """
+    def __init__(self, num_obj, exact_max_obj=3,
+                 mc_samples=10000, seed=0):
+        print ("[STATUS]: Initializing Pareto Class")
+        self.NUM_OBJ=num_obj
+        # fronts of more objectives have their volume estimated by monte carlo
+        self.EXACT_MAX_OBJ=exact_max_obj
+        self.MC_SAMPLES=mc_samples
+        self.SEED=seed
+
+    def get_nondominated(self,
+                         points):
+        """@GET_NONDOMINATED
+        ------------------------------------------------------------------------
+        This function is used to get the indices of the points no other point
+        dominates. Points are sorted lexicographically in descending order so
+        that a point can only be dominated by points before it; of equal points
+        only the first is kept
+        ------------------------------------------------------------------------
+        """
+        P=np.asarray(points, dtype=float).reshape(len(points), -1)
+        if len(P)==0:
+            return []
+        order=np.lexsort([-P[:, j] for j in range(P.shape[1]-1, -1, -1)])
+        S=P[order]
+        if S.shape[1]==1:
+            return [int(order[0])]
+        if S.shape[1]==2:
+            # sorted by o1, a point is undominated if it improves o2
+            best=np.maximum.accumulate(S[:, 1])
+            keep=np.ones(len(S), dtype=bool)
+            keep[1:]=S[1:, 1]>best[:-1]
+            return order[keep].tolist()
+        return order[kernels.nondominated_mask(S)].tolist()
+
+    def nondominated_sort(self,
+                          points):
+        """@NONDOMINATED_SORT
+        ------------------------------------------------------------------------
+        This function is used to rank points by the pareto front they belong
+        to; rank 0 is the pareto front
+        ------------------------------------------------------------------------
+        """
+        P=np.asarray(points, dtype=float).reshape(len(points), -1)
+        rank=np.full(len(P), -1)
+        remaining=np.arange(len(P))
+        cur_rank=0
+        while len(remaining)>0:
+            front=remaining[self.get_nondominated(P[remaining])]
+            # equal points share a front
+            equal=np.all(P[remaining][:, None, :]==P[front][None, :, :], axis=2).any(axis=1)
+            rank[remaining[equal]]=cur_rank
+            remaining=remaining[~equal]
+            cur_rank+=1
+        return rank.tolist()
+
+    def compute_exact_volume(self, P):
+        """@COMPUTE_EXACT_VOLUME
+        ------------------------------------------------------------------------
+        This function is used to compute the volume dominated by undominated
+        points by slicing along the last objective
+        ------------------------------------------------------------------------
+        """
+        if P.shape[1]==1:
+            return float(P[:, 0].max())
+        if P.shape[1]==2:
+            return kernels.volume_2d(P)
+        if P.shape[1]==3:
+            return kernels.volume_3d(P)
+        levels=np.unique(P[:, -1])[::-1]
+        volume=0.0
+        for i, level in enumerate(levels):
+            depth=level-(levels[i+1] if i+1<len(levels) else 0)
+            sub=P[P[:, -1]>=level][:, :-1]
+            volume+=depth*self.compute_exact_volume(sub[self.get_nondominated(sub)])
+        return volume
+
+    def compute_mc_volume(self, P):
+        """@COMPUTE_MC_VOLUME
+        ------------------------------------------------------------------------
+        This function is used to estimate the volume dominated by points with
+        uniform samples of their bounding box. The samples are seeded so that
+        volumes of fronts that differ in one point are compared on the same
+        samples
+        ------------------------------------------------------------------------
+        """
+        upper=P.max(axis=0)
+        if np.any(upper<=0):
+            return 0.0
+        dominance=self.compute_dominance(P, self.get_mc_samples(upper))
+        return float(np.mean(np.any(dominance, axis=1)))*float(np.prod(upper))
+
+    def get_mc_samples(self, upper):
+        """@GET_MC_SAMPLES
+        ------------------------------------------------------------------------
+        This function is used to draw the seeded uniform samples of the box
+        between the origin and upper
+        ------------------------------------------------------------------------
+        """
+        rng=np.random.RandomState(self.SEED)
+        return rng.random_sample((self.MC_SAMPLES, len(upper)))*upper
+
+    def compute_dominance(self, P, samples):
+        """@COMPUTE_DOMINANCE
+        ------------------------------------------------------------------------
+        This function is used to check which points dominate which samples
+        @returns:
+            boolean matrix of samples by points
+        ------------------------------------------------------------------------
+        """
+        dominance=np.zeros((len(samples), len(P)), dtype=bool)
+        chunk=max(1, 1000000//(len(P)*P.shape[1]))
+        for start in range(0, len(samples), chunk):
+            cur=samples[start:start+chunk]
+            dominance[start:start+chunk]=np.all(P[None, :, :]>=cur[:, None, :], axis=2)
+        return dominance
 
     def compute_pareto_volume(self,
                               front):
-        """This function is used to compute pareto volume between pessimistic and
-        optimistic pareto front
+        """@COMPUTE_PARETO_VOLUME
+        ------------------------------------------------------------------------
+        This function is used to compute the volume dominated by a pareto front.
+        It is exact up to EXACT_MAX_OBJ objectives and estimated by monte carlo
+        for more
+        ------------------------------------------------------------------------
         """
-
-        prev_x = 0
-        prev_y = 0
-        area = 0
-        for point in front:
-            a = point[self.O1_IND]
-            b = point[self.O2_IND] - prev_x
-            area += a*b
-            prev_x = point[self.O2_IND]
-
-        return area
-
-    def construct_pes_pareto_front(
-                                   self,
-                                   pareto_points_ind,
-                                   pareto_points):
-        """This function is used to construct pessimistic pareto front using the
-        undom points
+        if len(front)==0:
+            return 0.0
+        P=np.maximum(np.asarray(front, dtype=float).reshape(len(front), -1), 0)
+        P=P[self.get_nondominated(P)]
+        if P.shape[1]<=self.EXACT_MAX_OBJ:
+            return self.compute_exact_volume(P)
+        return self.compute_mc_volume(P)
+
+    def construct_pareto_front(self,
+                               pareto_points_ind,
+                               pareto_points,
+                               key,
+                               mode):
+        """@CONSTRUCT_PARETO_FRONT
+        ------------------------------------------------------------------------
+        This function is used to construct the pareto front of the key bound of
+        the undominated points. In UPDATE mode pareto_points are the bounds
+        themselves
+        ------------------------------------------------------------------------
         """
-
-        pess_pareto = list()
-        indices_map = {}
-        for point in xrange(len(pareto_points)):
-            indices_map[point] = pareto_points_ind[point]
-            pess_pareto.append(pareto_points[point]["pes"])
-
-        # sort along object1 in descending order
-        sorted_pess_ind = sorted(range(len(pess_pareto)),
-                        key = lambda k: pess_pareto[k][self.O1_IND])[::-1]
-
-        #-----------------------------------------------------------------------
-        # pessimistic Pareto Front Computation
-        #-----------------------------------------------------------------------
-        pess_o2 = [pess_pareto[i][self.O2_IND] for i in sorted_pess_ind]
-        i = 0
-        max_val = []
-        orig = []
-        sampled_pess_pareto_ind = []
-        while i < len(pess_o2):
-            cur = pess_o2[i]
-            sampled_pess_pareto_ind.append(i)
-            orig.append(i)
-
-            for j in xrange(i+1, len(pess_o2)):
-                if cur >= pess_o2[j]:
-                    sampled_pess_pareto_ind.append(i)
-                    max_val.append(j)
-                    orig.append(j)
-            if len(max_val) != 0:
-               i = np.max(max_val) + 1
-               max_val = []
-            else:
-               i = i+1
-        sampled_pess_pareto = [[pess_o2[sampled_pess_pareto_ind[i]],
-                                pess_pareto[i][self.O1_IND]]
-                                for i in xrange(len(orig))]
-        return sampled_pess_pareto
-
-    def construct_opt_pareto_front(
-                                   self,
-                                   pareto_points_ind,
-                                   pareto_points):
-        """This function is used to construct optimistic pareto front using the
-        undom points"""
-
-        opt_pareto = list()
-        indices_map = {}
-        for point in xrange(len(pareto_points)):
-            indices_map[point] = pareto_points_ind[point]
-            opt_pareto.append(pareto_points[point]["opt"])
-
-        # sort along object1 in descending order
-        sorted_opt_ind = sorted(range(len(opt_pareto)),
-                       key = lambda k: opt_pareto[k][self.O1_IND])[::-1]
-        #-----------------------------------------------------------------------
-        # optimistic Pareto Front Computation
-        #-----------------------------------------------------------------------
-        # sample optimistic pareto points
-        cur = opt_pareto[sorted_opt_ind[0]]
-        # initialize
-        sampled_opt_pareto_ind = [sorted_opt_ind[0]]
-        sampled_opt_pareto = [cur]
-        for ind in xrange(1, len(sorted_opt_ind)):
-            next = opt_pareto[sorted_opt_ind[ind]]
-            if next[self.O2_IND] >= cur[self.O2_IND]:
-                sampled_opt_pareto_ind.append(sorted_opt_ind[ind])
-                sampled_opt_pareto.append(next)
-            cur = opt_pareto[sorted_opt_ind[ind]]
-
-
-        return sampled_opt_pareto
-
-    def identify_undom_points(
-                              self,
-                              region):
-        """This function is used to determine the dom points that will be
-        included in the pessimistic and optimistic pareto front.
+        if mode=="CONSTRUCT":
+            points=[point[key] for point in pareto_points]
+        if mode=="UPDATE":
+            points=pareto_points
+        keep=self.get_nondominated(points)
+        front=[list(points[i]) for i in keep]
+        if mode=="CONSTRUCT":
+            indices_map={pos: pareto_points_ind[i] for pos, i in enumerate(keep)}
+            return (front,
+                    indices_map)
+        if mode=="UPDATE":
+            return front
+
+    def construct_pessimistic_pareto_front(self,
+                               pareto_points_ind,
+                               pareto_points,
+                               mode):
+        """@CONSTRUCT_PESSIMISTIC_PARETO_FRONT
+        ------------------------------------------------------------------------
+        This function is used to construct pessimistic pareto front using the
+        undominated points
+        ------------------------------------------------------------------------
         """
-        dom_points_ind = list()
-        pes_pareto, opt_pareto = list(), list()
-        undom_points_ind = [i for i in xrange(len(region))]
-
-        for i in undom_points_ind:
-            # if the current config is not dom
-            if i != -1:
-                cur = region[i]
-                for j in undom_points_ind :
-                    # check only undom configs other than current
-                    if (j != i or j !=-1):
-                        # check if current config is dom
-                        if (region[j]["pes"][self.O1_IND] >= cur["opt"][self.O1_IND] and
-                           region[j]["pes"][self.O2_IND] >= cur["opt"][self.O2_IND]):
-                           # append the current config to dom
-                            dom_points_ind.append(i)
-                            undom_points_ind[i] = -1
-
-                        # check if current config dominates
-                        if (region[j]["opt"][self.O1_IND] < cur["pes"][self.O1_IND] and
-                           region[j]["opt"][self.O2_IND] < cur["pes"][self.O2_IND]):
-                           # append the config that is dom by current to dom
-                            dom_points_ind.append(j)
-                            undom_points_ind[j] = -1
-
-        # TODO: dom points indices multiple occurence issue
-        undom_points_ind = [i for i in undom_points_ind if i not in (-1, -1)]
-        undom_points = [region[i] for i in undom_points_ind]
-
-        return (
-                undom_points_ind,
-                undom_points)
-
-    def compute_improvement_per_cost(self):
-        """This function is used to compute improvement per cost"""
-        print "Improvement/Cost"
+        return self.construct_pareto_front(pareto_points_ind, pareto_points,
+                                           "pes", mode)
+
+    def construct_optimistic_pareto_front(self,
+                                          pareto_points_ind,
+                                          pareto_points,
+                                          mode):
+        """@CONSTRUCT_OPTIMISTIC_PARETO_FRONT
+        ------------------------------------------------------------------------
+        This function is used to construct optimistic pareto front using the
+        undominated points
+        ------------------------------------------------------------------------
+        """
+        return self.construct_pareto_front(pareto_points_ind, pareto_points,
+                                           "opt", mode)
+
+    def get_dominated(self, front,
+                      points):
+        """@GET_DOMINATED
+        ------------------------------------------------------------------------
+        This function is used to check which points are dominated by a front.
+        With two objectives the front is sorted by o1 descending. A point is
+        dominated if the best o2 of the front points with o1 at least as good
+        is better, or the best o2 of the front points with a better o1 is at
+        least as good; both prefixes are found by binary search. More
+        objectives are checked by the dominance kernel
+        ------------------------------------------------------------------------
+        """
+        front=np.asarray(front, dtype=float).reshape(len(front), -1)
+        points=np.asarray(points, dtype=float).reshape(len(points), -1)
+        if len(front)==0 or len(points)==0:
+            return np.zeros(len(points), dtype=bool)
+        if front.shape[1]==2:
+            front=front[np.argsort(-front[:, 0], kind="stable")]
+            best=np.r_[-np.inf, np.maximum.accumulate(front[:, 1])]
+            # number of front points with o1 at least as good and better
+            weak=np.searchsorted(-front[:, 0], -points[:, 0], side="right")
+            strict=np.searchsorted(-front[:, 0], -points[:, 0], side="left")
+            return (best[weak]>points[:, 1]) | (best[strict]>=points[:, 1])
+        return kernels.dominated_mask(front, points)
+
+    def identify_undominated_points(self,
+                             region,
+                             indices=None):
+        """@IDENTIFY_UNDOMINATED_POINTS
+        ------------------------------------------------------------------------
+        This function is used to determine the dominated points that will be
+        included in the pessimistic and optimistic pareto front. A config is
+        dominated if the pessimistic bound of another config dominates its
+        optimistic bound; only the pessimistic pareto front has to be checked.
+        Returned indices are positions in region or, if given, the indices of
+        the regions
+        ------------------------------------------------------------------------
+        """
+        if len(region)==0:
+            return ([], [])
+        pes=np.array([point["pes"] for point in region], dtype=float)
+        opt=np.array([point["opt"] for point in region], dtype=float)
+        dominated=self.get_dominated(pes[self.get_nondominated(pes)], opt)
+        undominated_points_ind=np.flatnonzero(~dominated).tolist()
+        undominated_points=[region[i] for i in undominated_points_ind]
+        if indices is not None:
+            undominated_points_ind=[indices[i] for i in undominated_points_ind]
+
+        return (undominated_points_ind,
+                undominated_points)
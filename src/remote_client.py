@@ -0,0 +1,283 @@
+"""-----------------------------------------------------------------------------
+@Name: Flexible Bayesian Optimization (FlexiBO): An active learning for optimiz-
+ing  multiple objectives of different cost
+@Version: 0.1
+@Author: Shahriar Iqbal
+--------------------------------------------------------------------------------
+"""
+import os
+import time
+import signal
+import shutil
+import select
+import atexit
+import threading
+import subprocess
+from contextlib import contextmanager
+
+class SSHTransport(object):
+    """This class is used to keep one authenticated ssh session and its sftp
+    channel alive across remote training runs
+    """
+    def __init__(self, host, user, passwd, keyfile,
+                 port=22, keepalive=30):
+        self.host=host
+        self.user=user
+        self.passwd=passwd
+        self.keyfile=keyfile
+        self.port=port
+        self.keepalive=keepalive
+        self.ssh_client=None
+        self.ftp_client=None
+
+    def connect(self):
+        """This function is used to authenticate once and open the sftp channel
+        """
+        import paramiko
+        key=paramiko.RSAKey.from_private_key_file(self.keyfile)
+        self.ssh_client=paramiko.SSHClient()
+        self.ssh_client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+        self.ssh_client.connect(hostname=self.host, port=self.port, username=self.user,
+                                password=self.passwd, pkey=key)
+        self.ssh_client.get_transport().set_keepalive(self.keepalive)
+        self.ftp_client=self.ssh_client.open_sftp()
+
+    def is_active(self):
+        """This function is used to check whether the session can be reused
+        """
+        if self.ssh_client is None:
+            return False
+        transport=self.ssh_client.get_transport()
+        return transport is not None and transport.is_active()
+
+    def run(self, command, timeout=None,
+            callback=None):
+        """This function is used to run a command and stream its output
+        ------------------------------------------------------------------------
+        @args:
+            command: shell command to run on the remote host
+            timeout: seconds after which the command is abandoned
+            callback: called with every output line as soon as it arrives
+        @returns:
+            (status, lines): exit status (-1 on timeout) and output lines
+        ------------------------------------------------------------------------
+        """
+        chan=self.ssh_client.get_transport().open_session()
+        chan.set_combine_stderr(True)
+        chan.exec_command(command)
+        deadline=None if timeout is None else time.time()+timeout
+        lines=list()
+        buf=b""
+        while True:
+            ready, _, _=select.select([chan], [], [], 0.1)
+            if ready or chan.recv_ready():
+                data=chan.recv(4096)
+                if not data:
+                    if chan.exit_status_ready():
+                        break
+                    # eof arrived before the exit status; the channel stays
+                    # readable, so wait for the status instead of spinning
+                    chan.status_event.wait(0.1)
+                buf+=data
+                while b"\n" in buf:
+                    line, buf=buf.split(b"\n", 1)
+                    self.emit(line, lines, callback)
+            elif chan.exit_status_ready():
+                break
+            if deadline is not None and time.time()>deadline:
+                chan.close()
+                print ("[ERROR]: remote command timed out after {0}s".format(timeout))
+                return (-1, lines)
+        if buf:
+            self.emit(buf, lines, callback)
+        return (chan.recv_exit_status(), lines)
+
+    def emit(self, line, lines, callback):
+        """This function is used to decode one output line and hand it over
+        """
+        line=line.decode("utf-8", "replace").rstrip("\r")
+        lines.append(line)
+        if callback is not None:
+            callback(line)
+
+    def put(self, local_path, remote_path):
+        """This function is used to upload a file over the shared sftp channel
+        """
+        self.ftp_client.put(local_path, remote_path)
+
+    def get(self, remote_path, local_path):
+        """This function is used to download a file over the shared sftp channel
+        """
+        self.ftp_client.get(remote_path, local_path)
+
+    def open(self, remote_path, mode="rb"):
+        """This function is used to open a remote file for streaming
+        """
+        return self.ftp_client.open(remote_path, mode)
+
+    def close(self):
+        """This function is used to tear down the sftp channel and session
+        """
+        try:
+            if self.ftp_client is not None:
+                self.ftp_client.close()
+            if self.ssh_client is not None:
+                self.ssh_client.close()
+        finally:
+            self.ftp_client=None
+            self.ssh_client=None
+
+class LocalTransport(object):
+    """This class is used to run remote training jobs as local subprocesses. It
+    exposes the same interface as SSHTransport so the pool can be exercised
+    without an ssh server
+    """
+    def __init__(self, workdir=None):
+        self.workdir=workdir
+        self.active=False
+
+    def connect(self):
+        """This function is used to mark the transport as usable
+        """
+        self.active=True
+
+    def is_active(self):
+        """This function is used to check whether the transport can be reused
+        """
+        return self.active
+
+    def run(self, command, timeout=None,
+            callback=None):
+        """This function is used to run a command and stream its output
+        ------------------------------------------------------------------------
+        @args:
+            command: shell command to run locally
+            timeout: seconds after which the command is killed
+            callback: called with every output line as soon as it arrives
+        @returns:
+            (status, lines): exit status (-1 on timeout) and output lines
+        ------------------------------------------------------------------------
+        """
+        proc=subprocess.Popen(command, shell=True, cwd=self.workdir,
+                              stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                              start_new_session=True)
+        lines=list()
+
+        def reader():
+            for line in proc.stdout:
+                line=line.decode("utf-8", "replace").rstrip("\r\n")
+                lines.append(line)
+                if callback is not None:
+                    callback(line)
+
+        thread=threading.Thread(target=reader)
+        thread.daemon=True
+        thread.start()
+        try:
+            status=proc.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            # kill the whole process group so no child keeps the pipe open
+            os.killpg(proc.pid, signal.SIGKILL)
+            proc.wait()
+            print ("[ERROR]: local command timed out after {0}s".format(timeout))
+            status=-1
+        thread.join()
+        return (status, lines)
+
+    def put(self, local_path, remote_path):
+        """This function is used to copy a file to the job location
+        """
+        shutil.copyfile(local_path, remote_path)
+
+    def get(self, remote_path, local_path):
+        """This function is used to copy a file from the job location
+        """
+        shutil.copyfile(remote_path, local_path)
+
+    def open(self, remote_path, mode="rb"):
+        """This function is used to open a job file for streaming
+        """
+        return open(remote_path, mode)
+
+    def close(self):
+        """This function is used to mark the transport as closed
+        """
+        self.active=False
+
+class RemoteClientPool(object):
+    """This class is used to pool authenticated transports per remote host so
+    that every accuracy evaluation does not pay for key loading, handshake and
+    sftp setup again
+    """
+    def __init__(self, max_idle=4):
+        self.max_idle=max_idle
+        self.lock=threading.Lock()
+        self.idle={}
+
+    def get_key(self, remote):
+        """This function is used to compute the pool key of a remote entry
+        """
+        return (remote.get("transport", "ssh"), remote.get("host"),
+                remote.get("user"), remote.get("port", 22))
+
+    def create(self, remote):
+        """This function is used to create and connect a new transport
+        """
+        if remote.get("transport", "ssh")=="local":
+            transport=LocalTransport(remote.get("workdir"))
+        else:
+            transport=SSHTransport(remote["host"], remote["user"],
+                                   remote.get("pass"), remote["keyfile"],
+                                   remote.get("port", 22),
+                                   remote.get("keepalive", 30))
+        transport.connect()
+        return transport
+
+    def acquire(self, remote):
+        """This function is used to get an idle live transport or a new one
+        """
+        key=self.get_key(remote)
+        with self.lock:
+            idle=self.idle.setdefault(key, [])
+            while idle:
+                transport=idle.pop()
+                if transport.is_active():
+                    return transport
+                transport.close()
+        return self.create(remote)
+
+    def release(self, remote, transport):
+        """This function is used to return a transport to the pool
+        """
+        key=self.get_key(remote)
+        with self.lock:
+            idle=self.idle.setdefault(key, [])
+            if transport.is_active() and len(idle)<self.max_idle:
+                idle.append(transport)
+                return
+        transport.close()
+
+    @contextmanager
+    def session(self, remote):
+        """This function is used to borrow a transport for a block of work. A
+        transport that raised is dropped instead of being returned to the pool
+        """
+        transport=self.acquire(remote)
+        try:
+            yield transport
+        except Exception:
+            transport.close()
+            raise
+        self.release(remote, transport)
+
+    def close_all(self):
+        """This function is used to close every pooled transport
+        """
+        with self.lock:
+            for idle in self.idle.values():
+                for transport in idle:
+                    transport.close()
+            self.idle={}
+
+POOL=RemoteClientPool()
+atexit.register(POOL.close_all)
@@ -6,22 +6,83 @@ ing  multiple objectives of different cost
 --------------------------------------------------------------------------------
 """
 from __future__ import division
-from src.utils import Utils
+from src.pareto import Pareto
+from src import kernels
 import numpy as np
 
 class Sampling(object):
     """This class is used to determine next sample and objective
     """
-    def __init__(self, o1_ind, o2_ind,
-                o1_cost, o2_cost):
-         print ("[STATUS]: Initializing Sample Class") 
-         self.O1_IND=o1_ind
-         self.O2_IND=o2_ind
-         self.NUM_OBJ=2
-         self.O1_COST=o1_cost
-         self.O2_COST=o2_cost    
-         self.utils=Utils(o1_ind, o2_ind)
-         
+    def __init__(self, objectives, costs,
+                 pareto=None):
+         print ("[STATUS]: Initializing Sample Class")
+         self.objectives=objectives
+         self.NUM_OBJ=len(objectives)
+         self.costs=costs
+         self.pareto=pareto if pareto is not None else Pareto(self.NUM_OBJ)
+
+    def get_cost(self, index, objective,
+                 fidelity):
+        """@GET_COST
+        ------------------------------------------------------------------------
+        This function is used to get the evaluation cost of an objective of a
+        config
+        ------------------------------------------------------------------------
+        """
+        cost=self.costs[objective]
+        if not np.isscalar(cost):
+            cost=cost[index]
+        if fidelity is not None and fidelity.objective==objective:
+            cost=fidelity.get_cost(index, cost)
+        return cost
+
+    def set_costs(self, costs):
+        """@SET_COSTS
+        ------------------------------------------------------------------------
+        This function is used to set the cost of each objective, either one
+        cost or the predicted cost of every config
+        ------------------------------------------------------------------------
+        """
+        self.costs=costs
+
+    def get_shrunk_volumes(self, front, volume,
+                           upper, tasks):
+        """@GET_SHRUNK_VOLUMES
+        ------------------------------------------------------------------------
+        This function is used to get the volume of a pareto front and its
+        volume after, for every task (pos, j, value), bound j of the point at
+        pos is replaced by value. Exact fronts of two or three objectives are
+        swept for all tasks at once by the volume kernel. Monte carlo volumes are computed on
+        the samples of the box shared by both fronts, and a replaced point only
+        has to be checked against the samples no other point dominates
+        ------------------------------------------------------------------------
+        """
+        if len(tasks)==0 or len(front)==0:
+            return (volume, np.zeros(len(tasks)))
+        (positions, objectives, values)=zip(*tasks)
+        if self.NUM_OBJ in (2, 3) and self.NUM_OBJ<=self.pareto.EXACT_MAX_OBJ:
+            return (volume, kernels.shrunk_volumes(front, positions,
+                                                   objectives, values))
+        if self.NUM_OBJ<=self.pareto.EXACT_MAX_OBJ:
+            volumes=[]
+            for (pos, j, value) in tasks:
+                cur_front=[list(point) for point in front]
+                cur_front[pos][j]=value
+                volumes.append(self.pareto.compute_pareto_volume(cur_front))
+            return (volume, np.array(volumes))
+        P=np.maximum(np.asarray(front, dtype=float), 0)
+        samples=self.pareto.get_mc_samples(upper)
+        dominance=self.pareto.compute_dominance(P, samples)
+        count=dominance.sum(axis=1)
+        box_volume=float(np.prod(upper))
+        volumes=[]
+        for (pos, j, value) in tasks:
+            point=P[pos].copy()
+            point[j]=max(value, 0)
+            covered=(count-dominance[:, pos]>0) | np.all(point>=samples, axis=1)
+            volumes.append(float(np.mean(covered))*box_volume)
+        return (float(np.mean(count>0))*box_volume, np.array(volumes))
+
     def determine_next_sample(self,
                              pess_pareto,
                              opt_pareto,
@@ -30,120 +91,73 @@ class Sampling(object):
                              pess_pareto_volume,
                              opt_pareto_volume,
                              REGION,
-                             E):
+                             E,
+                             fidelity=None):
         """@DETERMINE_NEXT_SAMPLE
         ------------------------------------------------------------------------
-        This function is used to determine next sample
+        This function is used to determine next sample. For every config on the
+        pessimistic or optimistic pareto front and every objective the bounds
+        of the config are shrunk to the mean and the change of the volume
+        between the fronts is divided by the cost of evaluating the objective.
+        With a fidelity schedule the cost of its objective is the cost of the
+        fidelity the config would be evaluated at next. REGION maps the
+        candidate configs to their regions
+        ------------------------------------------------------------------------
+        @returns:
+            (index, config, objective) of the next sample, or (None, None,
+            None) when every objective of every config on the fronts is
+            measured
         ------------------------------------------------------------------------
         """
-        if pess_indices_map==opt_indices_map:
-            indices_map=pess_indices_map
-        pess_ind=[indices_map[i] for i in range(0,len(pess_pareto))]
-        opt_ind=[indices_map[i] for i in range(0,len(opt_pareto))]
-        
-        pess_status=[[{"pess":True,"opt":True}] if i in opt_ind else [{"pess":True,"opt":False}] for i in pess_ind]
-        opt_status=[[{"pess":True,"opt":True}] if i in pess_ind else [{"pess":False,"opt":True}] for i in opt_ind]
-        
-        #-----------------------------------------------------------------------
-        # compute dv/c for each point in pessimistic pareto front
-        #-----------------------------------------------------------------------
-        dv_per_cost_pess=[{"o1":0,"o2":0} for i in pess_ind]
-        for i in range(0,len(pess_pareto)):                   
-             for j in range(0,self.NUM_OBJ):
-                 # Update pessimistic pareto front shring pess to avg  
-                 if pess_status[i][0]["pess"] is True:    
-                     cur_pess=pess_pareto[:]
-                     # replace pess with avg value across O1
-                     cur_pess[i][j]=REGION[pess_ind[i]]["avg"][j]
-                     cur_pess_pareto=self.utils.construct_pessimistic_pareto_front(pess_ind,
-                                                                              cur_pess,
-                                                                              "UPDATE")
-                     cur_pess_volume=self.utils.compute_pareto_volume(cur_pess_pareto)
-                 
-                 # Update optimistic pareto front shring pess to avg
-                 if pess_status[i][0]["opt"] is True: 
-                     cur_opt=opt_pareto[:]
-                     opt_i=opt_ind.index(pess_ind[i])
-                     # replace opt with avg value across O1
-                     cur_opt[opt_i][j]=REGION[opt_ind[i]]["avg"][j]
-                     cur_opt_pareto=self.utils.construct_optimistic_pareto_front(opt_ind,
-                                                                                 cur_opt,
-                                                                                 "UPDATE")
-                     cur_opt_volume=self.utils.compute_pareto_volume(cur_opt_pareto)
-                 
-                 # Shrinking of pessimistic pareto points do not change optimistic
-                 # pareto front
-                 if pess_status[i][0]["opt"] is False:
-                     cur_opt_volume=opt_pareto_volume
-                 
-                 dv=(opt_pareto_volume-pess_pareto_volume)-(cur_opt_volume-cur_pess_volume)
-                 if j==self.O1_IND:
-                     dv_per_cost_pess[i]["o1"]=dv/self.O1_COST
-                 if j==self.O2_IND:
-                     dv_per_cost_pess[i]["o2"]=dv/self.O2_COST
-        #-----------------------------------------------------------------------
-        # compute dv/c for each point in optimistic pareto front
-        #-----------------------------------------------------------------------
-        dv_per_cost_opt=[{"o1":0,"o2":0} for i in opt_ind]
-        for i in range(0,len(opt_pareto)):                   
-             for j in range(0,self.NUM_OBJ):
-                 # Update optimistic pareto front shring opt to avg. Similar points
-                 # both in pess and opt pareto fronts are already covered in
-                 # pessimistic pareto front update computation         
-                 if (opt_status[i][0]["opt"] is True and 
-                     opt_status[i][0]["opt"] is False):
-                     
-                     cur_opt=opt_pareto[:]
-                     # replace pess with avg value across O1
-                     cur_opt[i][j]=REGION[opt_ind[i]]["avg"][j]
-                     cur_opt_pareto=self.utils.construct_optimistic_pareto_front(opt_ind,
-                                                                              cur_opt,
-                                                                              "UPDATE")
-                     cur_opt_volume=self.utils.compute_pareto_volume(cur_opt_pareto)
-                     # Shrinking of optimistic pareto points do not change pessimistic
-                     # pareto front
-                     cur_pess_volume=pess_pareto_volume
-                 
-                 # Compute dv per cost for each objective
-                 dv=(opt_pareto_volume-pess_pareto_volume)-(cur_opt_volume-cur_pess_volume)
-                 if j==self.O1_IND:
-                     dv_per_cost_opt[i]["o1"]=dv/self.O1_COST
-                 if j==self.O2_IND:
-                     dv_per_cost_opt[i]["o2"]=dv/self.O2_COST         
-        #-----------------------------------------------------------------------
-        # Compute max dv per cost to determine the next sample and objective
-        #-----------------------------------------------------------------------
-        max_dv_per_cost=0
-        objective="o1"
-        
-        # Compute max dv per cost from pessimistic pareto points      
-        for i in range(0,len(dv_per_cost_pess)):
-            if abs(dv_per_cost_pess[i]["o1"])>=max_dv_per_cost:
-                max_dv_per_cost_ind=i
-                max_dv_per_cost=abs(dv_per_cost_pess[i]["o1"])
-                objective="o1"
-            if abs(dv_per_cost_pess[i]["o2"])>=max_dv_per_cost:
-                max_dv_per_cost_ind=i
-                max_dv_per_cost=abs(dv_per_cost_pess[i]["o2"])
-                objective="o2"
-        cur_dv_per_cost_ind=indices_map[max_dv_per_cost_ind]
-        
-        # Compute max dv per cost from optimistic pareto points
-        for i in range(0,len(dv_per_cost_opt)):
-            if abs(dv_per_cost_opt[i]["o1"])>=max_dv_per_cost:
-                max_dv_per_cost_ind=i
-                max_dv_per_cost=abs(dv_per_cost_pess[i]["o1"])
-                objective="o1"
-            if abs(dv_per_cost_opt[i]["o2"])>=max_dv_per_cost:
-                max_dv_per_cost_ind=i
-                max_dv_per_cost=abs(dv_per_cost_pess[i]["o2"])
-                objective="o2"
-        
-        # Compute next sample
-        cur_dv_per_cost_ind=indices_map[max_dv_per_cost_ind]
-        
-        next_sample=E[cur_dv_per_cost_ind]
-        return (cur_dv_per_cost_ind,
-                next_sample, 
+        # position of each config on the fronts
+        pess_pos={pess_indices_map[i]: i for i in range(0,len(pess_pareto))}
+        opt_pos={opt_indices_map[i]: i for i in range(0,len(opt_pareto))}
+        candidates=list(pess_pos)+[i for i in opt_pos if i not in pess_pos]
+        # measured objectives have no uncertainty left to shrink
+        tasks=[(index, j) for index in candidates
+               for j in range(0, self.NUM_OBJ)
+               if REGION[index]["pes"][j]!=REGION[index]["opt"][j]]
+        if not tasks:
+            return (None, None, None)
+        # optimistic bounds bound every point of both fronts
+        bounds=opt_pareto if len(opt_pareto) else pess_pareto
+        upper=np.max(np.maximum(np.asarray(bounds, dtype=float), 0), axis=0)
+        pess_tasks=[(pess_pos[index], j, REGION[index]["avg"][j])
+                    for (index, j) in tasks if index in pess_pos]
+        opt_tasks=[(opt_pos[index], j, REGION[index]["avg"][j])
+                   for (index, j) in tasks if index in opt_pos]
+        (pess_pareto_volume,
+        shrunk_pess_volumes)=self.get_shrunk_volumes(pess_pareto, pess_pareto_volume,
+                                                     upper, pess_tasks)
+        (opt_pareto_volume,
+        shrunk_opt_volumes)=self.get_shrunk_volumes(opt_pareto, opt_pareto_volume,
+                                                    upper, opt_tasks)
+
+        volume_of_pareto_front=opt_pareto_volume-pess_pareto_volume
+        max_dv_per_cost=-1
+        (next_sample_index, objective)=(tasks[0][0], self.objectives[tasks[0][1]])
+        (pess_task, opt_task)=(0, 0)
+        for (index, j) in tasks:
+            cur_objective=self.objectives[j]
+            cur_pess_volume=pess_pareto_volume
+            cur_opt_volume=opt_pareto_volume
+            if index in pess_pos:
+                cur_pess_volume=shrunk_pess_volumes[pess_task]
+                pess_task+=1
+            if index in opt_pos:
+                cur_opt_volume=shrunk_opt_volumes[opt_task]
+                opt_task+=1
+            dv=volume_of_pareto_front-(cur_opt_volume-cur_pess_volume)
+            # volume a config may add is discounted by its chance to be
+            # feasible
+            dv_per_cost=(abs(dv)*REGION[index].get("feasible", 1.0)/
+                         self.get_cost(index, cur_objective, fidelity))
+            if dv_per_cost>=max_dv_per_cost:
+                max_dv_per_cost=dv_per_cost
+                next_sample_index=index
+                objective=cur_objective
+
+        next_sample=E[next_sample_index]
+        return (next_sample_index,
+                next_sample,
                 objective)
-        
@@ -0,0 +1,101 @@
+"""-----------------------------------------------------------------------------
+@Name: Flexible Bayesian Optimization (FlexiBO): An active learning for optimiz-
+ing  multiple objectives of different cost
+@Version: 0.1
+@Author: Shahriar Iqbal
+--------------------------------------------------------------------------------
+"""
+import math
+
+class BetaSchedule(object):
+    """This class is used to scale the uncertainty regions over iterations. The
+    gp-ucb schedule beta_t=2log(|E|t^2pi^2/(6delta)) widens the regions slowly
+    as more configs are measured, so that the fronts stay confident with
+    probability 1-delta; fixed keeps beta constant
+    """
+    def __init__(self, schedule, num_configs,
+                 value=1.0, delta=0.1, scale=1.0):
+        print ("[STATUS]: Initializing BetaSchedule Class")
+        if schedule not in ("fixed", "gp-ucb"):
+            print ("[ERROR]: beta schedule {0} not supported, using fixed".format(schedule))
+            schedule="fixed"
+        self.schedule=schedule
+        self.num_configs=num_configs
+        self.value=value
+        self.delta=delta
+        self.scale=scale
+
+    def get_beta(self, iteration):
+        """This function is used to get beta of an iteration
+        """
+        if self.schedule=="fixed":
+            return self.value
+        t=iteration+1
+        return self.scale*2*math.log(self.num_configs*t**2*math.pi**2/(6*self.delta))
+
+class StoppingRules(object):
+    """This class is used to end the bo loop once further measurements stop
+    paying off: the volume between the optimistic and pessimistic fronts is a
+    small fraction of the optimistic volume, the pessimistic front has not
+    changed for patience iterations or the evaluation cost budget is spent.
+    The cost budget is a hard cap checked every iteration; the convergence
+    rules are checked after min_iter iterations. A rule set to None is not
+    checked
+    """
+    def __init__(self, min_iter=0, volume_gap=None,
+                 patience=None, cost_budget=None):
+        print ("[STATUS]: Initializing StoppingRules Class")
+        self.min_iter=min_iter
+        self.volume_gap=volume_gap
+        self.patience=patience
+        self.cost_budget=cost_budget
+        self.front=None
+        self.unchanged=0
+
+    def get_state(self):
+        """This function is used to get the counters of the rules; the limits
+        are not part of the state
+        """
+        return {"front":self.front,
+                "unchanged":self.unchanged}
+
+    def set_state(self, state):
+        """This function is used to restore the counters of the rules, keeping
+        the limits the rules were built with. Checkpoints of older versions
+        kept the rules themselves
+        """
+        if isinstance(state, StoppingRules):
+            state=state.get_state()
+        self.front=state["front"]
+        self.unchanged=state["unchanged"]
+
+    def update(self, iteration, front,
+               pess_pareto_volume, opt_pareto_volume,
+               cost_spent):
+        """This function is used to check the rules after the fronts of an
+        iteration are computed
+        ------------------------------------------------------------------------
+        @args:
+            iteration: iteration of the bo loop
+            front: config indices of the pessimistic pareto front
+            pess_pareto_volume: volume of the pessimistic pareto front
+            opt_pareto_volume: volume of the optimistic pareto front
+            cost_spent: cost of the evaluations so far
+        @returns:
+            reason to stop or None to go on
+        ------------------------------------------------------------------------
+        """
+        front=frozenset(front)
+        self.unchanged=self.unchanged+1 if front==self.front else 0
+        self.front=front
+        if self.cost_budget is not None and cost_spent>=self.cost_budget:
+            return "cost budget {0} spent".format(self.cost_budget)
+        if iteration<self.min_iter:
+            return None
+        gap=opt_pareto_volume-pess_pareto_volume
+        if (self.volume_gap is not None and opt_pareto_volume>0 and
+            gap<=self.volume_gap*opt_pareto_volume):
+            return "volume gap {0:.4g} below {1} of the optimistic volume".format(gap, self.volume_gap)
+        if self.patience is not None and self.unchanged>=self.patience:
+            return "pareto front unchanged for {0} iterations".format(self.unchanged)
+        return None
@@ -1,10 +1,13 @@
 import numpy as np
-from sklearn.gaussian_process import GaussianProcessRegressor 
-from sklearn.gaussian_process.kernels import ConstantKernel, RBF
-from sklearn.ensemble import RandomForestRegressor
-from skopt.space import Real, Integer
-from skopt.utils import use_named_args
-from skopt import gp_minimize
+
+# hyperparameters tuned for each surrogate: (real, low, high, prior),
+# (integer, low, high) or (categorical, values)
+SPACES={"GP":{"alpha":("real", 1e-10, 1e-1, "log-uniform"),
+              "normalize_y":("categorical", (False, True))},
+        "RF":{"n_estimators":("integer", 10, 200),
+              "max_depth":("integer", 2, 32),
+              "min_samples_leaf":("integer", 1, 10),
+              "max_features":("real", 0.1, 1.0, "uniform")}}
 
 class GPSurrogateModel:
     """This class is used for GP surrogate models 
@@ -15,7 +18,8 @@ class GPSurrogateModel:
     def fit_gp(self):
         """This function is used to fit GP into data
         """
-        
+        from sklearn.gaussian_process import GaussianProcessRegressor
+        from sklearn.gaussian_process.kernels import ConstantKernel, RBF
         rbf=ConstantKernel(1.0)*RBF(length_scale=1.0)
         gpr1=GaussianProcessRegressor(kernel=rbf, n_restarts_optimizer=9)
         gpr2=GaussianProcessRegressor(kernel=rbf, n_restarts_optimizer=9)
@@ -37,6 +41,7 @@ class RFSurrogateModel:
     def fit_rf(self):
         """This function is used to fit RF into data
         """
+        from sklearn.ensemble import RandomForestRegressor
         rf1=RandomForestRegressor()
         rf2=RandomForestRegressor()
         return rf1, rf2 
@@ -50,21 +55,122 @@ class RFSurrogateModel:
         return mu, sigma 
 
 class TuneSurrogateHyperparams:
-    """This class is used to tune hyperparameters of the surrogate models 
+    """This class is used to tune hyperparameters of the surrogate models.
+    Folds of the cross validation run in parallel; scores are cached within
+    one tuning, where gp_minimize may propose the same hyperparameters again.
+    An objective is tuned again only once its training data has grown by
+    retune_fraction
     """
-    def __init__(self):
+    def __init__(self, n_calls=20, folds=5,
+                 n_jobs=-1, retune_fraction=0.5,
+                 min_samples=10, seed=0):
         print ("[STATUS]: Initializing TuneSurrogateHyperparams class")
-    
-    def tune_params(self, space, model, 
-                   x, y):
+        self.n_calls=n_calls
+        self.folds=folds
+        self.n_jobs=n_jobs
+        self.retune_fraction=retune_fraction
+        self.min_samples=min_samples
+        self.seed=seed
+        # fold scores of the current tuning by hyperparameters
+        self.cache={}
+        # best hyperparameters of each objective and the number of samples
+        # they were tuned on
+        self.tuned={}
+
+    def get_space(self, name):
+        """This function is used to get the search space of a surrogate
+        """
+        from skopt.space import Real, Integer, Categorical
+        space=[]
+        for param, (kind, *bounds) in SPACES[name].items():
+            if kind=="real":
+                space.append(Real(bounds[0], bounds[1], prior=bounds[2], name=param))
+            elif kind=="integer":
+                space.append(Integer(bounds[0], bounds[1], name=param))
+            else:
+                space.append(Categorical(bounds[0], name=param))
+        return space
+
+    def get_params(self, objective, name,
+                   model, x, y):
+        """This function is used to get the hyperparameters of the surrogate
+        of an objective, tuning them again if enough data has arrived
+        ------------------------------------------------------------------------
+        @args:
+            objective: objective the surrogate models
+            name: GP or RF
+            model: unfitted surrogate
+            x, y: training data
+        @returns:
+            dict of hyperparameters, empty while there is too little data
+        ------------------------------------------------------------------------
+        """
+        tuned=self.tuned.get(objective)
+        if len(y)<self.min_samples:
+            return {}
+        if tuned is not None and len(y)<tuned["num_samples"]*(1+self.retune_fraction):
+            return tuned["params"]
+        space=self.get_space(name)
+        x0=None if tuned is None else [tuned["params"][d.name] for d in space]
+        res=self.tune_params(space, model, x, y, name, x0)
+        params={d.name: self.get_value(v) for d, v in zip(space, res.x)}
+        print ("[STATUS]: tuned {0} of {1} on {2} samples: {3}".format(
+               name, objective, len(y), params))
+        self.tuned[objective]={"params":params, "num_samples":len(y)}
+        return params
+
+    def get_value(self, value):
+        """This function is used to convert a numpy scalar chosen by the
+        optimizer to a python value
+        """
+        return value.item() if hasattr(value, "item") else value
+
+    def tune_params(self, space, model,
+                    x, y, name="",
+                    x0=None):
         """This function is used to perform the auto tuning
+        @returns:
+            result of gp_minimize
         """
-        
+        from skopt.utils import use_named_args
+        from skopt import gp_minimize
+
+        x=np.asarray(x, dtype=float)
+        y=np.asarray(y, dtype=float)
+        # scores of another tuning were computed on other data
+        self.cache={}
+
         @use_named_args(space)
         def objective(**params):
-            reg.set_params(**params)
-            return -np.mean(cross_val_score(model, x, y, 
-                                            cv=5, n_jobs=-1, scoring="neg_mean_absolute_error"))
+            return float(np.mean(self.cross_validate(model, params, x, y)))
 
-        res = gp_minimize(objective, space, n_calls=50, random_state=0)
-        return res 
\ No newline at end of file
+        return gp_minimize(objective, space, n_calls=self.n_calls, x0=x0,
+                           n_initial_points=min(10, self.n_calls),
+                           random_state=self.seed)
+
+    def cross_validate(self, model, params,
+                       x, y):
+        """This function is used to get the mean absolute error of every fold
+        of the surrogate with the hyperparameters, running the folds in
+        parallel
+        """
+        params={param: self.get_value(v) for param, v in params.items()}
+        cur=tuple(sorted(params.items()))
+        if cur not in self.cache:
+            from joblib import Parallel, delayed
+            from sklearn.model_selection import KFold
+            folds=KFold(min(self.folds, len(y)), shuffle=True, random_state=self.seed)
+            self.cache[cur]=np.array(Parallel(n_jobs=self.n_jobs)(
+                delayed(score_fold)(model, params, x, y, train, test)
+                for (train, test) in folds.split(x)))
+        return self.cache[cur]
+
+def score_fold(model, params,
+               x, y, train, test):
+    """This function is used to fit a copy of the surrogate with the
+    hyperparameters on a fold and get its mean absolute error on the rest
+    """
+    from sklearn.base import clone
+    cur=clone(model).set_params(**params)
+    cur.fit(x[train], y[train])
+    return float(np.mean(np.abs(np.ravel(cur.predict(x[test]))-y[test])))
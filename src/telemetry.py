@@ -0,0 +1,119 @@
+"""-----------------------------------------------------------------------------
+@Name: Flexible Bayesian Optimization (FlexiBO): An active learning for optimiz-
+ing  multiple objectives of different cost
+@Version: 0.1
+@Author: Shahriar Iqbal
+--------------------------------------------------------------------------------
+"""
+import os
+import json
+import time
+import resource
+from contextlib import contextmanager
+
+PROFILERS=("cprofile", "pyinstrument")
+
+def get_memory():
+    """This function is used to get the resident and peak resident memory of
+    the process in MB
+    """
+    peak=resource.getrusage(resource.RUSAGE_SELF).ru_maxrss/1024.0
+    rss=peak
+    try:
+        with open("/proc/self/statm", "r") as fp:
+            rss=int(fp.read().split()[1])*os.sysconf("SC_PAGE_SIZE")/1024.0**2
+    except (IOError, OSError, ValueError):
+        pass
+    return (rss, max(rss, peak))
+
+class Telemetry(object):
+    """This class is used to instrument the bo loop. Time spent in each phase
+    of an iteration is accumulated and written with the iteration state as one
+    json line per iteration. Phases can also be profiled with cProfile or
+    pyinstrument; each phase gets one profile over all iterations
+    """
+    def __init__(self, fname=None, profile=None,
+                 profile_dir="profiles"):
+        print ("[STATUS]: Initializing Telemetry Class")
+        self.fp=open(fname, "a") if fname else None
+        if profile is not None and profile not in PROFILERS:
+            print ("[ERROR]: profiler {0} not supported".format(profile))
+            profile=None
+        if profile=="pyinstrument":
+            try:
+                import pyinstrument
+            except ImportError:
+                print ("[ERROR]: pyinstrument is not installed")
+                profile=None
+        self.profile=profile
+        self.profile_dir=profile_dir
+        self.profilers={}
+        self.phases={}
+
+    def get_profiler(self, name):
+        """This function is used to get the profiler of a phase
+        """
+        if name not in self.profilers:
+            if self.profile=="cprofile":
+                import cProfile
+                self.profilers[name]=cProfile.Profile()
+            else:
+                from pyinstrument import Profiler
+                self.profilers[name]=Profiler()
+        return self.profilers[name]
+
+    @contextmanager
+    def phase(self, name):
+        """This function is used to time (and profile) a phase of an iteration
+        """
+        profiler=self.get_profiler(name) if self.profile else None
+        if profiler is not None:
+            if self.profile=="cprofile":
+                profiler.enable()
+            else:
+                profiler.start()
+        start=time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name]=self.phases.get(name, 0.0)+time.perf_counter()-start
+            if profiler is not None:
+                if self.profile=="cprofile":
+                    profiler.disable()
+                else:
+                    profiler.stop()
+
+    def emit(self, iteration, **fields):
+        """This function is used to write the record of an iteration and start
+        timing the next one
+        """
+        (rss, peak)=get_memory()
+        record={"iteration":iteration,
+                "time":time.time(),
+                "phases":{name: round(seconds, 6) for name, seconds in self.phases.items()},
+                "rss_mb":round(rss, 1),
+                "max_rss_mb":round(peak, 1)}
+        record.update(fields)
+        self.phases={}
+        if self.fp is not None:
+            self.fp.write(json.dumps(record)+"\n")
+            self.fp.flush()
+        return record
+
+    def close(self):
+        """This function is used to close the records and write the profiles
+        """
+        if self.fp is not None:
+            self.fp.close()
+            self.fp=None
+        if not self.profilers:
+            return
+        if not os.path.exists(self.profile_dir):
+            os.makedirs(self.profile_dir)
+        for name, profiler in self.profilers.items():
+            if self.profile=="cprofile":
+                profiler.dump_stats(os.path.join(self.profile_dir, name+".prof"))
+            else:
+                with open(os.path.join(self.profile_dir, name+".html"), "w") as fp:
+                    fp.write(profiler.output_html())
+        print ("[STATUS]: profiles written to {0}".format(self.profile_dir))
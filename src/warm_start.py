@@ -0,0 +1,58 @@
+"""-----------------------------------------------------------------------------
+@Name: Flexible Bayesian Optimization (FlexiBO): An active learning for optimiz-
+ing  multiple objectives of different cost
+@Version: 0.1
+@Author: Shahriar Iqbal
+--------------------------------------------------------------------------------
+"""
+import numpy as np
+
+class WarmStartPrior(object):
+    """This class is used to transfer measurements of related models and
+    resolutions to a new run. A prior model is fitted once per objective on
+    the pooled source measurements; the surrogate of the run is then stacked
+    on top of it and only learns the residual between the target and the
+    prior, after the prior has been rescaled to the target with a linear fit
+    """
+    def __init__(self, sources, config_columns,
+                 objectives):
+        print ("[STATUS]: Initializing WarmStartPrior Class")
+        import pandas as pd
+        from sklearn.ensemble import RandomForestRegressor
+        df=pd.concat([pd.read_csv(fname) for fname in sources], ignore_index=True)
+        X=df[config_columns].values.astype(float)
+        self.models={}
+        self.scale={}
+        for objective, column in objectives.items():
+            model=RandomForestRegressor(n_estimators=64)
+            self.models[objective]=model.fit(X, df[column].values)
+            self.scale[objective]=(1.0, 0.0)
+
+    def get_raw_prediction(self, objective, X):
+        """This function is used to predict an objective with the prior model
+        """
+        return self.models[objective].predict(np.asarray(X, dtype=float))
+
+    def calibrate(self, objective, prior,
+                  Y):
+        """This function is used to rescale the prior to the target by least
+        squares on the measured target values
+        ------------------------------------------------------------------------
+        @args:
+            objective: objective of the prior
+            prior: raw prior prediction of the measured configs
+            Y: measured values of the configs
+        ------------------------------------------------------------------------
+        """
+        if len(Y)<3 or np.std(prior)==0:
+            # too few measurements to fit a slope; only shift the prior
+            self.scale[objective]=(1.0, float(np.mean(Y)-np.mean(prior)))
+            return
+        (a, b)=np.polyfit(prior, Y, 1)
+        self.scale[objective]=(float(a), float(b))
+
+    def get_prediction(self, objective, prior):
+        """This function is used to rescale a raw prior prediction
+        """
+        (a, b)=self.scale[objective]
+        return a*np.asarray(prior)+b
@@ -0,0 +1,146 @@
+"""-----------------------------------------------------------------------------
+@Name: Flexible Bayesian Optimization (FlexiBO): An active learning for optimiz-
+ing  multiple objectives of different cost
+@Version: 0.1
+@Author: Shahriar Iqbal
+--------------------------------------------------------------------------------
+Tests of the validation of config.yaml into a typed Config.
+"""
+import os
+import copy
+import yaml
+import pytest
+from src.config import LOADER, parse_config, load_config, get_config
+
+ROOT=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+@pytest.fixture(scope="module")
+def raw():
+    with open(os.path.join(ROOT, "config.yaml"), "r") as fp:
+        return yaml.load(fp, Loader=LOADER)
+
+def parse(raw, overrides=(),
+          mode=None):
+    return parse_config(copy.deepcopy(raw), overrides, mode)
+
+def test_typed_sections(raw):
+    config=parse(raw)
+    cfg=raw["config"]
+    assert config.loop.num_iter==cfg["loop"]["num_iter"]
+    assert config.loop.beta.schedule==cfg["loop"]["beta"]["schedule"]
+    assert config.loop.stopping.patience==cfg["loop"]["stopping"]["patience"]
+    assert config.telemetry.fname==cfg["telemetry"]["fname"]
+    assert config.features.log_columns==cfg["features"]["log_columns"]
+    assert config.fidelity.levels==cfg["fidelity"]["levels"]
+    assert config["config"] is config.raw["config"]
+
+@pytest.mark.parametrize("override", ["loop.num_iter=-1",
+                                      "loop.beta.schedule=linear",
+                                      "loop.beta.delta=0",
+                                      "loop.stopping.volume_gap=2",
+                                      "loop.stopping.patience=0",
+                                      "loop.stopping.cost_budget=-5",
+                                      "telemetry.profile=perf",
+                                      "features.log_columns=core_freq",
+                                      "features.interactions=[[cores]]"])
+def test_invalid_sections(raw, override):
+    assert parse(raw, [override]) is None
+
+def test_fidelity_only_validated_if_enabled(raw):
+    assert parse(raw, ["fidelity.promote_fraction=0"]) is not None
+    assert parse(raw, ["fidelity.enabled=true", "fidelity.promote_fraction=0"]) is None
+    assert parse(raw, ["fidelity.enabled=true", "fidelity.objective=o9"]) is None
+    assert parse(raw, ["fidelity.enabled=true", "fidelity.levels=[{epochs: 0, data_fraction: 1, cost: 1}]"]) is None
+    config=parse(raw, ["fidelity.enabled=true", "fidelity.objective=O2"])
+    assert config.fidelity.objective=="o2"
+
+def test_remote_only_validated_online(raw):
+    broken=["online.remote={host: tx2}"]
+    config=parse(raw, broken, "offline")
+    assert config is not None and config.remote is None
+    assert parse(raw, broken, "online") is None
+    remote=parse(raw, mode="online").remote
+    assert remote.host==raw["config"]["online"]["remote"]["host"]
+
+def test_load_config_cached_by_mode(tmp_path):
+    fname=str(tmp_path/"config.yaml")
+    with open(os.path.join(ROOT, "config.yaml"), "r") as src, open(fname, "w") as dst:
+        dst.write(src.read())
+    offline=load_config(fname, mode="offline")
+    assert load_config(fname, mode="offline") is offline
+    online=load_config(fname, mode="online")
+    assert online is not offline and online.remote is not None
+
+def test_get_config_invalid(tmp_path, monkeypatch, capsys):
+    with open(os.path.join(ROOT, "config.yaml"), "r") as src:
+        text=src.read()
+    (tmp_path/"config.yaml").write_text(text.replace("num_iter: 200", "num_iter: -1"))
+    monkeypatch.chdir(tmp_path)
+    with pytest.raises(ValueError, match="config.yaml is missing or invalid"):
+        get_config()
+    assert "loop.num_iter is not a non-negative integer" in capsys.readouterr().out
+    config=parse(yaml.load(text, Loader=LOADER))
+    assert get_config(config) is config
+
+def test_online_metrics_measurable(raw):
+    temperature=["objective.O2=temperature"]
+    assert parse(raw, temperature, "offline") is not None
+    assert parse(raw, temperature, "online") is None
+    assert parse(raw, ["objective.O2=inference_time"], "online") is not None
+
+def test_constraints_validated(raw):
+    bound='constraints.bounds=[{{metric: {0}, op: "{1}", value: {2}}}]'
+    config=parse(raw, [bound.format("inference_time", "<=", 0.5)], "offline")
+    assert config.constraints.bounds==[{"metric":"inference_time", "op":"<=", "value":0.5}]
+    # offline bounds are on the replayed columns, online on the objectives
+    assert parse(raw, [bound.format("inference_time", "<=", 0.5)], "online") is None
+    assert parse(raw, [bound.format("energy", "<=", 5)], "online") is not None
+    assert parse(raw, [bound.format("temperature", "<=", 50)], "offline") is None
+    assert parse(raw, [bound.format("inference_time", "<", 0.5)], "offline") is None
+    assert parse(raw, [bound.format("inference_time", "<=", "low")], "offline") is None
+    assert parse(raw, ["constraints.min_probability=2"]) is None
+
+def test_constraint_without_objective():
+    from src.constraints import Constraints
+    with pytest.raises(ValueError, match="temperature"):
+        Constraints([{"metric":"temperature", "op":"<=", "value":50}],
+                    {"o1":"inference_time"}, ["o1"], 0.05)
+
+def test_loop_sections_typed(raw):
+    config=parse(raw, mode="offline")
+    cfg=raw["config"]
+    assert config.cost_model.min_samples==cfg["cost_model"]["min_samples"]
+    assert config.hypervolume.mc_samples==cfg["hypervolume"]["mc_samples"]
+    assert config.checkpoint.fname==cfg["checkpoint"]["fname"]
+    assert config.initial_design.method==cfg["initial_design"]["method"]
+    assert config.warm_start.sources==cfg["warm_start"]["sources"]
+    assert config.tuning.folds==cfg["tuning"]["folds"]
+    assert config.offline.objective=={k.lower(): v for k, v in cfg["offline"]["objective"].items()}
+    assert config.online is None
+    online=parse(raw, mode="online").online
+    assert online.network_objective==cfg["online"]["network_objective"].lower()
+    assert online.store_dir==cfg["online"]["local"]["store_dir"]
+
+@pytest.mark.parametrize("override", ["cost_model.min_samples=0",
+                                      "hypervolume.mc_samples=1.5",
+                                      "checkpoint.interval=0",
+                                      "initial_design.method=grid",
+                                      "initial_design.size=0",
+                                      "offline.config_columns=[]",
+                                      "offline.objective={O1: 3}"])
+def test_invalid_loop_sections(raw, override):
+    assert parse(raw, [override], "offline") is None
+
+def test_optional_sections_only_validated_if_enabled(raw):
+    assert parse(raw, ["tuning.folds=1"]) is not None
+    assert parse(raw, ["tuning.enabled=true", "tuning.folds=1"]) is None
+    assert parse(raw, ["warm_start.sources=[]"]) is not None
+    assert parse(raw, ["warm_start.enabled=true", "warm_start.sources=[]"]) is None
+
+def test_online_section_only_validated_online(raw):
+    broken=["online.network_objective=o9"]
+    assert parse(raw, broken, "offline") is not None
+    assert parse(raw, broken, "online") is None
+    assert parse(raw, ["online.local={}"], "online") is None
+    # the offline table is not read online
+    assert parse(raw, ["offline.config_columns=[]"], "online") is not None
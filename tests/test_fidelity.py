@@ -0,0 +1,87 @@
+"""-----------------------------------------------------------------------------
+@Name: Flexible Bayesian Optimization (FlexiBO): An active learning for optimiz-
+ing  multiple objectives of different cost
+@Version: 0.1
+@Author: Shahriar Iqbal
+--------------------------------------------------------------------------------
+Tests of the promotion of configs between the fidelities of the network
+objective.
+"""
+import pytest
+from src.fidelity import FidelitySchedule
+
+LEVELS=[{"epochs":1, "data_fraction":0.25, "cost":0.1},
+        {"epochs":3, "data_fraction":0.5, "cost":0.3},
+        {"epochs":10, "data_fraction":1.0, "cost":1.0}]
+
+def make_schedule(promote_fraction=0.5, metric="val_loss"):
+    return FidelitySchedule(LEVELS, "o2", promote_fraction, metric)
+
+def test_first_config_not_promoted():
+    schedule=make_schedule()
+    assert schedule.get_next_level(0)==0
+    assert not schedule.record(0, 0, 1.0, {"val_loss":0.1})
+    # a level ranks its configs only once it has 1/promote_fraction results
+    assert not schedule.is_promoted(0)
+    assert schedule.get_promoted(0)==[]
+    schedule.record(1, 0, 1.0, {"val_loss":0.5})
+    assert schedule.get_promoted(0)==[0]
+    assert schedule.get_next_level(0)==1
+    assert schedule.get_next_level(1) is None
+
+@pytest.mark.parametrize("promote_fraction,min_results", [(0.5, 2), (0.3, 4), (1.0, 1)])
+def test_min_results(promote_fraction, min_results):
+    schedule=make_schedule(promote_fraction)
+    for index in range(0, min_results):
+        assert schedule.get_promoted(0)==[]
+        schedule.record(index, 0, 1.0, {"val_loss":1.0/(index+1)})
+    assert schedule.get_promoted(0)!=[]
+
+def test_ranked_by_validation_metric():
+    schedule=make_schedule(0.25)
+    # the objective value does not decide the ranking, the reported loss does
+    for index, (value, loss) in enumerate([(9.0, 0.9), (1.0, 0.2), (5.0, 0.4), (7.0, 0.3)]):
+        schedule.record(index, 0, value, {"val_loss":loss, "val_acc":1-loss})
+    assert schedule.get_promoted(0)==[1]
+    accuracy=make_schedule(0.25, "val_acc")
+    for index, acc in enumerate([0.1, 0.8, 0.5, 0.3]):
+        accuracy.record(index, 0, 1.0, {"val_acc":acc})
+    assert accuracy.get_promoted(0)==[1]
+
+def test_ranking_changes_with_results():
+    schedule=make_schedule()
+    schedule.record(0, 0, 1.0, {"val_loss":0.3})
+    schedule.record(1, 0, 1.0, {"val_loss":0.4})
+    assert schedule.is_promoted(0)
+    schedule.record(2, 0, 1.0, {"val_loss":0.1})
+    schedule.record(3, 0, 1.0, {"val_loss":0.2})
+    assert not schedule.is_promoted(0)
+    assert sorted(schedule.get_promoted(0))==[2, 3]
+
+def test_promoted_through_levels():
+    schedule=make_schedule()
+    for index, loss in enumerate([0.1, 0.5]):
+        schedule.record(index, 0, 1.0, {"val_loss":loss})
+    schedule.record(0, 1, 2.0, {"val_loss":0.05})
+    # promoted configs leave the ranking of their previous level
+    assert schedule.get_promoted(0)==[]
+    schedule.record(1, 1, 2.0, {"val_loss":0.5})
+    assert schedule.get_next_level(0)==2
+    assert schedule.get_value(0)==2.0
+    # the full budget is final and promotes nothing
+    assert schedule.record(0, 2, 3.0, {"val_loss":0.01})
+    assert schedule.get_next_level(0) is None
+    assert schedule.get_promoted(2)==[]
+
+def test_missing_metric_not_promoted():
+    schedule=make_schedule(1.0)
+    schedule.record(0, 0, 1.0, {"loss":0.1})
+    assert not schedule.is_promoted(0)
+    assert schedule.get_next_level(0) is None
+
+def test_cost_of_next_level():
+    schedule=make_schedule()
+    assert schedule.get_cost(0, 10.0)==pytest.approx(1.0)
+    for index, loss in enumerate([0.1, 0.5]):
+        schedule.record(index, 0, 1.0, {"val_loss":loss})
+    assert schedule.get_cost(0, 10.0)==pytest.approx(3.0)
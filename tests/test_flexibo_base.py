@@ -0,0 +1,20 @@
+"""-----------------------------------------------------------------------------
+@Name: Flexible Bayesian Optimization (FlexiBO): An active learning for optimiz-
+ing  multiple objectives of different cost
+@Version: 0.1
+@Author: Shahriar Iqbal
+--------------------------------------------------------------------------------
+Tests of the interface a mode of the bo loop has to implement.
+"""
+import pytest
+from src.flexibo_base import FlexiBOBase
+
+@pytest.mark.parametrize("missing", ["set_design_space", "get_config_columns", "evaluate"])
+def test_incomplete_mode_not_constructed(missing):
+    methods={name: lambda self, *args: None
+             for name in ("set_design_space", "get_config_columns", "evaluate")
+             if name!=missing}
+    mode=type("Mode", (FlexiBOBase,), methods)
+    # fails when the mode is built, before the config or the loop is touched
+    with pytest.raises(TypeError, match=missing):
+        mode(None, "RF")
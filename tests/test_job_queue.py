@@ -0,0 +1,71 @@
+"""-----------------------------------------------------------------------------
+@Name: Flexible Bayesian Optimization (FlexiBO): An active learning for optimiz-
+ing  multiple objectives of different cost
+@Version: 0.1
+@Author: Shahriar Iqbal
+--------------------------------------------------------------------------------
+Tests of the training job queue with jobs that run in the test instead of on
+remote workers.
+"""
+import time
+import threading
+from concurrent.futures import wait
+from src.job_queue import (TrainingJobQueue, TrainingResult, PENDING, RUNNING,
+                           DONE, FAILED, CANCELLED)
+
+def test_submit_returns_job():
+    queue=TrainingJobQueue([{}], run_job=lambda job, worker: TrainingResult(job.config, {}))
+    job=queue.submit("net", [1, 2], {"epochs":1})
+    assert job.future.result(timeout=5)==TrainingResult([1, 2], {})
+    assert job.state==DONE
+    assert job.fidelity=={"epochs":1}
+    assert job.seconds>=0
+    queue.shutdown()
+
+def test_failed_job_retried():
+    attempts=[]
+
+    def run_job(job, worker):
+        attempts.append(job.job_id)
+        return None if len(attempts)<2 else "model.h5"
+
+    queue=TrainingJobQueue([{}], max_retries=2, run_job=run_job)
+    job=queue.submit("net", [1])
+    assert job.future.result(timeout=5)=="model.h5"
+    assert job.attempts==2
+    queue.shutdown()
+
+def test_failed_job_after_retries():
+    queue=TrainingJobQueue([{}], max_retries=1, run_job=lambda job, worker: None)
+    job=queue.submit("net", [1])
+    wait([job.future], timeout=5)
+    assert job.state==FAILED and job.attempts==2
+    assert job.future.exception() is not None
+    queue.shutdown()
+
+def test_shutdown_cancels_pending():
+    (started, release)=(threading.Event(), threading.Event())
+
+    def run_job(job, worker):
+        started.set()
+        release.wait(5)
+        return "model.h5"
+
+    queue=TrainingJobQueue([{}], run_job=run_job)
+    jobs=[queue.submit("net", [i]) for i in range(0, 4)]
+    started.wait(5)
+    assert [job.state for job in jobs]==[RUNNING, PENDING, PENDING, PENDING]
+    threading.Timer(0.2, release.set).start()
+    start=time.time()
+    queue.shutdown(cancel_pending=True)
+    # only the running job is waited for
+    assert time.time()-start<5
+    assert jobs[0].state==DONE and jobs[0].future.result()=="model.h5"
+    assert all(job.state==CANCELLED and job.future.cancelled() for job in jobs[1:])
+    assert queue.get_status()=={PENDING:0, RUNNING:0, DONE:1, FAILED:0, CANCELLED:3}
+
+def test_shutdown_waits_for_queued_jobs():
+    queue=TrainingJobQueue([{}], run_job=lambda job, worker: job.job_id)
+    jobs=[queue.submit("net", [i]) for i in range(0, 4)]
+    queue.shutdown()
+    assert [job.future.result() for job in jobs]==[0, 1, 2, 3]
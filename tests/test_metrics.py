@@ -0,0 +1,80 @@
+"""-----------------------------------------------------------------------------
+@Name: Flexible Bayesian Optimization (FlexiBO): An active learning for optimiz-
+ing  multiple objectives of different cost
+@Version: 0.1
+@Author: Shahriar Iqbal
+--------------------------------------------------------------------------------
+Tests of the pareto-front quality metrics on small hand-computed fronts and of
+the vectorized passes against scoring every run on its own.
+"""
+import numpy as np
+import pytest
+from src import metrics
+from benchmarks.check_pareto import brute_volume, brute_nondominated
+
+# the reference front of A and B is (3,1), (1,3) and (2.5,2.5), which
+# dominates (2,2) of A; C is a run that found nothing
+A=[[3, 1], [2, 2], [1, 3]]
+B=[[3, 1], [2.5, 2.5]]
+C=[]
+FRONTS=[A, B, C]
+REFERENCE=[[1, 3], [2.5, 2.5], [3, 1]]
+
+def test_reference_front():
+    reference=metrics.get_reference_front(FRONTS)
+    assert sorted(map(tuple, reference))==sorted(map(tuple, REFERENCE))
+
+def test_contribution():
+    # A and B each contain two of the three reference points
+    assert np.allclose(metrics.contribution(FRONTS), [2/3., 2/3., 0])
+
+def test_diversity():
+    # the reference spans 2 along each objective; B spans 0.5 and 1.5
+    assert np.allclose(metrics.diversity(FRONTS), [1.0, 0.5, 0])
+
+def test_hypervolume():
+    # A: 3*1+2*1+1*1, B: 3*1+2.5*1.5
+    assert np.allclose(metrics.hypervolume(FRONTS), [6.0, 6.75, 0])
+
+def test_hypervolume_3d():
+    fronts=[[[1, 1, 1]], [[2, 1, 1], [1, 2, 1]], [[2, 2, 2], [1, 1, 3]]]
+    assert np.allclose(metrics.hypervolume(fronts), [1.0, 3.0, 8.0+1.0])
+
+def test_igd():
+    # A misses (2.5,2.5) by its distance to (2,2), B misses (1,3) by its
+    # distance to (2.5,2.5); a run without points is infinitely far
+    assert np.allclose(metrics.igd(FRONTS, REFERENCE),
+                       [np.sqrt(0.5)/3, np.sqrt(2.5)/3, np.inf])
+
+def test_igd_plus():
+    # only the objectives the reference point is better in count: (1,3) is
+    # better than (2.5,2.5) in o2 by 0.5
+    assert np.allclose(metrics.igd_plus(FRONTS, REFERENCE),
+                       [np.sqrt(0.5)/3, 0.5/3, np.inf])
+
+def test_epsilon():
+    # A has to move up by 0.5 to cover (2.5,2.5), B by 0.5 to cover (1,3)
+    assert np.allclose(metrics.epsilon(FRONTS, REFERENCE), [0.5, 0.5, np.inf])
+    assert np.allclose(metrics.epsilon([REFERENCE], REFERENCE), [0])
+
+def get_random_fronts(rng, num_obj,
+                      num_runs=6):
+    fronts=[]
+    for _ in range(0, num_runs):
+        points=np.round(rng.uniform(0, 4, (rng.randint(0, 8), num_obj)), 1).tolist()
+        fronts.append(sorted(brute_nondominated(points)))
+    return fronts
+
+@pytest.mark.parametrize("num_obj", [2, 3])
+def test_vectorized_matches_single_runs(num_obj, monkeypatch):
+    # chunks of a few points exercise the chunked pairwise reduction
+    monkeypatch.setattr(metrics, "CHUNK", 7)
+    for seed in range(0, 20):
+        fronts=get_random_fronts(np.random.RandomState(seed), num_obj)
+        reference=metrics.get_reference_front(fronts)
+        scores=metrics.score(fronts, reference)
+        for run, front in enumerate(fronts):
+            single=metrics.score([front], reference)
+            for name in scores:
+                assert np.allclose(scores[name][run], single[name][0]), name
+            assert np.isclose(scores["hypervolume"][run], brute_volume(front) if front else 0)
@@ -0,0 +1,105 @@
+"""-----------------------------------------------------------------------------
+@Name: Flexible Bayesian Optimization (FlexiBO): An active learning for optimiz-
+ing  multiple objectives of different cost
+@Version: 0.1
+@Author: Shahriar Iqbal
+--------------------------------------------------------------------------------
+Tests of the pareto engine against brute-force references on random cases with
+ties and duplicates, on the NumPy kernels and, if installed, the numba kernels.
+"""
+import os
+import sys
+import subprocess
+import importlib.util
+import numpy as np
+import pytest
+from src import kernels
+from src.pareto import Pareto
+from benchmarks.check_pareto import (dominates, brute_nondominated, brute_volume,
+                                     brute_undominated, make_case, check_kernels)
+
+CASES=200
+NUMBA=importlib.util.find_spec("numba") is not None
+
+@pytest.fixture(params=["numpy", "numba"])
+def backend(request, monkeypatch):
+    """This function is used to run a test on the NumPy and numba kernels
+    """
+    if request.param=="numpy":
+        monkeypatch.setattr(kernels, "NUMBA", False)
+    else:
+        if not NUMBA:
+            pytest.skip("numba is not installed")
+        monkeypatch.setattr(kernels, "NUMBA", True)
+        kernels.compile_kernels()
+    return request.param
+
+def get_cases(num_obj):
+    """This function is used to draw the uncertainty regions of the cases
+    """
+    return [make_case(np.random.RandomState(seed), num_obj) for seed in range(0, CASES)]
+
+@pytest.mark.parametrize("num_obj", [2, 3, 4])
+def test_get_nondominated(backend, num_obj):
+    pareto=Pareto(num_obj)
+    for region in get_cases(num_obj):
+        pes=[point["pes"] for point in region]
+        keep=pareto.get_nondominated(pes)
+        assert {tuple(pes[i]) for i in keep}==brute_nondominated(pes)
+        assert len(keep)==len(brute_nondominated(pes))
+
+@pytest.mark.parametrize("num_obj", [2, 3, 4])
+def test_compute_pareto_volume(backend, num_obj):
+    # volumes of every number of objectives are computed exactly
+    pareto=Pareto(num_obj, exact_max_obj=num_obj)
+    for region in get_cases(num_obj):
+        pes=[point["pes"] for point in region]
+        assert np.isclose(pareto.compute_pareto_volume(pes), brute_volume(pes))
+
+@pytest.mark.parametrize("num_obj", [2, 3])
+def test_volume_kernels(backend, num_obj):
+    volume=kernels.volume_2d if num_obj==2 else kernels.volume_3d
+    for region in get_cases(num_obj):
+        pes=[point["pes"] for point in region]
+        assert np.isclose(volume(pes), brute_volume(pes))
+
+@pytest.mark.parametrize("num_obj", [2, 3, 4])
+def test_identify_undominated_points(backend, num_obj):
+    pareto=Pareto(num_obj)
+    for region in get_cases(num_obj):
+        (ind, _)=pareto.identify_undominated_points(region)
+        assert ind==brute_undominated(region)
+
+@pytest.mark.parametrize("num_obj", [2, 3, 4])
+def test_construct_pessimistic_pareto_front(backend, num_obj):
+    pareto=Pareto(num_obj)
+    for region in get_cases(num_obj):
+        (ind, points)=pareto.identify_undominated_points(region)
+        (front, indices_map)=pareto.construct_pessimistic_pareto_front(ind, points, "CONSTRUCT")
+        assert {tuple(p) for p in front}==brute_nondominated([p["pes"] for p in points])
+        for pos, p in enumerate(front):
+            assert region[indices_map[pos]]["pes"]==p
+
+@pytest.mark.parametrize("num_obj", [2, 3, 4])
+def test_nondominated_sort(backend, num_obj):
+    pareto=Pareto(num_obj)
+    for region in get_cases(num_obj):
+        pes=[point["pes"] for point in region]
+        rank=pareto.nondominated_sort(pes)
+        for i, p in enumerate(pes):
+            better=[rank[j] for j, q in enumerate(pes) if dominates(q, p)]
+            assert rank[i]==(max(better)+1 if better else 0)
+
+@pytest.mark.skipif(not NUMBA, reason="numba is not installed")
+@pytest.mark.parametrize("num_obj", [2, 3, 4])
+def test_numba_kernels_match_numpy(num_obj):
+    kernels.compile_kernels()
+    for seed in range(0, CASES):
+        assert check_kernels(np.random.RandomState(seed), num_obj)==[]
+
+def test_numba_disabled_by_environment():
+    env=dict(os.environ, FLEXIBO_NUMBA="0")
+    output=subprocess.run([sys.executable, "-c", "from src import kernels; print(kernels.NUMBA)"],
+                          env=env, stdout=subprocess.PIPE, universal_newlines=True,
+                          cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    assert output.stdout.strip()=="False"
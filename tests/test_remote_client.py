@@ -0,0 +1,139 @@
+"""-----------------------------------------------------------------------------
+@Name: Flexible Bayesian Optimization (FlexiBO): An active learning for optimiz-
+ing  multiple objectives of different cost
+@Version: 0.1
+@Author: Shahriar Iqbal
+--------------------------------------------------------------------------------
+Tests of the pooled transports of remote training jobs, on local transports
+and on an ssh channel that reaches eof before its exit status.
+"""
+import os
+import time
+import threading
+import pytest
+from src.remote_client import SSHTransport, LocalTransport, RemoteClientPool
+
+@pytest.fixture
+def remote(tmp_path):
+    return {"transport":"local", "host":"localhost", "user":"flexibo",
+            "workdir":str(tmp_path)}
+
+def test_run_streams_output(remote):
+    transport=RemoteClientPool().create(remote)
+    streamed=[]
+    (status, lines)=transport.run("echo one; echo two; exit 3", callback=streamed.append)
+    assert status==3
+    assert lines==["one", "two"]
+    assert streamed==lines
+
+def test_run_timeout(remote):
+    transport=RemoteClientPool().create(remote)
+    start=time.time()
+    (status, _)=transport.run("sleep 30", timeout=0.2)
+    assert status==-1
+    assert time.time()-start<10
+
+def test_put_get(remote, tmp_path):
+    transport=RemoteClientPool().create(remote)
+    (tmp_path/"a.txt").write_text("model")
+    transport.put(str(tmp_path/"a.txt"), str(tmp_path/"b.txt"))
+    transport.get(str(tmp_path/"b.txt"), str(tmp_path/"c.txt"))
+    with transport.open(str(tmp_path/"c.txt")) as fp:
+        assert fp.read()==b"model"
+
+def test_session_reuses_transport(remote):
+    pool=RemoteClientPool()
+    with pool.session(remote) as first:
+        assert first.run("pwd")[1]==[remote["workdir"]]
+    with pool.session(remote) as second:
+        assert second is first
+    assert pool.idle[pool.get_key(remote)]==[first]
+
+def test_transports_pooled_per_host(remote):
+    pool=RemoteClientPool()
+    other=dict(remote, host="worker")
+    with pool.session(remote) as first, pool.session(other) as second:
+        assert first is not second
+    assert len(pool.idle)==2
+
+def test_reconnect_after_close(remote):
+    pool=RemoteClientPool()
+    with pool.session(remote) as first:
+        pass
+    # a dropped connection is closed and replaced by a new one
+    first.close()
+    with pool.session(remote) as second:
+        assert second is not first
+        assert second.is_active()
+        assert second.run("echo ok")==(0, ["ok"])
+
+def test_failed_session_not_pooled(remote):
+    pool=RemoteClientPool()
+    with pytest.raises(RuntimeError):
+        with pool.session(remote) as transport:
+            raise RuntimeError("job failed")
+    assert not transport.is_active()
+    assert pool.idle[pool.get_key(remote)]==[]
+
+def test_max_idle(remote):
+    pool=RemoteClientPool(max_idle=1)
+    (first, second)=(pool.acquire(remote), pool.acquire(remote))
+    pool.release(remote, first)
+    pool.release(remote, second)
+    assert pool.idle[pool.get_key(remote)]==[first]
+    assert not second.is_active()
+    pool.close_all()
+    assert not first.is_active() and pool.idle=={}
+
+class EOFChannel(object):
+    """This class is used to mimic a paramiko channel that stays readable
+    at eof while the exit status is still on its way
+    """
+    def __init__(self, delay):
+        (self.read_fd, write_fd)=os.pipe()
+        os.close(write_fd)
+        self.status_event=threading.Event()
+        threading.Timer(delay, self.status_event.set).start()
+        self.recvs=0
+
+    def fileno(self):
+        return self.read_fd
+
+    def set_combine_stderr(self, combine):
+        pass
+
+    def exec_command(self, command):
+        pass
+
+    def recv_ready(self):
+        return False
+
+    def recv(self, size):
+        self.recvs+=1
+        return b""
+
+    def exit_status_ready(self):
+        return self.status_event.is_set()
+
+    def recv_exit_status(self):
+        os.close(self.read_fd)
+        return 0
+
+    def close(self):
+        pass
+
+def test_ssh_run_waits_for_exit_status():
+    chan=EOFChannel(0.5)
+
+    class Client(object):
+        def get_transport(self):
+            return self
+
+        def open_session(self):
+            return chan
+
+    transport=SSHTransport("host", "user", None, None)
+    transport.ssh_client=Client()
+    assert transport.run("true")==(0, [])
+    # eof is polled about every 0.1s rather than in a busy loop
+    assert chan.recvs<20
@@ -0,0 +1,53 @@
+"""-----------------------------------------------------------------------------
+@Name: Flexible Bayesian Optimization (FlexiBO): An active learning for optimiz-
+ing  multiple objectives of different cost
+@Version: 0.1
+@Author: Shahriar Iqbal
+--------------------------------------------------------------------------------
+Tests of resuming an offline run from its checkpoint.
+"""
+import os
+import shutil
+import pandas as pd
+import pytest
+from src.config import load_config
+from src.flexibo_offline import FlexiBO
+
+ROOT=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA=os.path.join(ROOT, "data", "measurements", "tx2_sampled_output_xception_200x200.csv")
+
+@pytest.fixture
+def run_dir(tmp_path, monkeypatch):
+    shutil.copyfile(os.path.join(ROOT, "config.yaml"), str(tmp_path/"config.yaml"))
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+def run(num_iter, resume=False,
+        budget=None, overrides=()):
+    config=load_config("config.yaml", ["loop.num_iter={0}".format(num_iter),
+                                       "telemetry.fname=null",
+                                       "initial_design.seed=0"]+list(overrides), "offline")
+    return FlexiBO(pd.read_csv(DATA), "RF", resume, None, budget, config)
+
+def load_checkpoint_spent():
+    from src.checkpoint import Checkpoint
+    return Checkpoint("flexibo_checkpoint.bin").load()["cost_model"].get_spent()
+
+def test_resume_keeps_counters(run_dir):
+    first=run(3, overrides=["loop.stopping.min_iter=100"])
+    assert os.path.exists("flexibo_checkpoint.bin")
+    resumed=run(3, resume=True, overrides=["loop.stopping.min_iter=100"])
+    assert resumed.start_iteration==3
+    assert resumed.stopping.unchanged==first.stopping.unchanged
+    assert resumed.stopping.front==first.stopping.front
+
+def test_resume_takes_new_limits(run_dir, capsys):
+    run(3)
+    spent=load_checkpoint_spent()
+    resumed=run(6, resume=True, budget=spent/2,
+                overrides=["loop.stopping.patience=7", "loop.stopping.volume_gap=0.5"])
+    # the budget and rules of the resumed run replace the checkpointed ones
+    assert resumed.stopping.cost_budget==spent/2
+    assert resumed.stopping.patience==7
+    assert resumed.stopping.volume_gap==0.5
+    assert "stopping at iteration 3: cost budget" in capsys.readouterr().out